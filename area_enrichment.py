@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+area_enrichment – Grünfläche und Ort der Bäume aus einem Flächen-Export ergänzen
+
+In Baum-Exporten sind gruenflaeche/ort oft leer, während der Flächen-Export
+desselben Programms diese Angaben räumlich enthält. Mit einem bereits
+exportierten Flächen-CSV füllt die Umwandlung leere green_space/location
+der Bäume über die Lage des Baumpunkts:
+
+- AreaIndex liest die Polygone (WKT-Spalte) einmal ein und legt sie in ein
+  gleichmäßiges Raster (Zelle → Flächen); sehr große Flächen, die zu viele
+  Zellen belegen würden, werden nur über ihr umgebendes Rechteck geprüft
+- je Fläche werden die Kanten in waagerechte Streifen einsortiert; der
+  Punkt-in-Polygon-Test (gerade/ungerade Schnittzahl, Löcher inklusive)
+  prüft nur die Kanten des Streifens, in dem der Punkt liegt
+- liegt ein Baum in mehreren Flächen, gilt die kleinste
+- vorhandene Werte der Bäume werden nicht überschrieben
+
+Der Flächen-Export muss im selben Koordinatensystem vorliegen wie der
+Baum-Export; die Zuordnung läuft deshalb vor einer Umprojektion.
+
+Spalten des Flächen-Exports (erste vorhandene):
+    Grünfläche – green_space, gruenflaeche, grunflache
+    Ort        – location, ort, bezeichnung
+"""
+
+import csv
+import math
+import os
+import time
+from typing import List, Optional, Sequence
+
+try:
+    from .checkpoint import file_signature
+    from .wkt import point_xy, polygon_rings, wkt_column_index
+except ImportError:  # Aufruf als Skript (CLI)
+    from checkpoint import file_signature
+    from wkt import point_xy, polygon_rings, wkt_column_index
+
+GREEN_SPACE_COLUMNS = ("green_space", "gruenflaeche", "grunflache")
+LOCATION_COLUMNS = ("location", "ort", "bezeichnung")
+
+# Zielspalten der Bäume in der Reihenfolge der Werte einer Fläche
+TARGET_COLUMNS = ("green_space", "location")
+
+# Flächen, die mehr Rasterzellen belegen würden, werden für jeden Punkt
+# über ihr umgebendes Rechteck geprüft
+MAX_CELLS_PER_AREA = 4096
+
+# Mittlere Zahl der Kanten je Streifen einer Fläche
+EDGES_PER_BAND = 8
+
+
+def _first_column(fieldnames: Sequence[str], names: Sequence[str]) -> Optional[int]:
+    normalized = [name.strip().lower() for name in fieldnames]
+    for name in names:
+        if name in normalized:
+            return normalized.index(name)
+    return None
+
+
+class _Area:
+    """
+    Eine Fläche: umgebendes Rechteck, Kanten in Streifen, Werte.
+    """
+
+    __slots__ = ("min_x", "min_y", "max_x", "max_y", "size", "band_height", "bands", "values")
+
+    def __init__(self, rings, values):
+        xs = [x for ring in rings for x, _ in ring]
+        ys = [y for ring in rings for _, y in ring]
+        self.min_x, self.max_x = min(xs), max(xs)
+        self.min_y, self.max_y = min(ys), max(ys)
+        self.values = values
+
+        edges = []
+        area2 = 0.0
+        for ring in rings:
+            closed = ring if ring[0] == ring[-1] else ring + [ring[0]]
+            for (x1, y1), (x2, y2) in zip(closed, closed[1:]):
+                area2 += x1 * y2 - x2 * y1
+                if y1 != y2:
+                    edges.append((x1, y1, x2, y2))
+        self.size = abs(area2)
+
+        count = max(1, len(edges) // EDGES_PER_BAND)
+        self.band_height = (self.max_y - self.min_y) / count or 1.0
+        self.bands = [[] for _ in range(count)]
+        for edge in edges:
+            low, high = (edge[1], edge[3]) if edge[1] < edge[3] else (edge[3], edge[1])
+            first = min(int((low - self.min_y) / self.band_height), count - 1)
+            last = min(int((high - self.min_y) / self.band_height), count - 1)
+            for band in range(first, last + 1):
+                self.bands[band].append(edge)
+
+    def contains(self, x: float, y: float) -> bool:
+        band = min(int((y - self.min_y) / self.band_height), len(self.bands) - 1)
+        inside = False
+        for x1, y1, x2, y2 in self.bands[band]:
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+
+class AreaIndex:
+    """
+    Räumlicher Index der Flächen eines Flächen-Exports.
+
+        index = AreaIndex.from_csv("flaechen.csv")
+        values = index.lookup(x, y)   # (green_space, location) oder None
+    """
+
+    def __init__(self, areas: List[_Area], path: str = None):
+        self.path = path
+        self.areas = areas
+        self.large = []
+        self.grid = {}
+        if not areas:
+            self.cell = 1.0
+            return
+
+        # Zellgröße: mittlere Ausdehnung der Flächen
+        self.cell = sum(max(a.max_x - a.min_x, a.max_y - a.min_y) for a in areas) / len(areas) or 1.0
+        cell = self.cell
+        for area in areas:
+            gx0, gx1 = math.floor(area.min_x / cell), math.floor(area.max_x / cell)
+            gy0, gy1 = math.floor(area.min_y / cell), math.floor(area.max_y / cell)
+            if (gx1 - gx0 + 1) * (gy1 - gy0 + 1) > MAX_CELLS_PER_AREA:
+                self.large.append(area)
+                continue
+            for gx in range(gx0, gx1 + 1):
+                for gy in range(gy0, gy1 + 1):
+                    self.grid.setdefault((gx, gy), []).append(area)
+
+    @classmethod
+    def from_csv(cls, path: str, encoding: str = "utf-8-sig", delimiter: str = ";") -> "AreaIndex":
+        """
+        Flächen mit Polygon-Geometrie und mindestens einem Wert einlesen.
+        """
+        areas = []
+        with open(path, encoding=encoding, newline="") as f:
+            rows = csv.reader(f, delimiter=delimiter, quotechar='"')
+            fieldnames = next(rows, None) or []
+            wkt_index = wkt_column_index(fieldnames)
+            if wkt_index is None:
+                raise ValueError(f"Keine Geometriespalte (wkt) im Flächen-Export: {path}")
+            value_columns = [_first_column(fieldnames, GREEN_SPACE_COLUMNS),
+                             _first_column(fieldnames, LOCATION_COLUMNS)]
+            if value_columns == [None, None]:
+                raise ValueError(f"Weder Grünfläche noch Ort im Flächen-Export: {path}")
+
+            for row in rows:
+                if len(row) <= wkt_index:
+                    continue
+                values = tuple(row[i].strip() if i is not None and i < len(row) else ""
+                               for i in value_columns)
+                if not any(values):
+                    continue
+                try:
+                    rings = polygon_rings(row[wkt_index])
+                except ValueError:
+                    continue
+                if rings:
+                    areas.append(_Area(rings, values))
+        return cls(areas, path)
+
+    def settings(self) -> dict:
+        return {"areas": os.path.abspath(self.path) if self.path else None,
+                "signature": file_signature(self.path) if self.path else None}
+
+    def lookup(self, x: float, y: float):
+        """
+        Werte der kleinsten Fläche, die den Punkt enthält, bzw. None.
+        """
+        cell = self.cell
+        found = None
+        for candidates in (self.grid.get((math.floor(x / cell), math.floor(y / cell)), ()), self.large):
+            for area in candidates:
+                if (area.min_x <= x <= area.max_x and area.min_y <= y <= area.max_y
+                        and (found is None or area.size < found.size) and area.contains(x, y)):
+                    found = area
+        return found.values if found is not None else None
+
+
+class AreaEnricher:
+    """
+    Leere green_space/location der Ausgabezeilen aus dem AreaIndex füllen.
+
+        enricher = AreaEnricher(index, plan.fieldnames)
+        rows = enricher.apply_rows(rows, wkt_index)
+    """
+
+    def __init__(self, index: AreaIndex, fieldnames: Sequence[str]):
+        self.index = index
+        self.targets = [
+            (fieldnames.index(name), position)
+            for position, name in enumerate(TARGET_COLUMNS) if name in fieldnames
+        ]
+        if not self.targets:
+            print("Hinweis: weder green_space noch location in der Ausgabe – Flächenabgleich entfällt")
+        self.checked = 0
+        self.matched = 0
+        self.filled = 0
+        self.elapsed = 0.0
+
+    def settings(self) -> dict:
+        return self.index.settings()
+
+    def apply_rows(self, rows: List[tuple], index: int) -> List[tuple]:
+        """
+        Zeilen mit leerem Zielwert über die Lage ergänzen; liefert neue Zeilentupel.
+        """
+        if not self.targets:
+            return rows
+        started = time.perf_counter()
+        targets = self.targets
+        lookup = self.index.lookup
+        result = []
+        for row in rows:
+            empty = [(i, position) for i, position in targets if not (row[i] or "").strip()]
+            point = point_xy(row[index]) if empty else None
+            values = lookup(*point) if point is not None else None
+            if empty:
+                self.checked += 1
+            if values is None:
+                result.append(row)
+                continue
+            self.matched += 1
+            row = list(row)
+            for i, position in empty:
+                if values[position]:
+                    row[i] = values[position]
+                    self.filled += 1
+            result.append(tuple(row))
+        self.elapsed += time.perf_counter() - started
+        return result
+
+    def summary(self) -> str:
+        text = (
+            f"Flächenabgleich: {len(self.index.areas)} Flächen; {self.checked} Bäume mit leerer "
+            f"Grünfläche/Ort, {self.matched} davon in einer Fläche, {self.filled} Werte ergänzt "
+            f"in {self.elapsed:.2f} s"
+        )
+        if self.checked and not self.matched:
+            text += " – kein Baum liegt in einer Fläche, Koordinatensystem des Flächen-Exports prüfen"
+        return text
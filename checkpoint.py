@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+checkpoint – lange Umwandlungen nach einem Abbruch fortsetzen
+
+Bei sehr großen Exporten geht nach einem Absturz, Stromausfall oder Abbruch
+sonst die gesamte Arbeit verloren. Im Checkpoint-Modus (setzt den
+Pipeline-Modus voraus, weil nur dann fortlaufend geschrieben wird) sichert
+der Converter alle checkpoint_every_mb Eingabe-Megabyte:
+
+- Position in der Eingabe (immer an einer Datensatzgrenze)
+- Länge der bereits geschriebenen Ausgabe (*.part, vorher fsync)
+- Zeilenzahl und Zwischenstände der Berichte (unmapped, Validierung, Arten)
+
+Die Sicherung liegt als JSON neben der Ausgabe (treesta_import.csv.checkpoint)
+und wird atomar ersetzt (temporäre Datei, fsync, os.replace). Beim nächsten
+Aufruf mit denselben Einstellungen wird die *.part-Datei auf die gesicherte
+Länge gekürzt und ab der gesicherten Eingabeposition weitergelesen.
+
+Verworfen wird ein Checkpoint, wenn
+- Converter, Mappings, Artentabelle, Validierung oder Umprojektion abweichen
+- der Anfang der Eingabe oder das letzte MiB vor der gesicherten Position
+  nicht mehr übereinstimmen (die Datei wurde ersetzt)
+- die *.part-Datei fehlt oder kürzer ist als gesichert
+Änderungen hinter der gesicherten Position (z. B. eine korrigierte fehlerhafte
+Zeile) erlauben dagegen das Fortsetzen.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_EVERY_MB = 64
+
+# Verglichene Eingabebytes: Dateianfang und Bereich vor der Position
+DIGEST_WINDOW = 1 << 20
+
+
+def file_signature(path: Optional[str]):
+    """
+    (Größe, Änderungszeit) einer Einstellungsdatei bzw. None.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def checkpoint_settings(converter: str, input_path: str, *setting_files, validate: bool = False,
+                        **options) -> dict:
+    """
+    Einstellungen, die zu einem Checkpoint passen müssen.
+    options – weitere Einstellungen, die die Ausgabe verändern (JSON-fähig)
+    """
+    settings = {
+        "version": CHECKPOINT_VERSION,
+        "converter": converter,
+        "input": os.path.abspath(input_path),
+        "files": [[os.path.abspath(p) if p else None, file_signature(p)] for p in setting_files],
+        "validate": bool(validate),
+    }
+    if options:
+        settings["options"] = options
+    return settings
+
+
+def input_digest(path: str, offset: int) -> str:
+    """
+    Hash über den Dateianfang und das letzte MiB vor offset.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(min(offset, DIGEST_WINDOW)))
+        start = max(0, offset - DIGEST_WINDOW)
+        f.seek(start)
+        h.update(f.read(offset - start))
+    return h.hexdigest()
+
+
+class Checkpointer:
+    """
+    Speichert und lädt den Checkpoint einer Umwandlung.
+
+    path      – Checkpoint-Datei (JSON)
+    part_path – unvollständige Ausgabe, deren Länge gesichert wird
+    settings  – siehe checkpoint_settings()
+    """
+
+    def __init__(self, path: str, part_path: str, settings: dict,
+                 every_mb: float = DEFAULT_CHECKPOINT_EVERY_MB):
+        self.path = path
+        self.part_path = part_path
+        self.settings = settings
+        self.every_bytes = max(1, int(every_mb * 1024 * 1024))
+        self._last_position = 0
+
+    def load(self) -> Optional[dict]:
+        """
+        Gültigen Checkpoint laden; ein unpassender wird entfernt (None).
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        input_path = self.settings["input"]
+        offset = state.get("input_offset", 0)
+        valid = (
+            state.get("settings") == self.settings
+            and self._output_present(state.get("output_offset", 0))
+            and os.path.getsize(input_path) >= offset
+            and input_digest(input_path, offset) == state.get("input_digest")
+        )
+        if not valid:
+            self.clear()
+            return None
+
+        self._last_position = offset
+        return state
+
+    def _output_present(self, output_offset) -> bool:
+        """
+        .part-Datei mindestens so lang wie gesichert; beim Aufteilen nach
+        Datentypen (data_types.DataTypeRouter) je Dateiname im Ordner von
+        part_path.
+        """
+        if isinstance(output_offset, dict):
+            folder = os.path.dirname(self.part_path)
+            return all(
+                os.path.exists(path) and os.path.getsize(path) >= offset
+                for path, offset in (
+                    (os.path.join(folder, name + ".part"), value[0])
+                    for name, value in output_offset.items()
+                )
+            )
+        return os.path.exists(self.part_path) and os.path.getsize(self.part_path) >= output_offset
+
+    def due(self, position: int) -> bool:
+        return position - self._last_position >= self.every_bytes
+
+    def save(self, input_offset: int, output_offset: int, row_count: int, **state):
+        """
+        Checkpoint atomar schreiben. Die Ausgabe muss bis output_offset auf
+        der Platte stehen (ImportCsvFile.sync).
+        """
+        state.update(
+            settings=self.settings,
+            input_offset=input_offset,
+            input_digest=input_digest(self.settings["input"], input_offset),
+            output_offset=output_offset,
+            row_count=row_count,
+        )
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_position = input_offset
+
+    def clear(self):
+        for path in (self.path, self.path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+conversion_preview – Vorschau einer Umwandlung ohne die ganze Datei zu lesen
+
+Vor einer langen Umwandlung sollen die ersten Zeilen und typische Werte
+sichtbar sein. Dafür werden nur wenige Datensätze gelesen:
+
+- die ersten head_rows Datensätze
+- eine Zufallsstichprobe aus dem Rest der Datei. Ist der Rest klein
+  (FULL_SCAN_BYTES), wird er gelesen und eine Reservoir-Stichprobe gezogen.
+  Bei großen Dateien müsste die Reservoir-Stichprobe die ganze Datei lesen;
+  stattdessen wird an zufälligen Byte-Positionen zum nächsten Zeilenanfang
+  gesprungen und der dort beginnende Datensatz gelesen. Das kostet unabhängig
+  von der Dateigröße nur einige Lesezugriffe. Datensätze, deren Spaltenzahl
+  nicht zur Kopfzeile passt (Sprung mitten in einen mehrzeiligen Wert),
+  werden verworfen.
+
+Die gelesenen Zeilen werden anschließend mit dem Converter des Profils
+umgewandelt (Converter.preview_rows in converter_bk3/converter_bk4).
+"""
+
+import codecs
+import csv
+import random
+import time
+from collections import namedtuple
+from typing import Optional
+
+try:
+    from .csv_io import ExportSource, intern_row, read_export
+except ImportError:  # Aufruf als Skript (CLI)
+    from csv_io import ExportSource, intern_row, read_export
+
+PREVIEW_HEAD_ROWS = 50
+PREVIEW_SAMPLE_ROWS = 100
+
+# Bis zu dieser Restgröße wird die Datei für die Stichprobe ganz gelesen
+FULL_SCAN_BYTES = 4 * 1024 * 1024
+
+# Zeit für die Stichprobe; danach wird mit den bis dahin gelesenen Zeilen
+# weitergemacht
+PREVIEW_TIME_BUDGET = 0.5
+
+# Höchstens so viele Zeilen je Sprung lesen (mehrzeilige Werte)
+MAX_LINES_PER_RECORD = 50
+
+# Herkunft einer Vorschauzeile
+HEAD = "head"
+SAMPLE = "sample"
+
+# header_bytes – Länge der Kopfzeile in der Datei
+# row_bytes    – Länge aller gelieferten Datensätze in der Datei
+# row_count    – Anzahl der Datensätze, wenn die Datei vollständig gelesen
+#                wurde, sonst None
+ExportSample = namedtuple("ExportSample", "fieldnames rows origins complete header_bytes row_bytes row_count",
+                          defaults=(0, 0, None))
+
+Preview = namedtuple("Preview", "profile fieldnames rows origins unmapped complete elapsed")
+
+
+def _record_at(f, offset: int, width: int, encoding: str, delimiter: str):
+    """
+    Ersten vollständigen Datensatz ab dem nächsten Zeilenanfang nach offset
+    lesen. Liefert (Startposition, Zeilentupel, Länge in Bytes) oder None.
+    """
+    f.seek(offset)
+    f.readline()  # angeschnittene Zeile verwerfen
+    start = f.tell()
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+    def lines():
+        for _ in range(MAX_LINES_PER_RECORD):
+            raw = f.readline()
+            if not raw:
+                return
+            yield decoder.decode(raw)
+
+    try:
+        row = next(csv.reader(lines(), delimiter=delimiter, quotechar='"'), None)
+    except csv.Error:
+        return None
+    if not row or len(row) != width:
+        return None
+    # csv.reader holt nur die Zeilen des Datensatzes – tell() ist sein Ende
+    return start, intern_row(row, width), f.tell() - start
+
+
+def sample_export(path: str, head_rows: int = PREVIEW_HEAD_ROWS,
+                  sample_rows: int = PREVIEW_SAMPLE_ROWS, seed: Optional[int] = None,
+                  time_budget: float = PREVIEW_TIME_BUDGET, encoding: str = "utf-8-sig",
+                  delimiter: str = ";") -> ExportSample:
+    """
+    Kopfzeile, die ersten head_rows Datensätze und bis zu sample_rows zufällig
+    gewählte weitere Datensätze (in Dateireihenfolge).
+
+    complete – True, wenn die Datei dabei vollständig gelesen wurde (kleine
+               Exporte); die Vorschau enthält dann alle Zeilen
+    Dazu die Längen von Kopfzeile und Datensätzen in der Datei und – wenn
+    die Datei ganz gelesen wurde – die genaue Zeilenzahl (engine_selection).
+    """
+    started = time.monotonic()
+
+    rng = random.Random(seed)
+
+    with ExportSource(path, encoding) as source:
+        fieldnames, rows = read_export(source.lines(), delimiter)
+        header_end = source.bytes_read
+        head = []
+        for row in rows:
+            head.append(row)
+            if len(head) >= head_rows:
+                break
+        head_end = source.bytes_read
+        size = source.size
+
+        if len(head) < head_rows or head_end >= size:
+            return ExportSample(fieldnames, head, [HEAD] * len(head), True,
+                                header_end, head_end - header_end, len(head))
+
+        if size - head_end <= FULL_SCAN_BYTES:
+            # Reservoir-Stichprobe über den Rest
+            reservoir = []
+            seen = 0
+            previous = head_end
+            for seen, row in enumerate(rows, 1):
+                length = source.bytes_read - previous
+                previous = source.bytes_read
+                if seen <= sample_rows:
+                    reservoir.append((seen, row, length))
+                else:
+                    slot = rng.randrange(seen)
+                    if slot < sample_rows:
+                        reservoir[slot] = (seen, row, length)
+            reservoir.sort(key=lambda item: item[0])
+            sample = [row for _, row, _ in reservoir]
+            return ExportSample(fieldnames, head + sample, [HEAD] * len(head) + [SAMPLE] * len(sample),
+                                len(sample) < sample_rows, header_end,
+                                head_end - header_end + sum(length for _, _, length in reservoir),
+                                len(head) + seen)
+
+    width = len(fieldnames)
+    sampled = {}
+    with open(path, "rb") as f:
+        attempts = 0
+        while len(sampled) < sample_rows and attempts < sample_rows * 4:
+            if time.monotonic() - started > time_budget:
+                break
+            attempts += 1
+            # Frühester Sprung auf den letzten Zeilenumbruch der ersten
+            # Zeilen – der nächste Zeilenanfang liegt dann bei head_end
+            offset = rng.randrange(head_end - 1, size)
+            record = _record_at(f, offset, width, encoding.replace("-sig", ""), delimiter)
+            if record is not None:
+                sampled.setdefault(record[0], record[1:])
+
+    sample = [sampled[start][0] for start in sorted(sampled)]
+    return ExportSample(fieldnames, head + sample, [HEAD] * len(head) + [SAMPLE] * len(sample), False,
+                        header_end, head_end - header_end + sum(length for _, length in sampled.values()))
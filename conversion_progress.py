@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+conversion_progress – Fortschritt und Abbruch für convert_kataster
+
+Die Converter melden über einen optionalen Callback:
+- aktuelle Phase (convert → write → reports → done)
+- verarbeitete Zeilen, gelesene Bytes gegenüber der Dateigröße
+- Durchsatz und geschätzte Restzeit
+
+Wie oft gemeldet wird, bestimmt der Aufrufer (every_rows). Zwischen zwei
+Zeilen wird außerdem ein CancelToken geprüft; ein Abbruch löst
+ConversionCancelled aus. Geprüft wird nur beim Umwandeln und Schreiben –
+also bevor treesta_import.csv ersetzt wird. Danach läuft die Umwandlung
+zu Ende, damit Import-CSV und Berichte zusammenpassen.
+"""
+
+import time
+from collections import namedtuple
+from typing import Callable, Optional
+
+STAGE_CONVERT = "convert"
+STAGE_WRITE = "write"
+STAGE_REPORTS = "reports"
+STAGE_DONE = "done"
+STAGE_PHOTOS = "photos"
+
+STAGE_LABELS = {
+    STAGE_CONVERT: "Umwandeln",
+    STAGE_WRITE: "Schreiben",
+    STAGE_REPORTS: "Berichte",
+    STAGE_DONE: "Fertig",
+    STAGE_PHOTOS: "Fotos übertragen",
+}
+
+# Nach dem Ersetzen der Import-CSV wird nicht mehr abgebrochen
+CANCELLABLE_STAGES = (STAGE_CONVERT, STAGE_WRITE, STAGE_PHOTOS)
+
+DEFAULT_PROGRESS_EVERY = 1000
+
+ProgressInfo = namedtuple(
+    "ProgressInfo",
+    "stage rows total_rows bytes_read total_bytes elapsed rows_per_second eta_seconds"
+)
+
+
+class ConversionCancelled(Exception):
+    """Die Umwandlung wurde über das CancelToken abgebrochen."""
+
+
+class CancelToken:
+    """
+    Abbruchsignal, das aus einem anderen Thread oder einem UI-Callback
+    gesetzt werden kann.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class ProgressReporter:
+    """
+    Zählt Zeilen je Phase, prüft den Abbruch und ruft den Callback alle
+    every_rows Zeilen sowie bei jedem Phasenwechsel auf.
+    """
+
+    def __init__(self, callback: Optional[Callable] = None,
+                 every_rows: int = DEFAULT_PROGRESS_EVERY,
+                 total_bytes: int = 0, cancel_token: Optional[CancelToken] = None):
+        self.callback = callback
+        self.every_rows = max(1, int(every_rows or DEFAULT_PROGRESS_EVERY))
+        self.total_bytes = total_bytes
+        self.cancel_token = cancel_token
+        self.stage_name = None
+        self.rows = 0
+        self.total_rows = None
+        self.bytes_read = 0
+        self.started = time.monotonic()
+        self.stage_started = self.started
+
+    def check_cancelled(self):
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            raise ConversionCancelled("Umwandlung abgebrochen.")
+
+    def stage(self, name: str, total_rows: Optional[int] = None):
+        if name in CANCELLABLE_STAGES:
+            self.check_cancelled()
+        self.stage_name = name
+        # "Fertig" meldet die Gesamtzahl der Zeilen
+        self.rows = total_rows or 0 if name == STAGE_DONE else 0
+        self.total_rows = total_rows
+        self.stage_started = time.monotonic()
+        self.report()
+
+    def row(self, bytes_read: Optional[int] = None):
+        """
+        Nach jeder Zeile aufrufen.
+        """
+        self.rows += 1
+        if bytes_read is not None:
+            self.bytes_read = bytes_read
+        if self.stage_name in CANCELLABLE_STAGES:
+            self.check_cancelled()
+        if self.callback is not None and self.rows % self.every_rows == 0:
+            self.report()
+
+    def report(self):
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        stage_elapsed = now - self.stage_started
+        rate = self.rows / stage_elapsed if stage_elapsed > 0 else 0.0
+
+        eta = None
+        if self.stage_name == STAGE_CONVERT and self.total_bytes and self.bytes_read:
+            eta = stage_elapsed * (self.total_bytes - self.bytes_read) / self.bytes_read
+        elif self.total_rows and rate:
+            eta = (self.total_rows - self.rows) / rate
+
+        self.callback(ProgressInfo(
+            self.stage_name, self.rows, self.total_rows, self.bytes_read,
+            self.total_bytes, now - self.started, rate, eta
+        ))
+
+
+def format_progress(info: ProgressInfo) -> str:
+    """
+    Einzeilige Anzeige für CLI und Dialog, z. B.
+    "Umwandeln: 12.000 Zeilen (45 %), 2.300 Zeilen/s, noch ca. 0:42"
+    """
+    label = STAGE_LABELS.get(info.stage, info.stage or "")
+    unit = "Dateien" if info.stage == STAGE_PHOTOS else "Zeilen"
+    text = f"{label}: {_thousands(info.rows)} {unit}"
+    if info.stage == STAGE_DONE:
+        return text + f" in {info.elapsed:.1f} s"
+
+    percent = progress_percent(info)
+    if percent is not None:
+        text += f" ({percent} %)"
+    if info.rows_per_second:
+        text += f", {_thousands(info.rows_per_second)} {unit}/s"
+    if info.eta_seconds is not None:
+        minutes, seconds = divmod(int(info.eta_seconds), 60)
+        text += f", noch ca. {minutes}:{seconds:02d}"
+    return text
+
+
+def _thousands(number) -> str:
+    return f"{number:,.0f}".replace(",", ".")
+
+
+def progress_percent(info: ProgressInfo) -> Optional[int]:
+    if info.stage == STAGE_CONVERT and info.total_bytes:
+        return min(100, int(100 * info.bytes_read / info.total_bytes))
+    if info.total_rows:
+        return min(100, int(100 * info.rows / info.total_rows))
+    return None
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+conversion_run – Zustand einer einzelnen Umwandlung
+
+Die Converter-Objekte (Converter in converter_bk3/converter_bk4) halten nur
+unveränderliche, geteilte Daten: geladene Mappings, Artentabelle und
+kompilierte Zeilenpläne. Alles, was sich während einer Umwandlung ändert,
+liegt in einem ConversionRun:
+
+- Ausgabeordner und Pfade der Ausgabedateien
+- Zähler für nicht gemappte Werte
+- Artenauflösung mit eigenem Memo und eigener Liste nicht aufgelöster Arten
+
+So können mehrere Umwandlungen in Threads eines Prozesses gleichzeitig laufen.
+Die Ausgabedateien haben feste Namen (treesta_import.csv usw.); ein
+Ausgabeordner kann daher nur von einer Umwandlung zur Zeit belegt werden.
+Eine zweite Umwandlung in denselben Ordner bricht mit OutputDirInUse ab,
+statt Dateien der ersten zu überschreiben.
+"""
+
+import os
+import threading
+
+try:
+    from .unmapped_stats import UnmappedStats
+except ImportError:  # Aufruf als Skript (CLI)
+    from unmapped_stats import UnmappedStats
+
+OUTPUT_FILENAME = "treesta_import.csv"
+
+_active_output_dirs = set()
+_active_lock = threading.Lock()
+
+
+class OutputDirInUse(RuntimeError):
+    """In den Ausgabeordner schreibt bereits eine andere Umwandlung."""
+
+
+class ConversionRun:
+    """
+    Kontextmanager für eine Umwandlung; belegt den Ausgabeordner bis zum Ende.
+
+    output_dir       – Ordner der Ausgabedateien
+    species_resolver – eigener Resolver des Laufs (SpeciesResolver.fork())
+    """
+
+    def __init__(self, output_dir: str, species_resolver):
+        self.output_dir = output_dir
+        self.species_resolver = species_resolver
+        self.unmapped_values = UnmappedStats()
+        self._key = os.path.normcase(os.path.abspath(output_dir))
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.output_dir, filename)
+
+    @property
+    def output_csv_path(self) -> str:
+        return self.path(OUTPUT_FILENAME)
+
+    def __enter__(self):
+        with _active_lock:
+            if self._key in _active_output_dirs:
+                raise OutputDirInUse(
+                    f"In den Ordner {self.output_dir} schreibt bereits eine andere Umwandlung."
+                )
+            _active_output_dirs.add(self._key)
+        return self
+
+    def __exit__(self, *exc):
+        with _active_lock:
+            _active_output_dirs.discard(self._key)
+        return False
@@ -19,6 +19,19 @@ import re
 from collections import defaultdict
 from typing import Dict, List, Tuple, Iterable
 
+try:
+    from .conversion_progress import (
+        DEFAULT_PROGRESS_EVERY, STAGE_CONVERT, STAGE_DONE, STAGE_REPORTS, STAGE_WRITE,
+        ProgressReporter, format_progress,
+    )
+    from .csv_io import ExportSource
+except ImportError:  # Aufruf als Skript (CLI)
+    from conversion_progress import (
+        DEFAULT_PROGRESS_EVERY, STAGE_CONVERT, STAGE_DONE, STAGE_REPORTS, STAGE_WRITE,
+        ProgressReporter, format_progress,
+    )
+    from csv_io import ExportSource
+
 # === Aggregierbare Ziel-Felder ===
 AGGREGATE_TARGETS = {
     "restriction",
@@ -223,7 +236,15 @@ def map_compound_value_exact(text: str, value_map: Dict[str, str], unmapped_set:
 
 # === Haupt-Konverter ===
 
-def convert_kataster(input_csv_path: str, field_mapping_path: str, value_mapping_path: str) -> Tuple[str, str]:
+def convert_kataster(input_csv_path: str, field_mapping_path: str, value_mapping_path: str,
+                     progress=None, progress_every: int = DEFAULT_PROGRESS_EVERY,
+                     cancel_token=None) -> Tuple[str, str]:
+    """
+    progress     – optionaler Callback(ProgressInfo), alle progress_every Zeilen
+                   und bei jedem Phasenwechsel
+    cancel_token – optionales CancelToken; bei Abbruch wird ConversionCancelled
+                   ausgelöst, bevor treesta_import.csv ersetzt wird
+    """
     project_dir = os.path.dirname(input_csv_path)
     out_csv = os.path.join(project_dir, "treesta_import.csv")
     unmapped_txt = os.path.join(project_dir, "unmapped_values.txt")
@@ -231,13 +252,15 @@ def convert_kataster(input_csv_path: str, field_mapping_path: str, value_mapping
     field_map, target_order, reverse_field = load_field_mapping(field_mapping_path)
     value_map = load_value_mapping(value_mapping_path)
 
-    with open(input_csv_path, encoding="utf-8", newline='') as f:
-        reader = csv.DictReader(f, delimiter=";", quotechar='"')
-        source_rows = list(reader)
-
     unmapped_values = set()
     out_rows: List[Dict[str, str]] = []
 
+    # Zeilenweise lesen; die Datei wird nach der letzten Zeile geschlossen
+    source = ExportSource(input_csv_path, encoding="utf-8")
+    reporter = ProgressReporter(progress, progress_every, source.size, cancel_token)
+    reporter.stage(STAGE_CONVERT)
+
+    source_rows = csv.DictReader(source.lines(), delimiter=";", quotechar='"')
     for src in source_rows:
         dst: Dict[str, str] = {}
         aggregates: Dict[str, List[str]] = defaultdict(list)
@@ -331,13 +354,7 @@ def convert_kataster(input_csv_path: str, field_mapping_path: str, value_mapping
         dst.pop("__prio_condition", None)
         dst.pop("__prio_vitality", None)
         out_rows.append(dst)
-
-    # Unmapped schreiben
-    if unmapped_values:
-        with open(unmapped_txt, "w", encoding="utf-8") as f:
-            f.write("Nicht gemappte Werte (value_mapping ergänzen):\n")
-            for v in sorted(unmapped_values):
-                f.write(v + "\n")
+        reporter.row(source.bytes_read)
 
     # Kopfzeilen
     def add_unique(lst, items):
@@ -366,12 +383,31 @@ def convert_kataster(input_csv_path: str, field_mapping_path: str, value_mapping
     residual = sorted([k for k in present_keys if k not in headers])
     headers = add_unique(headers, residual)
 
-    with open(out_csv, "w", encoding="utf-8", newline='') as f:
-        w = csv.DictWriter(f, fieldnames=headers, delimiter=";", quotechar='"', quoting=csv.QUOTE_ALL)
-        w.writeheader()
-        for r in out_rows:
-            w.writerow({k: r.get(k, "") for k in headers})
+    # Output erst als *.part schreiben; bei Abbruch bleibt eine vorhandene Datei unverändert
+    reporter.stage(STAGE_WRITE, len(out_rows))
+    part_csv = out_csv + ".part"
+    try:
+        with open(part_csv, "w", encoding="utf-8", newline='') as f:
+            w = csv.DictWriter(f, fieldnames=headers, delimiter=";", quotechar='"', quoting=csv.QUOTE_ALL)
+            w.writeheader()
+            for r in out_rows:
+                w.writerow({k: r.get(k, "") for k in headers})
+                reporter.row()
+        os.replace(part_csv, out_csv)
+    except BaseException:
+        if os.path.exists(part_csv):
+            os.remove(part_csv)
+        raise
 
+    # Unmapped schreiben
+    reporter.stage(STAGE_REPORTS)
+    if unmapped_values:
+        with open(unmapped_txt, "w", encoding="utf-8") as f:
+            f.write("Nicht gemappte Werte (value_mapping ergänzen):\n")
+            for v in sorted(unmapped_values):
+                f.write(v + "\n")
+
+    reporter.stage(STAGE_DONE, len(out_rows))
     return out_csv, unmapped_txt
 
 
@@ -392,11 +428,11 @@ def detect_profile(input_csv_path: str) -> str:
         return "baumkataster_3"
     return "baumkataster_4"
 
-def smart_convert(input_csv_path: str, mappings_dir: str) -> Tuple[str, str, str]:
+def smart_convert(input_csv_path: str, mappings_dir: str, progress=None) -> Tuple[str, str, str]:
     profile = detect_profile(input_csv_path)
     fields_map = os.path.join(mappings_dir, f"fields_mapping_{profile}.csv")
     value_map  = os.path.join(mappings_dir, f"value_mapping_{profile}.csv")
-    out_csv, unmapped = convert_kataster(input_csv_path, fields_map, value_map)
+    out_csv, unmapped = convert_kataster(input_csv_path, fields_map, value_map, progress=progress)
     return out_csv, unmapped, profile
 
 
@@ -407,15 +443,26 @@ if __name__ == "__main__":
     ap.add_argument("--fields_mapping_csv", default=None)
     ap.add_argument("--value_mapping_csv", default=None)
     ap.add_argument("--mappings_dir", default=".")
+    ap.add_argument("--progress", action="store_true",
+                    help="Fortschritt, Durchsatz und Restzeit auf stderr ausgeben")
     args = ap.parse_args()
 
+    progress = None
+    if args.progress:
+        import sys
+
+        def progress(info):
+            end = "\n" if info.stage == STAGE_DONE else ""
+            print("\r" + format_progress(info).ljust(79), end=end, file=sys.stderr, flush=True)
+
     if args.fields_mapping_csv and args.value_mapping_csv:
-        out_csv, unmapped = convert_kataster(args.input_csv, args.fields_mapping_csv, args.value_mapping_csv)
+        out_csv, unmapped = convert_kataster(args.input_csv, args.fields_mapping_csv, args.value_mapping_csv,
+                                             progress=progress)
         print("OK:", out_csv)
         if os.path.exists(unmapped):
             print("Hinweise:", unmapped)
     else:
-        out_csv, unmapped, profile = smart_convert(args.input_csv, args.mappings_dir)
+        out_csv, unmapped, profile = smart_convert(args.input_csv, args.mappings_dir, progress)
         print(f"OK ({profile}):", out_csv)
         if os.path.exists(unmapped):
             print("Hinweise:", unmapped)
@@ -17,9 +17,64 @@ Treesta Importer – Konverter für Baumkataster 3/4 → Treesta-CSV
 import csv
 import os
 import re
-from collections import defaultdict
+import threading
+from collections import defaultdict, namedtuple
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Iterable
 
+try:
+    from .species_resolver import (
+        SPECIES_TABLE_FILENAME, UNRESOLVED_SPECIES_FILENAME,
+        SpeciesResolver, write_unresolved_species,
+    )
+    from .conversion_progress import (
+        DEFAULT_PROGRESS_EVERY, STAGE_CONVERT, STAGE_DONE, STAGE_REPORTS, STAGE_WRITE,
+        ProgressReporter, format_progress,
+    )
+    from .checkpoint import CHECKPOINT_SUFFIX, DEFAULT_CHECKPOINT_EVERY_MB, Checkpointer, checkpoint_settings
+    from .conversion_run import ConversionRun
+    from .csv_io import ExportSource, ImportCsvFile, read_export, unique_columns, write_import_csv
+    from .data_types import DataTypeRouting, format_routing, parse_rule
+    from .duplicate_trees import DUPLICATES_REPORT_FILENAME, DuplicateSearch
+    from .mapping_table import shared_mapping
+    from .number_normalization import NUMBER_REPORT_FILENAME, compile_number_normalizer
+    from .pipeline import BATCH_ROWS, DEFAULT_MEMORY_LIMIT_MB, Pipeline, read_batches
+    from .reprojection import DEFAULT_TARGET_EPSG, REPROJECTION_REPORT_FILENAME
+    from .simplification import geometry_steps, reprojection_step
+    from .area_enrichment import AreaEnricher, AreaIndex
+    from .spatial_order import external_sorted, sort_rows
+    from .geojson_sink import OUTPUT_CSV, OUTPUT_GEOJSONSEQ, output_path, write_import_geojsonseq
+    from .validation import VALIDATION_REPORT_FILENAME, compile_validator
+    from .unmapped_stats import UNMAPPED_TEXT_FILENAME, UnmappedStats
+    from .value_suggestions import SUGGESTIONS_FILENAME, write_value_suggestions
+    from .wkt import wkt_column_index
+except ImportError:  # Aufruf als Skript (CLI)
+    from species_resolver import (
+        SPECIES_TABLE_FILENAME, UNRESOLVED_SPECIES_FILENAME,
+        SpeciesResolver, write_unresolved_species,
+    )
+    from conversion_progress import (
+        DEFAULT_PROGRESS_EVERY, STAGE_CONVERT, STAGE_DONE, STAGE_REPORTS, STAGE_WRITE,
+        ProgressReporter, format_progress,
+    )
+    from checkpoint import CHECKPOINT_SUFFIX, DEFAULT_CHECKPOINT_EVERY_MB, Checkpointer, checkpoint_settings
+    from conversion_run import ConversionRun
+    from csv_io import ExportSource, ImportCsvFile, read_export, unique_columns, write_import_csv
+    from data_types import DataTypeRouting, format_routing, parse_rule
+    from duplicate_trees import DUPLICATES_REPORT_FILENAME, DuplicateSearch
+    from mapping_table import shared_mapping
+    from number_normalization import NUMBER_REPORT_FILENAME, compile_number_normalizer
+    from pipeline import BATCH_ROWS, DEFAULT_MEMORY_LIMIT_MB, Pipeline, read_batches
+    from reprojection import DEFAULT_TARGET_EPSG, REPROJECTION_REPORT_FILENAME
+    from simplification import geometry_steps, reprojection_step
+    from area_enrichment import AreaEnricher, AreaIndex
+    from spatial_order import external_sorted, sort_rows
+    from geojson_sink import OUTPUT_CSV, OUTPUT_GEOJSONSEQ, output_path, write_import_geojsonseq
+    from validation import VALIDATION_REPORT_FILENAME, compile_validator
+    from unmapped_stats import UNMAPPED_TEXT_FILENAME, UnmappedStats
+    from value_suggestions import SUGGESTIONS_FILENAME, write_value_suggestions
+    from wkt import wkt_column_index
+
 # === Aggregierbare Ziel-Felder ===
 AGGREGATE_TARGETS = {
     "restriction",
@@ -232,187 +287,633 @@ def map_compound_value_exact(text: str, value_map: Dict[str, str], unmapped_set:
         translated.append(value_map.get(s, s))
     return "{" + ", ".join(translated) + "}"
 
-# === Kern: Konvertierung ======================================================
-def convert_kataster(input_csv_path: str, field_mapping_path: str, value_mapping_path: str) -> Tuple[str, str]:
-    project_dir = os.path.dirname(input_csv_path)
-    out_csv = os.path.join(project_dir, "treesta_import.csv")
-    unmapped_txt = os.path.join(project_dir, "unmapped_values.txt")
-
-    field_map, target_order, reverse_field = load_field_mapping(field_mapping_path)
-    value_map = load_value_mapping(value_mapping_path)
-
-    with open(input_csv_path, encoding="utf-8", newline='') as f:
-        reader = csv.DictReader(f, delimiter=";", quotechar='"')
-        source_rows = list(reader)
-
-    unmapped_values = set()
-    out_rows: List[Dict[str, str]] = []
-
-    for src in source_rows:
-        dst: Dict[str, str] = {}
-        aggregates: Dict[str, List[str]] = defaultdict(list)
-        measures_by_urgency: Dict[str, List[str]] = defaultdict(list)
-
-        for old_key, raw_val in src.items():
-            # Mapping holen; für Koordinaten 1:1 durchlassen, auch ohne Mapping
-            new_key = field_map.get(old_key, "")
-            if not new_key:
-                if is_coord_name(old_key):
-                    new_key = old_key
-                else:
-                    continue
-
-            val = (raw_val or "").strip()
-
-            # --- BK3: measures_N + *_urgency ---------------------------------
-            if (
-                new_key.startswith("measures_")
-                and new_key[-1].isdigit()
-                and not any(suf in new_key for suf in ("_urgency", "_comment", "_date", "_name", "_time", "_costs"))
-            ):
-                index = new_key.split("_")[1]
-                urg_old = reverse_field.get(f"measures_{index}_urgency", "")
-                urg_raw = (src.get(urg_old, "") or "").strip() if urg_old else ""
-                urg_mapped = map_compound_value_exact(urg_raw, value_map, unmapped_values,
-                                                      target_key=f"measures_{index}_urgency") or ""
-                measure_mapped = map_compound_value_exact(val, value_map, unmapped_values,
-                                                          target_key=f"measures_{index}")
-                measures_by_urgency[urg_mapped].append(measure_mapped)
-                continue
+# === Zeilenplan: Kopfzeile einmalig kompilieren ==============================
+# Verarbeitungsarten je Eingabespalte
+OP_MEASURE = 0       # BK3: measures_N + *_urgency
+OP_BK4_MEASURE = 1   # BK4: massnahme_(hoch|normal|…)
+OP_AGGREGATE = 2
+OP_COORD = 3
+OP_SPECIES = 4
+OP_NORMAL = 5
+
+MEASURE_EXCLUDED_SUFFIXES = ("_urgency", "_comment", "_date", "_name", "_time", "_costs")
+BK4_MEASURE_IGNORED_SUFFIXES = ("_bemerkung", "_datum", "_name", "_comment", "_date")
+LEADING_NUMBER_RE = re.compile(r"^\s*\d+\s*")
+
+# Sortierung der Maßnahmen (höchste Priorität zuerst)
+URGENCY_ORDER = {
+    "high": 0,          # umfasst hoch + sofort (gemappt)
+    "normal": 1, "medium": 1, "mittel": 1,
+    "low": 2, "niedrig": 2,
+    "optional": 3,
+    "": 4,
+}
+
+RowPlan = namedtuple(
+    "RowPlan",
+    "fieldnames ops measure_slots species_index species_fallback always_set conditional"
+)
+
+
+def build_row_plan(source_fields: List[str], field_map: Dict[str, str],
+                   reverse_field: Dict[str, str]) -> RowPlan:
+    """
+    Ordnet jeder Eingabespalte einmalig ihre Verarbeitungsart und ihren
+    Zielindex zu. Die Ausgabetupel enthalten alle möglichen Zielspalten;
+    None bedeutet "Feld in dieser Zeile nicht gesetzt".
+    """
+    columns = unique_columns(source_fields)
+    fieldnames: List[str] = []
+    index: Dict[str, int] = {}
+
+    def slot(name):
+        if name not in index:
+            index[name] = len(fieldnames)
+            fieldnames.append(name)
+        return index[name]
 
-            # --- BK4: massnahme_(hoch|normal|niedrig|sofort|optional) --------
-            nk_lc = new_key.lower()
-            if nk_lc.startswith(BK4_MASSNAHME_PREFIX):
-                # Nur das Hauptfeld einsammeln – *_bemerkung/_datum/_name ignorieren
-                if nk_lc in BK4_MASSNAHME_URGENCY:
-                    urg_raw = BK4_MASSNAHME_URGENCY[nk_lc]
-                    urg_mapped = map_compound_value_exact(urg_raw, value_map, unmapped_values,
-                                                          target_key="measures_urgency") or urg_raw
-                    measure_mapped = map_compound_value_exact(val, value_map, unmapped_values,
-                                                              target_key="measures")
-                    measures_by_urgency[urg_mapped].append(measure_mapped)
-                    continue
-                if any(suf in nk_lc for suf in ("_bemerkung", "_datum", "_name", "_comment", "_date")):
-                    continue
-
-            # Aggregierbare Ziel-Felder
-            if new_key in AGGREGATE_TARGETS:
-                mapped = map_compound_value_exact(val, value_map, unmapped_values, target_key=new_key)
-                aggregates[new_key].append(mapped)
+    measure_slots = [(slot(f"measures_{i}"), slot(f"measures_{i}_urgency")) for i in range(1, 6)]
+    measure_indexes = {i for pair in measure_slots for i in pair}
+
+    ops = []
+    for old_key, src_index in columns.items():
+        # Mapping holen; für Koordinaten 1:1 durchlassen, auch ohne Mapping
+        new_key = field_map.get(old_key, "")
+        if not new_key:
+            if is_coord_name(old_key):
+                new_key = old_key
+            else:
                 continue
 
-            # Koordinaten-Passthrough
-            if is_coord_name(new_key) or is_coord_name(old_key):
-                dst[new_key] = val
+        # --- BK3: measures_N + *_urgency ---------------------------------
+        if (
+            new_key.startswith("measures_")
+            and new_key[-1].isdigit()
+            and not any(suf in new_key for suf in MEASURE_EXCLUDED_SUFFIXES)
+        ):
+            measure_index = new_key.split("_")[1]
+            urg_old = reverse_field.get(f"measures_{measure_index}_urgency", "")
+            urg_src = columns.get(urg_old) if urg_old else None
+            ops.append((src_index, OP_MEASURE, measure_index, urg_src))
+            continue
+
+        # --- BK4: massnahme_(hoch|normal|niedrig|sofort|optional) --------
+        nk_lc = new_key.lower()
+        if nk_lc.startswith(BK4_MASSNAHME_PREFIX):
+            # Nur das Hauptfeld einsammeln – *_bemerkung/_datum/_name ignorieren
+            if nk_lc in BK4_MASSNAHME_URGENCY:
+                ops.append((src_index, OP_BK4_MEASURE, BK4_MASSNAHME_URGENCY[nk_lc], None))
+                continue
+            if any(suf in nk_lc for suf in BK4_MEASURE_IGNORED_SUFFIXES):
                 continue
 
-            # Normale Felder
-            if new_key == "species":
-                dst[new_key] = clean_species(val)
-            else:
-                original_new_key = new_key
-                if new_key in ALIAS_TARGETS:
-                    new_key = ALIAS_TARGETS[new_key]
-                if new_key == "vitality":
-                    val = re.sub(r"^\s*\d+\s*", "", val)
-                mapped = map_compound_value_exact(val, value_map, unmapped_values, target_key=new_key)
-                if new_key in ("condition", "vitality"):
-                    prio_map = TARGET_PRIORITY[new_key]
-                    incoming_prio = prio_map.get(original_new_key, 99)
-                    current_prio = dst.get(f"__prio_{new_key}", 999)
-                    if mapped and (incoming_prio < current_prio or not dst.get(new_key)):
-                        dst[new_key] = convert_booleans(mapped)
-                        dst[f"__prio_{new_key}"] = incoming_prio
-                else:
-                    if new_key not in dst or not dst[new_key]:
-                        dst[new_key] = convert_booleans(mapped)
-
-        # Aggregierte Felder in {…}
-        for k, arr in aggregates.items():
-            br = to_braced(arr)
-            if br:
-                dst[k] = br
-
-        # Maßnahmen sortiert/verdichtet
-        urgency_order = {
-            "high": 0,          # umfasst hoch + sofort (gemappt)
-            "normal": 1, "medium": 1, "mittel": 1,
-            "low": 2, "niedrig": 2,
-            "optional": 3,
-            "": 4,
-        }
-        items = sorted(measures_by_urgency.items(), key=lambda kv: urgency_order.get(kv[0], 9))
-        normalized = [(urg, to_braced(mlist)) for urg, mlist in items if to_braced(mlist)]
-
-        # evtl. zuvor gesetzte Felder entfernen
-        for i in range(1, 6):
-            dst.pop(f"measures_{i}", None)
-            dst.pop(f"measures_{i}_urgency", None)
-
-        # kompakt ab 1 schreiben
-        slot = 1
-        for urg, braced in normalized:
-            if slot > 5:
+        if new_key in AGGREGATE_TARGETS:
+            ops.append((src_index, OP_AGGREGATE, slot(new_key), new_key))
+        elif is_coord_name(new_key) or is_coord_name(old_key):
+            ops.append((src_index, OP_COORD, slot(new_key), None))
+        elif new_key == "species":
+            ops.append((src_index, OP_SPECIES, slot(new_key), None))
+        else:
+            target = ALIAS_TARGETS.get(new_key, new_key)
+            ops.append((src_index, OP_NORMAL, slot(target), (target, new_key)))
+
+    species_fallback = [columns[alt] for alt in ("baumart", "art", "species") if alt in columns]
+    species_index = slot("species") if species_fallback else None
+
+    # Spalten, die in jeder Zeile gesetzt werden; alle übrigen werden je
+    # Zeile auf "vorhanden" geprüft
+    always_set = {
+        op[2] for op in ops
+        if op[1] in (OP_COORD, OP_SPECIES)
+        or (op[1] == OP_NORMAL and op[3][0] not in TARGET_PRIORITY)
+    } - measure_indexes
+    conditional = [i for i in range(len(fieldnames)) if i not in always_set]
+
+    return RowPlan(fieldnames, ops, measure_slots, species_index, species_fallback,
+                   always_set, conditional)
+
+
+def convert_row(src: tuple, plan: RowPlan, value_map: Dict[str, str], unmapped_values: UnmappedStats,
+                species_resolver) -> tuple:
+    dst: List = [None] * len(plan.fieldnames)
+    aggregates: Dict[int, List[str]] = defaultdict(list)
+    measures_by_urgency: Dict[str, List[str]] = defaultdict(list)
+    priorities: Dict[int, int] = {}
+
+    for src_index, kind, target, extra in plan.ops:
+        val = src[src_index].strip()
+
+        if kind == OP_MEASURE:
+            urg_raw = src[extra].strip() if extra is not None else ""
+            urg_key = f"measures_{target}_urgency"
+            urg_mapped = map_compound_value_exact(urg_raw, value_map, unmapped_values.column(urg_key),
+                                                  target_key=urg_key) or ""
+            measure_key = f"measures_{target}"
+            measure_mapped = map_compound_value_exact(val, value_map, unmapped_values.column(measure_key),
+                                                      target_key=measure_key)
+            measures_by_urgency[urg_mapped].append(measure_mapped)
+
+        elif kind == OP_BK4_MEASURE:
+            urg_mapped = map_compound_value_exact(target, value_map, unmapped_values.column("measures_urgency"),
+                                                  target_key="measures_urgency") or target
+            measure_mapped = map_compound_value_exact(val, value_map, unmapped_values.column("measures"),
+                                                      target_key="measures")
+            measures_by_urgency[urg_mapped].append(measure_mapped)
+
+        elif kind == OP_AGGREGATE:
+            mapped = map_compound_value_exact(val, value_map, unmapped_values.column(extra), target_key=extra)
+            aggregates[target].append(mapped)
+
+        elif kind == OP_COORD:
+            dst[target] = val
+
+        elif kind == OP_SPECIES:
+            dst[target] = species_resolver.resolve(val)
+
+        else:
+            new_key, original_new_key = extra
+            if new_key == "vitality":
+                val = LEADING_NUMBER_RE.sub("", val)
+            mapped = map_compound_value_exact(val, value_map, unmapped_values.column(new_key),
+                                              target_key=new_key)
+            if new_key in TARGET_PRIORITY:
+                incoming_prio = TARGET_PRIORITY[new_key].get(original_new_key, 99)
+                current_prio = priorities.get(target, 999)
+                if mapped and (incoming_prio < current_prio or not dst[target]):
+                    dst[target] = convert_booleans(mapped)
+                    priorities[target] = incoming_prio
+            elif not dst[target]:
+                dst[target] = convert_booleans(mapped)
+
+    # Aggregierte Felder in {…}
+    for target, arr in aggregates.items():
+        br = to_braced(arr)
+        if br:
+            dst[target] = br
+
+    # Maßnahmen sortiert/verdichtet; evtl. zuvor gesetzte Felder entfernen
+    items = sorted(measures_by_urgency.items(), key=lambda kv: URGENCY_ORDER.get(kv[0], 9))
+    normalized = [(urg, to_braced(mlist)) for urg, mlist in items if to_braced(mlist)]
+    for measure_index, urgency_index in plan.measure_slots:
+        dst[measure_index] = None
+        dst[urgency_index] = None
+
+    # kompakt ab 1 schreiben
+    for (measure_index, urgency_index), (urg, braced) in zip(plan.measure_slots, normalized):
+        dst[measure_index] = braced
+        dst[urgency_index] = urg
+
+    # Species-Fallback
+    if plan.species_index is not None and dst[plan.species_index] is None:
+        for src_index in plan.species_fallback:
+            if src[src_index]:
+                dst[plan.species_index] = species_resolver.resolve(src[src_index])
                 break
-            dst[f"measures_{slot}"] = braced
-            dst[f"measures_{slot}_urgency"] = urg
-            slot += 1
-
-        # Species-Fallback
-        if "species" not in dst:
-            for alt in ("baumart", "art", "species"):
-                if alt in src and src[alt]:
-                    dst["species"] = clean_species(src[alt])
-                    break
-
-        dst.pop("__prio_condition", None)
-        dst.pop("__prio_vitality", None)
-        out_rows.append(dst)
-
-    # Unmapped schreiben
-    if unmapped_values:
-        with open(unmapped_txt, "w", encoding="utf-8") as f:
-            f.write("Nicht gemappte Werte (value_mapping ergänzen):\n")
-            for v in sorted(unmapped_values):
-                f.write(v + "\n")
-
-    # Kopfzeilen
-    def add_unique(lst, items):
-        seen = set(lst)
-        for it in items:
-            if it not in seen:
-                lst.append(it)
-                seen.add(it)
-        return lst
-
-    present_keys, seen_keys = [], set()
-    for r in out_rows:
-        for k in r.keys():
-            if k not in seen_keys:
-                present_keys.append(k)
-                seen_keys.add(k)
 
+    return tuple(dst)
+
+
+def build_headers(fieldnames: List[str], seen: set, target_order: List[str]) -> List[str]:
+    """
+    Kopfzeile aus den tatsächlich gesetzten Spalten: Reihenfolge laut
+    fields_mapping, dann measures_N/measures_N_urgency, Rest alphabetisch.
+    """
+    seen_keys = {fieldnames[i] for i in seen}
     headers = [k for k in target_order if k in seen_keys]
 
     # Generierte Felder: measures_N / measures_N_urgency – urgency immer mitnehmen
-    generated_priority = []
     for i in range(1, 6):
         if f"measures_{i}" in seen_keys:
-            generated_priority.append(f"measures_{i}")
-            generated_priority.append(f"measures_{i}_urgency")
-    headers = add_unique(headers, generated_priority)
+            for name in (f"measures_{i}", f"measures_{i}_urgency"):
+                if name not in headers:
+                    headers.append(name)
 
     # Restliche vorhandene Keys alphabetisch
-    residual = sorted([k for k in present_keys if k not in headers])
-    headers = add_unique(headers, residual)
+    headers += sorted(k for k in seen_keys if k not in headers)
+    return headers
+
+# === Kern: Konvertierung ======================================================
+class Converter:
+    """
+    BK3-Converter mit einmal geladenen Mappings.
+
+    Mappings, Artentabelle und Zeilenpläne werden nach dem Laden nicht mehr
+    verändert und von allen Umwandlungen geteilt; der Zustand einer
+    Umwandlung liegt in einem ConversionRun. Ein Objekt kann daher in einem
+    Prozess für viele Umwandlungen, auch gleichzeitig in mehreren Threads,
+    verwendet werden.
+    """
+
+    profile = "baumkataster_3"
 
-    with open(out_csv, "w", encoding="utf-8", newline='') as f:
-        w = csv.DictWriter(f, fieldnames=headers, delimiter=";", quotechar='"', quoting=csv.QUOTE_ALL)
-        w.writeheader()
-        for r in out_rows:
-            w.writerow({k: r.get(k, "") for k in headers})
+    def __init__(self, field_mapping_path: str, value_mapping_path: str, species_table_path: str = None,
+                 shared_mappings_dir: str = None):
+        if not species_table_path:
+            species_table_path = os.path.join(os.path.dirname(__file__), SPECIES_TABLE_FILENAME)
+        self.field_mapping_path = field_mapping_path
+        self.value_mapping_path = value_mapping_path
+        self.species_table_path = species_table_path
+
+        if shared_mappings_dir:
+            # Gemeinsame Tabellen für mehrere Prozesse (mapping_table); die
+            # Spaltenreihenfolge steht in den Zusatzangaben der Feldtabelle
+            self.field_map = shared_mapping(field_mapping_path, "fields_mapping",
+                                            lambda: load_field_mapping(field_mapping_path)[:2],
+                                            shared_mappings_dir)
+            self.target_order = tuple(self.field_map.meta["extra"])
+            self.reverse_field = shared_mapping(field_mapping_path, "fields_mapping_reverse",
+                                                lambda: load_field_mapping(field_mapping_path)[2],
+                                                shared_mappings_dir)
+            self.value_map = shared_mapping(value_mapping_path, "value_mapping",
+                                            lambda: load_value_mapping(value_mapping_path),
+                                            shared_mappings_dir)
+        else:
+            field_map, target_order, reverse_field = load_field_mapping(field_mapping_path)
+            self.field_map = MappingProxyType(field_map)
+            self.target_order = tuple(target_order)
+            self.reverse_field = MappingProxyType(reverse_field)
+            self.value_map = MappingProxyType(load_value_mapping(value_mapping_path))
+        # Vorlage; jede Umwandlung arbeitet mit fork()
+        self.species_resolver = SpeciesResolver.from_path(species_table_path, clean_species)
 
-    return out_csv, unmapped_txt
+        self._row_plans: Dict[tuple, RowPlan] = {}
+        self._lock = threading.Lock()
+
+    def row_plan(self, source_fields: List[str]) -> RowPlan:
+        """
+        Zeilenplan je Kopfzeile (einmal kompiliert, danach aus dem Cache).
+        """
+        key = tuple(source_fields)
+        with self._lock:
+            plan = self._row_plans.get(key)
+            if plan is None:
+                plan = self._row_plans[key] = build_row_plan(source_fields, self.field_map, self.reverse_field)
+        return plan
+
+    def preview_rows(self, source_fields: List[str], rows: Iterable[tuple]):
+        """
+        Vorschau: nur die übergebenen Eingabezeilen umwandeln – dieselben
+        Schritte wie convert(), aber ohne Dateien zu schreiben.
+
+        Liefert (Ausgabe-Kopfzeile, Ausgabezeilen, UnmappedStats); die
+        Zeilennummern im UnmappedStats beziehen sich auf die Vorschau (ab 1).
+        """
+        plan = self.row_plan(source_fields)
+        species_resolver = self.species_resolver.fork()
+        unmapped_values = UnmappedStats()
+        out_rows: List[tuple] = []
+        seen = set(plan.always_set)
+        for row_index, src in enumerate(rows):
+            unmapped_values.row_no = row_index + 1
+            dst = convert_row(src, plan, self.value_map, unmapped_values, species_resolver)
+            for i in plan.conditional:
+                if dst[i] is not None:
+                    seen.add(i)
+            out_rows.append(dst)
+        if not out_rows:
+            seen = set()
+
+        headers = build_headers(plan.fieldnames, seen, self.target_order)
+        index = {name: i for i, name in enumerate(plan.fieldnames)}
+        indexes = [index[h] for h in headers]
+        return headers, [tuple(dst[i] for i in indexes) for dst in out_rows], unmapped_values
+
+    def iter_rows(self, source_fields: List[str], rows: Iterable[tuple],
+                  unmapped_values: UnmappedStats, species_resolver: SpeciesResolver = None):
+        """
+        Eingabezeilen einzeln umwandeln, ohne Dateien und ohne die Zeilen zu
+        sammeln. Nicht gemappte Werte werden laufend in unmapped_values
+        gezählt (Zeilennummern der Eingabe, Kopfzeile = 1).
+
+        Liefert (Ausgabe-Kopfzeile, Iterator über Ausgabezeilen). Da die
+        Zeilen nicht erst gesammelt werden, enthält die Kopfzeile alle
+        möglichen Spalten in der Reihenfolge der Import-CSV, auch solche, die
+        in keiner Zeile gesetzt werden.
+        """
+        plan = self.row_plan(source_fields)
+        species_resolver = species_resolver or self.species_resolver.fork()
+        headers = build_headers(plan.fieldnames, set(range(len(plan.fieldnames))), self.target_order)
+        index = {name: i for i, name in enumerate(plan.fieldnames)}
+        indexes = [index[h] for h in headers]
+        value_map = self.value_map
+
+        def converted():
+            for row_index, src in enumerate(rows):
+                unmapped_values.row_no = row_index + 2
+                dst = convert_row(src, plan, value_map, unmapped_values, species_resolver)
+                yield tuple(dst[i] for i in indexes)
+
+        return headers, converted()
+
+    def convert(self, input_csv_path: str, output_dir: str = None, **options) -> Tuple[str, str]:
+        """
+        Eine Umwandlung; Optionen wie convert_kataster().
+        output_dir – Ordner der Ausgabedateien (Standard: Ordner der Eingabe)
+        """
+        output_dir = output_dir or os.path.dirname(input_csv_path)
+        with ConversionRun(output_dir, self.species_resolver.fork()) as run:
+            return self._convert(run, input_csv_path, **options)
+
+    def _convert(self, run: ConversionRun, input_csv_path: str, validate: bool = False,
+                 progress=None, progress_every: int = DEFAULT_PROGRESS_EVERY,
+                 cancel_token=None, pipelined: bool = False,
+                 memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB, checkpoint: bool = False,
+                 checkpoint_every_mb: float = DEFAULT_CHECKPOINT_EVERY_MB,
+                 batch_rows: int = BATCH_ROWS, source_epsg=None,
+                 target_epsg=DEFAULT_TARGET_EPSG, coordinate_precision: int = None,
+                 simplify_tolerance: float = None, areas_csv: str = None,
+                 spatial_order: bool = False, output_format: str = OUTPUT_CSV,
+                 normalize_numbers: bool = False, strict_reprojection: bool = False,
+                 routing: DataTypeRouting = None,
+                 duplicates: DuplicateSearch = None) -> Tuple[str, str]:
+        out_csv = output_path(run, output_format)
+        if routing is not None and output_format != OUTPUT_CSV:
+            print("Hinweis: Aufteilen nach Datentypen nur für die CSV-Ausgabe – entfällt")
+            routing = None
+        if routing is not None:
+            write_output = routing.write
+        else:
+            write_output = write_import_geojsonseq if output_format == OUTPUT_GEOJSONSEQ else write_import_csv
+        unmapped_txt = run.path(UNMAPPED_TEXT_FILENAME)
+        suggestions_csv = run.path(SUGGESTIONS_FILENAME)
+        unresolved_species_txt = run.path(UNRESOLVED_SPECIES_FILENAME)
+        validation_report_csv = run.path(VALIDATION_REPORT_FILENAME)
+        number_report_csv = run.path(NUMBER_REPORT_FILENAME)
+        reprojection_report_csv = run.path(REPROJECTION_REPORT_FILENAME)
+        duplicates_csv = run.path(DUPLICATES_REPORT_FILENAME)
+
+        unmapped_values = run.unmapped_values
+        species_resolver = run.species_resolver
+        value_map = self.value_map
+        out_rows: List[tuple] = []
+        row_count = 0
+        spool_path = out_csv + ".spool"
+        resume_offset = None
+
+        # Umprojektion und Vereinfachung der Geometriespalte
+        steps = geometry_steps(source_epsg, target_epsg, coordinate_precision, simplify_tolerance,
+                               strict_reprojection)
+
+        # Grünfläche/Ort aus einem Flächen-Export (Index einmal je Umwandlung)
+        areas = AreaIndex.from_csv(areas_csv) if areas_csv else None
+
+        options = {}
+        if steps:
+            options["geometry"] = [step.settings() for step in steps]
+        if areas is not None:
+            options["areas"] = areas.settings()
+        if spatial_order:
+            options["spatial_order"] = True
+        if output_format != OUTPUT_CSV:
+            options["output_format"] = output_format
+        if normalize_numbers:
+            options["normalize_numbers"] = True
+        if duplicates is not None:
+            options["duplicates"] = duplicates.settings()
+
+        checkpointer = None
+        if checkpoint:
+            pipelined = True
+            checkpointer = Checkpointer(
+                out_csv + CHECKPOINT_SUFFIX, spool_path + ".part",
+                checkpoint_settings(self.profile, input_csv_path, self.field_mapping_path,
+                                    self.value_mapping_path, self.species_table_path, validate=validate,
+                                    **options),
+                checkpoint_every_mb
+            )
+
+        # Eingabezeilen als Tupel lesen und direkt verarbeiten
+        with ExportSource(input_csv_path, encoding="utf-8") as source:
+            reporter = ProgressReporter(progress, progress_every, source.size, cancel_token)
+            reporter.stage(STAGE_CONVERT)
+
+            source_fields, source_rows = read_export(source.lines())
+            plan = self.row_plan(source_fields)
+
+            # Prüfregeln einmal je Kopfzeile kompilieren
+            validator = None
+            if validate:
+                validator = compile_validator(plan.fieldnames, value_map.values())
+
+            # Messwerte als Zahlen (Parser einmal je Kopfzeile)
+            normalizer = None
+            if normalize_numbers:
+                normalizer = compile_number_normalizer(plan.fieldnames)
+                if normalizer is None:
+                    print("Hinweis: keine Messspalten (Höhe, Durchmesser, …) – Zahlenumwandlung entfällt")
+
+            # Geometriespalte für Flächenabgleich, Umprojektion und Vereinfachung
+            wkt_index = wkt_column_index(plan.fieldnames)
+            if areas is not None and wkt_index is not None:
+                # vor der Umprojektion: Flächen und Bäume im selben Koordinatensystem
+                steps.insert(0, AreaEnricher(areas, plan.fieldnames))
+            if duplicates is not None:
+                # nach der Umprojektion: Punkte wie in der Import-CSV
+                duplicates.bind(plan.fieldnames)
+                steps.append(duplicates)
+            if (steps or areas is not None) and wkt_index is None:
+                print("Hinweis: keine Geometriespalte (wkt) – Umprojektion/Vereinfachung/Flächenabgleich/"
+                      "Suche nach doppelten Bäumen entfällt")
+                steps = []
+                duplicates = None
+            reprojector = reprojection_step(steps)
+            if spatial_order and wkt_index is None:
+                print("Hinweis: keine Geometriespalte (wkt) – räumliche Sortierung entfällt")
+                spatial_order = False
+
+            seen = set(plan.always_set)
+
+            def convert_source_row(row_index, src):
+                # Zeilennummer der Eingabedatei (Kopfzeile = 1)
+                unmapped_values.row_no = row_index + 2
+                dst = convert_row(src, plan, value_map, unmapped_values, species_resolver)
+
+                if normalizer is not None:
+                    dst = normalizer.normalize(row_index + 2, dst)
+                if validator is not None:
+                    validator.check(row_index + 2, dst)
+
+                for i in plan.conditional:
+                    if dst[i] is not None:
+                        seen.add(i)
+                return dst
+
+            # Abgebrochene Umwandlung fortsetzen
+            resume = checkpointer.load() if checkpointer is not None else None
+            if resume is not None:
+                source.seek(resume["input_offset"])
+                row_count = resume["row_count"]
+                resume_offset = resume["output_offset"]
+                seen.update(resume["seen"])
+                unmapped_values.load_state(resume["unmapped"])
+                species_resolver.unresolved = set(resume["unresolved_species"])
+                if validator is not None:
+                    validator.load_state(resume["validation"])
+                if normalizer is not None:
+                    normalizer.load_state(resume["numbers"])
+                if reprojector is not None and resume.get("reprojection"):
+                    reprojector.load_state(resume["reprojection"])
+                if duplicates is not None:
+                    duplicates.load_state(resume["duplicates"])
+                print(f"Fortgesetzt ab Zeile {row_count + 2} (Checkpoint)")
+
+            if pipelined:
+                # Zwischendatei mit allen Spalten von plan.fieldnames
+                with ImportCsvFile(spool_path, plan.fieldnames, resume_offset, keep_part=checkpoint) as spool, \
+                        Pipeline(read_batches(source_rows, source, batch_rows), spool.writerows,
+                                 memory_limit_mb) as pipe:
+                    for batch, size, position in pipe.batches():
+                        converted = []
+                        for src in batch:
+                            converted.append(convert_source_row(row_count, src))
+                            row_count += 1
+                            reporter.row(position)
+                        for step in steps:
+                            converted = step.apply_rows(converted, wkt_index)
+                        pipe.emit(converted, size)
+
+                        if checkpointer is not None and checkpointer.due(position):
+                            pipe.drain()
+                            checkpointer.save(
+                                position, spool.sync(), row_count,
+                                seen=sorted(seen),
+                                unmapped=unmapped_values.to_state(),
+                                unresolved_species=sorted(species_resolver.unresolved),
+                                validation=validator.to_state() if validator is not None else None,
+                                numbers=normalizer.to_state() if normalizer is not None else None,
+                                reprojection=reprojector.to_state() if reprojector is not None else None,
+                                duplicates=duplicates.to_state() if duplicates is not None else None,
+                            )
+                    pipe.finish()
+            else:
+                for row_index, src in enumerate(source_rows):
+                    out_rows.append(convert_source_row(row_index, src))
+                    reporter.row(source.bytes_read)
+                row_count = len(out_rows)
+                for step in steps:
+                    out_rows = step.apply_rows(out_rows, wkt_index)
+
+        if not row_count:
+            seen = set()
+
+        # Kopfzeilen + Output (bei Abbruch bleibt eine vorhandene Datei unverändert)
+        headers = build_headers(plan.fieldnames, seen, self.target_order)
+        index = {name: i for i, name in enumerate(plan.fieldnames)}
+        reporter.stage(STAGE_WRITE, row_count)
+        if pipelined:
+            try:
+                with open(spool_path, encoding="utf-8", newline="") as spool:
+                    spooled_rows = csv.reader(spool, delimiter=";", quotechar='"')
+                    next(spooled_rows, None)  # Kopfzeile der Zwischendatei
+                    if spatial_order:
+                        # externes Sortieren in Läufen neben der Zwischendatei
+                        spooled_rows = external_sorted(spooled_rows, wkt_index, spool_path, memory_limit_mb)
+                    write_output(out_csv, headers, spooled_rows, [index[h] for h in headers], reporter)
+            finally:
+                os.remove(spool_path)
+        else:
+            if spatial_order:
+                sort_rows(out_rows, wkt_index)
+            write_output(out_csv, headers, out_rows, [index[h] for h in headers], reporter)
+
+        if checkpointer is not None:
+            checkpointer.clear()
+
+        # Unmapped schreiben
+        reporter.stage(STAGE_REPORTS)
+        # (Text wie bisher, dazu Häufigkeiten je Spalte als CSV/JSON)
+        unmapped_values.write_reports(run.output_dir)
+
+        # Vorschläge aus dem vorhandenen Wertmapping (leere Menge entfernt Altdatei)
+        write_value_suggestions(suggestions_csv, unmapped_values.values(), value_map)
+        write_unresolved_species(unresolved_species_txt, species_resolver.unresolved)
+
+        if validator is not None:
+            validator.write_report(validation_report_csv)
+        if normalizer is not None:
+            normalizer.write_report(number_report_csv)
+            print(normalizer.summary())
+        if reprojector is not None:
+            reprojector.write_report(reprojection_report_csv)
+        if duplicates is not None:
+            duplicates.write_report(duplicates_csv)
+
+        for step in steps:
+            print(step.summary())
+
+        reporter.stage(STAGE_DONE, row_count)
+        return out_csv, unmapped_txt
+
+def convert_kataster(input_csv_path: str, field_mapping_path: str, value_mapping_path: str,
+                     species_table_path: str = None, validate: bool = False,
+                     progress=None, progress_every: int = DEFAULT_PROGRESS_EVERY,
+                     cancel_token=None, pipelined: bool = False,
+                     memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB, checkpoint: bool = False,
+                     checkpoint_every_mb: float = DEFAULT_CHECKPOINT_EVERY_MB,
+                     batch_rows: int = BATCH_ROWS, source_epsg=None,
+                     target_epsg=DEFAULT_TARGET_EPSG, coordinate_precision: int = None,
+                     simplify_tolerance: float = None, areas_csv: str = None,
+                     spatial_order: bool = False, output_format: str = OUTPUT_CSV,
+                     normalize_numbers: bool = False, strict_reprojection: bool = False,
+                     routing: DataTypeRouting = None,
+                     duplicates: DuplicateSearch = None) -> Tuple[str, str]:
+    """
+    progress     – optionaler Callback(ProgressInfo), alle progress_every Zeilen
+                   und bei jedem Phasenwechsel
+    cancel_token – optionales CancelToken; bei Abbruch wird ConversionCancelled
+                   ausgelöst, bevor treesta_import.csv ersetzt wird
+    pipelined    – Lesen, Umwandeln und Schreiben in eigenen Threads überlappen
+                   (pipeline.py, Puffer begrenzt auf memory_limit_mb, Stapel zu
+                   batch_rows Zeilen). Da die Kopfzeile erst nach der letzten
+                   Zeile feststeht, schreibt der Schreib-Thread in eine
+                   Zwischendatei (*.spool), aus der die Import-CSV anschließend
+                   spaltenweise ausgewählt wird.
+    checkpoint   – alle checkpoint_every_mb Eingabe-MB den Stand sichern und
+                   eine abgebrochene Umwandlung dort fortsetzen (checkpoint.py,
+                   gesichert wird die Zwischendatei); schaltet pipelined ein
+    source_epsg  – Koordinatensystem der Geometriespalte (z. B. 31468); gesetzt
+                   wird die Geometrie stapelweise nach target_epsg umprojiziert
+                   (reprojection.py), coordinate_precision Nachkommastellen;
+                   nicht umrechenbare Geometrien in reprojection_report.csv
+    strict_reprojection – bei nicht umrechenbaren Geometrien abbrechen
+                   (ReprojectionError) statt sie unverändert zu übernehmen
+    simplify_tolerance – Flächen-/Plan-Polygone der Geometriespalte mit dieser
+                   Toleranz in Metern vereinfachen und runden (simplification.py)
+    areas_csv    – Flächen-Export (CSV mit WKT-Polygonen); leere green_space/
+                   location der Bäume werden über die Lage ergänzt
+                   (area_enrichment.py)
+    spatial_order – Ausgabezeilen entlang einer Hilbert-Kurve sortieren
+                   (spatial_order.py; im Pipeline-Modus externes Sortieren)
+    output_format – "csv" (treesta_import.csv) oder "geojsonseq"
+                   (treesta_import.geojsonl, ein GeoJSON-Feature je Zeile mit
+                   typisierten Eigenschaften, geojson_sink.py)
+    normalize_numbers – Messwerte (Höhe, Durchmesser, Umfang) mit Dezimalkomma,
+                   Einheit oder als Bereich als Zahl in der Treesta-Einheit
+                   schreiben; nicht lesbare Werte in number_report.csv
+                   (number_normalization.py)
+    routing – DataTypeRouting (data_types.py): die Zeilen beim Schreiben
+                   direkt auf die Import-CSVs der Datentypen verteilen statt
+                   treesta_import.csv zu schreiben; die Dateien stehen danach
+                   in routing.outputs
+    duplicates – DuplicateSearch (duplicate_trees.py): doppelt erfasste Bäume
+                   im selben Durchgang über die Lage suchen und
+                   duplicate_trees.csv schreiben; Zahlen danach in
+                   duplicates.stats
+
+    Für viele Umwandlungen mit denselben Mappings Converter verwenden
+    (Mappings werden dann nur einmal geladen).
+    """
+    converter = Converter(field_mapping_path, value_mapping_path, species_table_path)
+    return converter.convert(
+        input_csv_path, validate=validate, progress=progress, progress_every=progress_every,
+        cancel_token=cancel_token, pipelined=pipelined, memory_limit_mb=memory_limit_mb,
+        checkpoint=checkpoint, checkpoint_every_mb=checkpoint_every_mb, batch_rows=batch_rows,
+        source_epsg=source_epsg, target_epsg=target_epsg, coordinate_precision=coordinate_precision,
+        simplify_tolerance=simplify_tolerance, areas_csv=areas_csv, spatial_order=spatial_order,
+        output_format=output_format, normalize_numbers=normalize_numbers,
+        strict_reprojection=strict_reprojection, routing=routing,
+        duplicates=duplicates
+    )
 
 # === Auto-Erkennung & Smart-Convert ==========================================
 def detect_profile(input_csv_path: str) -> str:
@@ -430,11 +931,29 @@ def detect_profile(input_csv_path: str) -> str:
         return "baumkataster_3"
     return "baumkataster_4"
 
-def smart_convert(input_csv_path: str, mappings_dir: str) -> Tuple[str, str, str]:
+def smart_convert(input_csv_path: str, mappings_dir: str, progress=None,
+                  pipelined: bool = False,
+                  memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB,
+                  checkpoint: bool = False, source_epsg=None,
+                  target_epsg=DEFAULT_TARGET_EPSG, coordinate_precision: int = None,
+                  simplify_tolerance: float = None, areas_csv: str = None,
+                  spatial_order: bool = False, output_format: str = OUTPUT_CSV,
+                  normalize_numbers: bool = False,
+                  strict_reprojection: bool = False,
+                  routing: DataTypeRouting = None,
+                  duplicates: DuplicateSearch = None) -> Tuple[str, str, str]:
     profile = detect_profile(input_csv_path)
     fields_map = os.path.join(mappings_dir, f"fields_mapping_{profile}.csv")
     value_map  = os.path.join(mappings_dir, f"value_mapping_{profile}.csv")
-    out_csv, unmapped = convert_kataster(input_csv_path, fields_map, value_map)
+    out_csv, unmapped = convert_kataster(input_csv_path, fields_map, value_map, progress=progress,
+                                         pipelined=pipelined, memory_limit_mb=memory_limit_mb,
+                                         checkpoint=checkpoint, source_epsg=source_epsg,
+                                         target_epsg=target_epsg, coordinate_precision=coordinate_precision,
+                                         simplify_tolerance=simplify_tolerance, areas_csv=areas_csv,
+                                         spatial_order=spatial_order, output_format=output_format,
+                                         normalize_numbers=normalize_numbers,
+                                         strict_reprojection=strict_reprojection,
+                                         routing=routing, duplicates=duplicates)
     return out_csv, unmapped, profile
 
 # === CLI ======================================================================
@@ -445,15 +964,80 @@ if __name__ == "__main__":
     ap.add_argument("--fields_mapping_csv", default=None)
     ap.add_argument("--value_mapping_csv", default=None)
     ap.add_argument("--mappings_dir", default=".")
+    ap.add_argument("--progress", action="store_true",
+                    help="Fortschritt, Durchsatz und Restzeit auf stderr ausgeben")
+    ap.add_argument("--pipelined", action="store_true",
+                    help="Lesen, Umwandeln und Schreiben überlappen (große Exporte)")
+    ap.add_argument("--memory_limit_mb", type=float, default=DEFAULT_MEMORY_LIMIT_MB,
+                    help="Obergrenze der Puffer im Pipeline-Modus")
+    ap.add_argument("--checkpoint", action="store_true",
+                    help="Stand regelmäßig sichern und abgebrochene Umwandlung fortsetzen")
+    ap.add_argument("--source_epsg", default=None,
+                    help="Koordinatensystem der WKT-Spalte (z. B. 31468, 25832); umprojizieren")
+    ap.add_argument("--target_epsg", default=DEFAULT_TARGET_EPSG,
+                    help="Ziel-Koordinatensystem der Umprojektion")
+    ap.add_argument("--precision", type=int, default=None,
+                    help="Nachkommastellen der umprojizierten Koordinaten")
+    ap.add_argument("--strict_reprojection", action="store_true",
+                    help="bei nicht umrechenbaren Geometrien abbrechen statt sie zu übernehmen")
+    ap.add_argument("--simplify_tolerance", type=float, default=None,
+                    help="Polygone (Flächen, Pläne) mit dieser Toleranz in Metern vereinfachen")
+    ap.add_argument("--areas_csv", default=None,
+                    help="Flächen-Export; leere Grünfläche/Ort der Bäume über die Lage ergänzen")
+    ap.add_argument("--spatial_order", action="store_true",
+                    help="Ausgabe räumlich entlang einer Hilbert-Kurve sortieren")
+    ap.add_argument("--geojsonseq", action="store_true",
+                    help="treesta_import.geojsonl (GeoJSON-Sequenz) statt CSV schreiben")
+    ap.add_argument("--normalize_numbers", action="store_true",
+                    help="Messwerte (Höhe, Durchmesser, Umfang) als Zahl in der Treesta-Einheit schreiben")
+    ap.add_argument("--route_data_types", action="store_true",
+                    help="gemischten Export beim Schreiben nach Datentypen (Geometrie) aufteilen")
+    ap.add_argument("--route_rule", action="append", default=[], type=parse_rule,
+                    help="spalte=wert:datentyp, z. B. atlas=1:plan (mit --route_data_types, mehrfach möglich)")
+    ap.add_argument("--duplicate_distance", type=float, default=None,
+                    help="doppelt erfasste Bäume bis zu diesem Abstand in Metern suchen (duplicate_trees.csv)")
+    ap.add_argument("--duplicate_species", action="store_true",
+                    help="mit --duplicate_distance nur Bäume gleicher Art melden")
     args = ap.parse_args()
+    output_format = OUTPUT_GEOJSONSEQ if args.geojsonseq else OUTPUT_CSV
+    routing = DataTypeRouting(args.route_rule) if args.route_data_types else None
+    duplicates = None
+    if args.duplicate_distance is not None:
+        duplicates = DuplicateSearch(args.duplicate_distance, args.duplicate_species)
+
+    progress = None
+    if args.progress:
+        import sys
+
+        def progress(info):
+            end = "\n" if info.stage == STAGE_DONE else ""
+            print("\r" + format_progress(info).ljust(79), end=end, file=sys.stderr, flush=True)
 
     if args.fields_mapping_csv and args.value_mapping_csv:
-        out_csv, unmapped = convert_kataster(args.input_csv, args.fields_mapping_csv, args.value_mapping_csv)
-        print("OK:", out_csv)
+        out_csv, unmapped = convert_kataster(args.input_csv, args.fields_mapping_csv, args.value_mapping_csv,
+                                             progress=progress, pipelined=args.pipelined,
+                                             memory_limit_mb=args.memory_limit_mb,
+                                             checkpoint=args.checkpoint, source_epsg=args.source_epsg,
+                                             target_epsg=args.target_epsg,
+                                             coordinate_precision=args.precision,
+                                             simplify_tolerance=args.simplify_tolerance,
+                                             areas_csv=args.areas_csv, spatial_order=args.spatial_order,
+                                             output_format=output_format,
+                                             normalize_numbers=args.normalize_numbers,
+                                             strict_reprojection=args.strict_reprojection,
+                                             routing=routing, duplicates=duplicates)
+        print("OK:", out_csv if routing is None else format_routing(routing.outputs))
         if os.path.exists(unmapped):
             print("Hinweise:", unmapped)
     else:
-        out_csv, unmapped, profile = smart_convert(args.input_csv, args.mappings_dir)
-        print(f"OK ({profile}):", out_csv)
+        out_csv, unmapped, profile = smart_convert(args.input_csv, args.mappings_dir, progress,
+                                                   args.pipelined, args.memory_limit_mb,
+                                                   args.checkpoint, args.source_epsg,
+                                                   args.target_epsg, args.precision,
+                                                   args.simplify_tolerance, args.areas_csv,
+                                                   args.spatial_order, output_format,
+                                                   args.normalize_numbers, args.strict_reprojection,
+                                                   routing, duplicates)
+        print(f"OK ({profile}):", out_csv if routing is None else format_routing(routing.outputs))
         if os.path.exists(unmapped):
             print("Hinweise:", unmapped)
@@ -2,6 +2,45 @@
 import csv
 import re
 import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from .area_enrichment import AreaEnricher, AreaIndex
+from .spatial_order import sort_import_csv, sort_rows
+from .geojson_sink import OUTPUT_CSV, OUTPUT_GEOJSONSEQ, GeoJsonSeqFile, output_path, write_import_geojsonseq
+from .checkpoint import (
+    CHECKPOINT_SUFFIX,
+    DEFAULT_CHECKPOINT_EVERY_MB,
+    Checkpointer,
+    checkpoint_settings,
+)
+from .conversion_progress import (
+    DEFAULT_PROGRESS_EVERY,
+    STAGE_CONVERT,
+    STAGE_DONE,
+    STAGE_REPORTS,
+    STAGE_WRITE,
+    ProgressReporter,
+)
+from .conversion_run import ConversionRun
+from .duplicate_trees import DUPLICATES_REPORT_FILENAME
+from .csv_io import ExportSource, ImportCsvFile, read_export, unique_columns, write_import_csv
+from .mapping_table import shared_mapping
+from .number_normalization import NUMBER_REPORT_FILENAME, compile_number_normalizer
+from .pipeline import BATCH_ROWS, DEFAULT_MEMORY_LIMIT_MB, Pipeline, read_batches
+from .reprojection import DEFAULT_TARGET_EPSG, REPROJECTION_REPORT_FILENAME
+from .simplification import geometry_steps, reprojection_step
+from .species_resolver import (
+    SPECIES_TABLE_FILENAME,
+    UNRESOLVED_SPECIES_FILENAME,
+    SpeciesResolver,
+    write_unresolved_species,
+)
+from .unmapped_stats import UNMAPPED_TEXT_FILENAME, UnmappedStats
+from .validation import VALIDATION_REPORT_FILENAME, compile_validator
+from .value_suggestions import SUGGESTIONS_FILENAME, write_value_suggestions
+from .wkt import wkt_column_index
 
 # === ZU PRÜFENDE FELDER ===
 PRUEFFELDER = [
@@ -353,21 +392,122 @@ def is_effectively_empty_measure_value(value):
     return v in {"", "{}", '{""}'}
 
 
-def convert_kataster(input_csv_path, field_mapping_path=None, value_mapping_path=None):
+# Verarbeitungsarten je Eingabespalte
+PLAIN = 0      # nur true/false → 1/0
+CHECKED = 1    # Wertmapping (PRUEFFELDER)
+MEASURE = 2    # Maßnahme + Dringlichkeit (MEASURE_URGENCY_FIELDS)
+
+RowPlan = namedtuple("RowPlan", "fieldnames ops species urgencies")
+
+
+def build_row_plan(original_fields, field_dict):
     """
-    Plugin-kompatible Signatur:
-      convert_kataster(input_csv_path, field_mapping_path=None, value_mapping_path=None)
+    Kompiliert die Kopfzeile einmalig zu einem Zeilenplan.
 
-    Output im selben Ordner:
-      treesta_import.csv + unmapped_values.txt
+    fieldnames – Ausgabespalten in der bisherigen Reihenfolge
+    ops        – je Eingabespalte (Quellindex, Art, Zielindex, Zielfeld, Dringlichkeit)
+    species    – (Quellindex baumart, Zielindex species) oder None
+    urgencies  – (Zielindex, Vorgabewert) der Dringlichkeitsfelder
     """
-    plugin_dir = os.path.dirname(__file__)
-    project_dir = os.path.dirname(input_csv_path)
+    columns = unique_columns(original_fields)
+
+    fieldnames = list(dict.fromkeys(
+        [field_dict.get(f, f) for f in original_fields] +
+        (["species"] if "baumart" in columns else [])
+    ))
+
+    # Alle Dringlichkeitsfelder immer in die Ausgabe aufnehmen
+    for urgency_field in DEFAULT_URGENCIES:
+        if urgency_field not in fieldnames:
+            fieldnames.append(urgency_field)
+
+    # Auch die während der Konvertierung erzeugten Maßnahmenfelder aufnehmen
+    for old_key in columns:
+        if old_key in MEASURE_URGENCY_FIELDS:
+            target_measure = MEASURE_URGENCY_FIELDS[old_key][0]
+            if target_measure not in fieldnames:
+                fieldnames.append(target_measure)
+
+    index = {name: i for i, name in enumerate(fieldnames)}
+
+    ops = []
+    for old_key, src_index in columns.items():
+        if old_key in MEASURE_URGENCY_FIELDS:
+            target_measure, target_urgency, urgency_value = MEASURE_URGENCY_FIELDS[old_key]
+            ops.append((src_index, MEASURE, index[target_measure], target_measure,
+                        (index[target_urgency], urgency_value)))
+            continue
+
+        new_key = field_dict.get(old_key, old_key)
+        kind = CHECKED if new_key in PRUEFFELDER else PLAIN
+        ops.append((src_index, kind, index[new_key], new_key, None))
+
+    species = (columns["baumart"], index["species"]) if "baumart" in columns else None
+    urgencies = [(index[f], default) for f, default in DEFAULT_URGENCIES.items()]
+
+    return RowPlan(fieldnames, ops, species, urgencies)
+
+
+def convert_row(row, row_plan, value_dict, unmapped_stats, species_resolver):
+    """
+    Eine Eingabezeile (Tupel) gemäß Zeilenplan umwandeln.
+    Liefert ein Tupel in der Reihenfolge von row_plan.fieldnames.
+    Nicht gemappte Werte werden je Zielspalte in unmapped_stats gezählt.
+    """
+    new_row = [None] * len(row_plan.fieldnames)
+
+    for src_index, kind, out_index, target_key, urgency in row_plan.ops:
+        val = row[src_index].strip()
+
+        if kind == PLAIN:
+            new_row[out_index] = convert_booleans(val)
+            continue
+
+        mapped_val = map_compound_value_exact(
+            val,
+            value_dict,
+            unmapped_stats.column(target_key),
+            target_key=target_key
+        )
+        mapped_val = convert_booleans(mapped_val)
+        new_row[out_index] = mapped_val
+
+        # Sonderlogik für Maßnahmen + Dringlichkeit
+        if urgency is not None and not is_effectively_empty_measure_value(mapped_val):
+            new_row[urgency[0]] = urgency[1]
+
+    if row_plan.species is not None:
+        src_index, out_index = row_plan.species
+        new_row[out_index] = species_resolver.resolve(row[src_index])
+
+    # Leere oder in BK4 nicht vorhandene Dringlichkeiten mit den
+    # Treesta-Vorgabewerten belegen. Bereits vorhandene Werte bleiben
+    # unverändert.
+    for out_index, default_value in row_plan.urgencies:
+        current_value = new_row[out_index]
+        if current_value is None or current_value.strip() == "":
+            new_row[out_index] = default_value
 
-    output_csv_path = os.path.join(project_dir, "treesta_import.csv")
-    unmapped_output_path = os.path.join(project_dir, "unmapped_values.txt")
+    return tuple(new_row)
+
+
+def _load_mapping(path, key_col, value_col, label, shared_mappings_dir=None):
+    """
+    load_csv_mapping als unveränderliches Mapping; mit shared_mappings_dir als
+    Tabelle, die sich alle Prozesse teilen (mapping_table.shared_mapping).
+    """
+    if shared_mappings_dir:
+        return shared_mapping(path, label, lambda: load_csv_mapping(path, key_col, value_col, label),
+                              shared_mappings_dir)
+    return MappingProxyType(load_csv_mapping(path, key_col, value_col, label))
+
+
+def _default_mapping_paths(field_mapping_path=None, value_mapping_path=None, species_table_path=None):
+    """
+    Fallback: falls manager keine Pfade übergibt, Dateien im Plugin-Verzeichnis.
+    """
+    plugin_dir = os.path.dirname(__file__)
 
-    # Fallback: falls manager keine Pfade übergibt
     if not field_mapping_path:
         for fn in (
             "fields_mapping_baumkataster_bk4.csv",
@@ -390,123 +530,404 @@ def convert_kataster(input_csv_path, field_mapping_path=None, value_mapping_path
                 value_mapping_path = p
                 break
 
+    if not species_table_path:
+        species_table_path = os.path.join(plugin_dir, SPECIES_TABLE_FILENAME)
+
     if not field_mapping_path or not os.path.exists(field_mapping_path):
         raise FileNotFoundError(f"fields_mapping nicht gefunden: {field_mapping_path}")
 
     if not value_mapping_path or not os.path.exists(value_mapping_path):
         raise FileNotFoundError(f"value_mapping nicht gefunden: {value_mapping_path}")
 
-    # Mapping laden
-    field_dict = load_csv_mapping(field_mapping_path, "old_field", "new_field", "fields_mapping")
-    value_dict = load_csv_mapping(value_mapping_path, "old_value", "new_value", "value_mapping")
-
-    print(f"field_mapping_path: {field_mapping_path}")
-    print(f"value_mapping_path: {value_mapping_path}")
-    print(f"Anzahl field mappings: {len(field_dict)}")
-    print(f"Anzahl value mappings: {len(value_dict)}")
-
-    # Input lesen
-    with open(input_csv_path, encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f, delimiter=";", quotechar='"')
-        input_rows = list(reader)
-        original_fields = reader.fieldnames or []
-
-    # Verarbeitung
-    unmapped_values = set()
-    output_rows = []
-
-    for row in input_rows:
-        new_row = {}
-
-        for old_key, value in row.items():
-            val = value.strip() if isinstance(value, str) else value
-
-            # Sonderlogik für Maßnahmen + Dringlichkeit
-            if old_key in MEASURE_URGENCY_FIELDS:
-                target_measure, target_urgency, urgency_value = MEASURE_URGENCY_FIELDS[old_key]
+    return field_mapping_path, value_mapping_path, species_table_path
 
-                mapped_val = map_compound_value_exact(
-                    val,
-                    value_dict,
-                    unmapped_values,
-                    target_key=target_measure
-                )
-                mapped_val = convert_booleans(mapped_val)
 
-                new_row[target_measure] = mapped_val
-
-                if not is_effectively_empty_measure_value(mapped_val):
-                    new_row[target_urgency] = urgency_value
+class Converter:
+    """
+    BK4-Converter mit einmal geladenen Mappings.
 
-                continue
+    Mappings, Artentabelle und Zeilenpläne werden nach dem Laden nicht mehr
+    verändert und von allen Umwandlungen geteilt; der Zustand einer
+    Umwandlung liegt in einem ConversionRun. Ein Objekt kann daher in einem
+    Prozess für viele Umwandlungen, auch gleichzeitig in mehreren Threads,
+    verwendet werden.
+    """
 
-            # Normale Feldverarbeitung
-            new_key = field_dict.get(old_key, old_key)
+    profile = "baumkataster_4"
+
+    def __init__(self, field_mapping_path=None, value_mapping_path=None, species_table_path=None,
+                 shared_mappings_dir=None):
+        self.field_mapping_path, self.value_mapping_path, self.species_table_path = \
+            _default_mapping_paths(field_mapping_path, value_mapping_path, species_table_path)
+
+        # Mapping laden; mit shared_mappings_dir als gemeinsame Tabelle für
+        # mehrere Prozesse (mapping_table)
+        self.field_dict = _load_mapping(self.field_mapping_path, "old_field", "new_field", "fields_mapping",
+                                        shared_mappings_dir)
+        self.value_dict = _load_mapping(self.value_mapping_path, "old_value", "new_value", "value_mapping",
+                                        shared_mappings_dir)
+        # Vorlage; jede Umwandlung arbeitet mit fork()
+        self.species_resolver = SpeciesResolver.from_path(self.species_table_path, clean_species)
+
+        self._row_plans = {}
+        self._lock = threading.Lock()
+
+        print(f"field_mapping_path: {self.field_mapping_path}")
+        print(f"value_mapping_path: {self.value_mapping_path}")
+        print(f"Anzahl field mappings: {len(self.field_dict)}")
+        print(f"Anzahl value mappings: {len(self.value_dict)}")
+
+    def row_plan(self, fieldnames) -> RowPlan:
+        """
+        Zeilenplan je Kopfzeile (einmal kompiliert, danach aus dem Cache).
+        """
+        key = tuple(fieldnames)
+        with self._lock:
+            plan = self._row_plans.get(key)
+            if plan is None:
+                plan = self._row_plans[key] = build_row_plan(fieldnames, self.field_dict)
+        return plan
+
+    def preview_rows(self, fieldnames, rows):
+        """
+        Vorschau: nur die übergebenen Eingabezeilen umwandeln – dieselben
+        Schritte wie convert(), aber ohne Dateien zu schreiben.
+
+        Liefert (Ausgabe-Kopfzeile, Ausgabezeilen, UnmappedStats); die
+        Zeilennummern im UnmappedStats beziehen sich auf die Vorschau (ab 1).
+        """
+        row_plan = self.row_plan(fieldnames)
+        species_resolver = self.species_resolver.fork()
+        unmapped_values = UnmappedStats()
+        output_rows = []
+        for row_index, row in enumerate(rows):
+            unmapped_values.row_no = row_index + 1
+            output_rows.append(convert_row(row, row_plan, self.value_dict, unmapped_values, species_resolver))
+        return row_plan.fieldnames, output_rows, unmapped_values
+
+    def iter_rows(self, fieldnames, rows, unmapped_values, species_resolver=None):
+        """
+        Eingabezeilen einzeln umwandeln, ohne Dateien und ohne die Zeilen zu
+        sammeln. Nicht gemappte Werte werden laufend in unmapped_values
+        gezählt (Zeilennummern der Eingabe, Kopfzeile = 1).
+
+        Liefert (Ausgabe-Kopfzeile, Iterator über Ausgabezeilen).
+        """
+        row_plan = self.row_plan(fieldnames)
+        species_resolver = species_resolver or self.species_resolver.fork()
+        value_dict = self.value_dict
+
+        def converted():
+            for row_index, row in enumerate(rows):
+                unmapped_values.row_no = row_index + 2
+                yield convert_row(row, row_plan, value_dict, unmapped_values, species_resolver)
+
+        return row_plan.fieldnames, converted()
+
+    def convert(self, input_csv_path, output_dir=None, **options):
+        """
+        Eine Umwandlung; Optionen wie convert_kataster().
+        output_dir – Ordner der Ausgabedateien (Standard: Ordner der Eingabe)
+        """
+        output_dir = output_dir or os.path.dirname(input_csv_path)
+        with ConversionRun(output_dir, self.species_resolver.fork()) as run:
+            return self._convert(run, input_csv_path, **options)
+
+    def _convert(self, run, input_csv_path, validate=False, progress=None,
+                 progress_every=DEFAULT_PROGRESS_EVERY, cancel_token=None,
+                 pipelined=False, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 checkpoint=False, checkpoint_every_mb=DEFAULT_CHECKPOINT_EVERY_MB,
+                 batch_rows=BATCH_ROWS, source_epsg=None, target_epsg=DEFAULT_TARGET_EPSG,
+                 coordinate_precision=None, simplify_tolerance=None, areas_csv=None,
+                 spatial_order=False, output_format=OUTPUT_CSV, normalize_numbers=False,
+                 strict_reprojection=False, routing=None, duplicates=None):
+        output_csv_path = output_path(run, output_format)
+        if routing is not None and output_format != OUTPUT_CSV:
+            print("Hinweis: Aufteilen nach Datentypen nur für die CSV-Ausgabe – entfällt")
+            routing = None
+        if routing is not None:
+            output_file, write_output = routing.open, routing.write
+        elif output_format == OUTPUT_GEOJSONSEQ:
+            output_file, write_output = GeoJsonSeqFile, write_import_geojsonseq
+        else:
+            output_file, write_output = ImportCsvFile, write_import_csv
+        unmapped_output_path = run.path(UNMAPPED_TEXT_FILENAME)
+        suggestions_output_path = run.path(SUGGESTIONS_FILENAME)
+        unresolved_species_path = run.path(UNRESOLVED_SPECIES_FILENAME)
+        validation_report_path = run.path(VALIDATION_REPORT_FILENAME)
+        number_report_path = run.path(NUMBER_REPORT_FILENAME)
+        reprojection_report_path = run.path(REPROJECTION_REPORT_FILENAME)
+        duplicates_report_path = run.path(DUPLICATES_REPORT_FILENAME)
+
+        # Umprojektion und Vereinfachung der Geometriespalte
+        steps = geometry_steps(source_epsg, target_epsg, coordinate_precision, simplify_tolerance,
+                               strict_reprojection)
+
+        # Grünfläche/Ort aus einem Flächen-Export (Index einmal je Umwandlung)
+        areas = AreaIndex.from_csv(areas_csv) if areas_csv else None
+
+        options = {}
+        if steps:
+            options["geometry"] = [step.settings() for step in steps]
+        if areas is not None:
+            options["areas"] = areas.settings()
+        if spatial_order:
+            options["spatial_order"] = True
+        if output_format != OUTPUT_CSV:
+            options["output_format"] = output_format
+        if normalize_numbers:
+            options["normalize_numbers"] = True
+        if routing is not None:
+            options["routing"] = routing.settings()
+        if duplicates is not None:
+            options["duplicates"] = duplicates.settings()
+
+        checkpointer = None
+        if checkpoint:
+            pipelined = True
+            checkpointer = Checkpointer(
+                output_csv_path + CHECKPOINT_SUFFIX, output_csv_path + ".part",
+                checkpoint_settings(self.profile, input_csv_path, self.field_mapping_path,
+                                    self.value_mapping_path, self.species_table_path, validate=validate,
+                                    **options),
+                checkpoint_every_mb
+            )
 
-            if new_key not in PRUEFFELDER:
-                new_val = convert_booleans(val)
+        # Input lesen und direkt verarbeiten: Eingabezeilen sind Tupel,
+        # Ausgabezeilen Tupel gemäß row_plan.fieldnames
+        unmapped_values = run.unmapped_values
+        species_resolver = run.species_resolver
+        value_dict = self.value_dict
+        output_rows = []
+        row_count = 0
+        resume_offset = None
+
+        with ExportSource(input_csv_path) as source:
+            reporter = ProgressReporter(progress, progress_every, source.size, cancel_token)
+            reporter.stage(STAGE_CONVERT)
+
+            original_fields, input_rows = read_export(source.lines())
+            row_plan = self.row_plan(original_fields)
+
+            # Prüfregeln einmal je Kopfzeile kompilieren
+            validator = None
+            if validate:
+                validator = compile_validator(row_plan.fieldnames, value_dict.values())
+
+            # Messwerte als Zahlen (Parser einmal je Kopfzeile)
+            normalizer = None
+            if normalize_numbers:
+                normalizer = compile_number_normalizer(row_plan.fieldnames)
+                if normalizer is None:
+                    print("Hinweis: keine Messspalten (Höhe, Durchmesser, …) – Zahlenumwandlung entfällt")
+
+            # Geometriespalte für Flächenabgleich, Umprojektion und Vereinfachung
+            wkt_index = wkt_column_index(row_plan.fieldnames)
+            if areas is not None and wkt_index is not None:
+                # vor der Umprojektion: Flächen und Bäume im selben Koordinatensystem
+                steps.insert(0, AreaEnricher(areas, row_plan.fieldnames))
+            if duplicates is not None:
+                # nach der Umprojektion: Punkte wie in der Import-CSV
+                duplicates.bind(row_plan.fieldnames)
+                steps.append(duplicates)
+            if (steps or areas is not None) and wkt_index is None:
+                print("Hinweis: keine Geometriespalte (wkt) – Umprojektion/Vereinfachung/Flächenabgleich/"
+                      "Suche nach doppelten Bäumen entfällt")
+                steps = []
+                duplicates = None
+            reprojector = reprojection_step(steps)
+            if spatial_order and wkt_index is None:
+                print("Hinweis: keine Geometriespalte (wkt) – räumliche Sortierung entfällt")
+                spatial_order = False
+
+            def convert_input_row(row_index, row):
+                # Zeilennummer der Eingabedatei (Kopfzeile = 1)
+                unmapped_values.row_no = row_index + 2
+                new_row = convert_row(row, row_plan, value_dict, unmapped_values, species_resolver)
+
+                if normalizer is not None:
+                    new_row = normalizer.normalize(row_index + 2, new_row)
+                if validator is not None:
+                    validator.check(row_index + 2, new_row)
+
+                return new_row
+
+            # Abgebrochene Umwandlung fortsetzen
+            resume = checkpointer.load() if checkpointer is not None else None
+            if resume is not None:
+                source.seek(resume["input_offset"])
+                row_count = resume["row_count"]
+                resume_offset = resume["output_offset"]
+                unmapped_values.load_state(resume["unmapped"])
+                species_resolver.unresolved = set(resume["unresolved_species"])
+                if validator is not None:
+                    validator.load_state(resume["validation"])
+                if normalizer is not None:
+                    normalizer.load_state(resume["numbers"])
+                if reprojector is not None and resume.get("reprojection"):
+                    reprojector.load_state(resume["reprojection"])
+                if duplicates is not None:
+                    duplicates.load_state(resume["duplicates"])
+                print(f"Fortgesetzt ab Zeile {row_count + 2} (Checkpoint)")
+
+            if pipelined:
+                # Kopfzeile steht fest – Ausgabe direkt hinter der Umwandlung schreiben
+                with output_file(output_csv_path, row_plan.fieldnames, resume_offset,
+                                   keep_part=checkpoint) as output, \
+                        Pipeline(read_batches(input_rows, source, batch_rows), output.writerows,
+                                 memory_limit_mb) as pipe:
+                    for batch, size, position in pipe.batches():
+                        converted = []
+                        for row in batch:
+                            converted.append(convert_input_row(row_count, row))
+                            row_count += 1
+                            reporter.row(position)
+                        for step in steps:
+                            converted = step.apply_rows(converted, wkt_index)
+                        pipe.emit(converted, size)
+
+                        if checkpointer is not None and checkpointer.due(position):
+                            pipe.drain()
+                            checkpointer.save(
+                                position, output.sync(), row_count,
+                                unmapped=unmapped_values.to_state(),
+                                unresolved_species=sorted(species_resolver.unresolved),
+                                validation=validator.to_state() if validator is not None else None,
+                                numbers=normalizer.to_state() if normalizer is not None else None,
+                                reprojection=reprojector.to_state() if reprojector is not None else None,
+                                duplicates=duplicates.to_state() if duplicates is not None else None,
+                            )
+
+                    reporter.stage(STAGE_WRITE, row_count)
+                    pipe.finish()
             else:
-                new_val = map_compound_value_exact(
-                    val,
-                    value_dict,
-                    unmapped_values,
-                    target_key=new_key
-                )
-                new_val = convert_booleans(new_val)
-
-            new_row[new_key] = new_val
-
-        if "baumart" in row:
-            new_row["species"] = clean_species(row["baumart"])
-
-        # Leere oder in BK4 nicht vorhandene Dringlichkeiten mit den
-        # Treesta-Vorgabewerten belegen. Bereits vorhandene Werte bleiben
-        # unverändert.
-        for urgency_field, default_value in DEFAULT_URGENCIES.items():
-            current_value = new_row.get(urgency_field)
-            if current_value is None or str(current_value).strip() == "":
-                new_row[urgency_field] = default_value
-
-        output_rows.append(new_row)
-
-    # Spaltenreihenfolge
-    output_fieldnames = list(dict.fromkeys(
-        [field_dict.get(f, f) for f in original_fields] +
-        (["species"] if output_rows and "species" in output_rows[0] else [])
-    ))
+                for row_index, row in enumerate(input_rows):
+                    output_rows.append(convert_input_row(row_index, row))
+                    reporter.row(source.bytes_read)
+                row_count = len(output_rows)
+                for step in steps:
+                    output_rows = step.apply_rows(output_rows, wkt_index)
+
+        # Output schreiben (bei Abbruch bleibt eine vorhandene Datei unverändert)
+        if not pipelined:
+            reporter.stage(STAGE_WRITE, row_count)
+            if spatial_order:
+                sort_rows(output_rows, wkt_index)
+            write_output(output_csv_path, row_plan.fieldnames, output_rows, reporter=reporter)
+        elif spatial_order and output_format == OUTPUT_GEOJSONSEQ:
+            print("Hinweis: räumliche Sortierung im Pipeline-Modus nur für die CSV-Ausgabe – entfällt")
+        elif spatial_order:
+            # im Pipeline-Modus erst die fertigen Dateien extern sortieren
+            if routing is not None:
+                for info in routing.outputs.values():
+                    sort_import_csv(info["path"], memory_limit_mb)
+            else:
+                sort_import_csv(output_csv_path, memory_limit_mb)
+
+        if checkpointer is not None:
+            checkpointer.clear()
+
+        # Ungemappte Werte speichern
+        reporter.stage(STAGE_REPORTS)
+        # (Text wie bisher, dazu Häufigkeiten je Spalte als CSV/JSON)
+        unmapped_values.write_reports(run.output_dir)
+
+        # Vorschläge aus dem vorhandenen Wertmapping (leere Menge entfernt Altdatei)
+        write_value_suggestions(suggestions_output_path, unmapped_values.values(), value_dict)
+        write_unresolved_species(unresolved_species_path, species_resolver.unresolved)
+
+        if validator is not None:
+            validator.write_report(validation_report_path)
+            print(f"Validierung: {validator.violation_count} Verstöße, {validator.elapsed:.2f} s")
+        if normalizer is not None:
+            normalizer.write_report(number_report_path)
+            print(normalizer.summary())
+        if reprojector is not None:
+            reprojector.write_report(reprojection_report_path)
+        if duplicates is not None:
+            duplicates.write_report(duplicates_report_path)
+
+        for step in steps:
+            print(step.summary())
+
+        reporter.stage(STAGE_DONE, row_count)
+        return output_csv_path, unmapped_output_path
+
+
+def convert_kataster(input_csv_path, field_mapping_path=None, value_mapping_path=None,
+                     species_table_path=None, validate=False, progress=None,
+                     progress_every=DEFAULT_PROGRESS_EVERY, cancel_token=None,
+                     pipelined=False, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                     checkpoint=False, checkpoint_every_mb=DEFAULT_CHECKPOINT_EVERY_MB,
+                     batch_rows=BATCH_ROWS, source_epsg=None, target_epsg=DEFAULT_TARGET_EPSG,
+                     coordinate_precision=None, simplify_tolerance=None, areas_csv=None,
+                     spatial_order=False, output_format=OUTPUT_CSV, normalize_numbers=False,
+                     strict_reprojection=False, routing=None, duplicates=None):
+    """
+    Plugin-kompatible Signatur:
+      convert_kataster(input_csv_path, field_mapping_path=None, value_mapping_path=None)
 
-    # Alle Dringlichkeitsfelder immer in die Ausgabe aufnehmen. Das verhindert
-    # zugleich Fehler des DictWriter wegen zusätzlicher Schlüssel in new_row.
-    for urgency_field in DEFAULT_URGENCIES:
-        if urgency_field not in output_fieldnames:
-            output_fieldnames.append(urgency_field)
-
-    # Auch alle sonstigen während der Konvertierung erzeugten Felder aufnehmen.
-    for output_row in output_rows:
-        for field_name in output_row:
-            if field_name not in output_fieldnames:
-                output_fieldnames.append(field_name)
-
-    # Ungemappte Werte speichern
-    if unmapped_values:
-        with open(unmapped_output_path, "w", encoding="utf-8") as f:
-            f.write("Nicht gemappte Werte (value_mapping ergänzen):\n")
-            for val in sorted(unmapped_values):
-                f.write(f"{val}\n")
-    else:
-        if os.path.exists(unmapped_output_path):
-            os.remove(unmapped_output_path)
-
-    # Output schreiben
-    with open(output_csv_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=output_fieldnames,
-            delimiter=";",
-            quotechar='"',
-            quoting=csv.QUOTE_ALL
-        )
-        writer.writeheader()
-        writer.writerows(output_rows)
+    species_table_path – optionale Artentabelle; Standard: species_table.csv
+                         im Plugin-Verzeichnis (falls vorhanden)
+    validate           – Ausgabewerte prüfen und validation_report.csv schreiben
+    progress           – optionaler Callback(ProgressInfo), alle progress_every
+                         Zeilen und bei jedem Phasenwechsel
+    cancel_token       – optionales CancelToken; bei Abbruch wird
+                         ConversionCancelled ausgelöst und keine Ausgabe ersetzt
+    pipelined          – Lesen, Umwandeln und Schreiben in eigenen Threads
+                         überlappen (pipeline.py); die Zeilen werden nicht
+                         gesammelt, der Puffer ist auf memory_limit_mb begrenzt,
+                         weitergereicht wird in Stapeln zu batch_rows Zeilen
+    checkpoint         – alle checkpoint_every_mb Eingabe-MB den Stand sichern
+                         und eine abgebrochene Umwandlung mit denselben
+                         Einstellungen dort fortsetzen (checkpoint.py);
+                         schaltet den Pipeline-Modus ein
+    source_epsg        – Koordinatensystem der Geometriespalte (z. B. 31468);
+                         gesetzt wird die Geometrie stapelweise nach
+                         target_epsg umprojiziert (reprojection.py) und mit
+                         coordinate_precision Nachkommastellen geschrieben;
+                         nicht umrechenbare Geometrien in reprojection_report.csv
+    strict_reprojection – bei nicht umrechenbaren Geometrien abbrechen
+                         (ReprojectionError) statt sie unverändert zu übernehmen
+    simplify_tolerance – Flächen-/Plan-Polygone der Geometriespalte mit dieser
+                         Toleranz in Metern vereinfachen und runden
+                         (simplification.py)
+    areas_csv          – Flächen-Export (CSV mit WKT-Polygonen); leere
+                         green_space/location der Bäume werden über die Lage
+                         ergänzt (area_enrichment.py)
+    spatial_order      – Ausgabezeilen entlang einer Hilbert-Kurve sortieren
+                         (spatial_order.py; im Pipeline-Modus externes
+                         Sortieren der fertigen Import-CSV)
+    output_format      – "csv" (treesta_import.csv) oder "geojsonseq"
+                         (treesta_import.geojsonl, ein GeoJSON-Feature je
+                         Zeile mit typisierten Eigenschaften, geojson_sink.py)
+    normalize_numbers  – Messwerte (Höhe, Durchmesser, Umfang) mit Dezimalkomma,
+                         Einheit oder als Bereich als Zahl in der Treesta-Einheit
+                         schreiben; nicht lesbare Werte in number_report.csv
+                         (number_normalization.py)
+    routing            – DataTypeRouting (data_types.py): die Zeilen beim
+                         Schreiben direkt auf die Import-CSVs der Datentypen
+                         verteilen statt treesta_import.csv zu schreiben; die
+                         Dateien stehen danach in routing.outputs
+    duplicates         – DuplicateSearch (duplicate_trees.py): doppelt erfasste
+                         Bäume im selben Durchgang über die Lage suchen und
+                         duplicate_trees.csv schreiben; Zahlen danach in
+                         duplicates.stats
+
+    Für viele Umwandlungen mit denselben Mappings Converter verwenden
+    (Mappings werden dann nur einmal geladen).
 
-    return output_csv_path, unmapped_output_path
+    Output im selben Ordner:
+      treesta_import.csv + unmapped_values.txt (+ unresolved_species.txt)
+    """
+    converter = Converter(field_mapping_path, value_mapping_path, species_table_path)
+    return converter.convert(
+        input_csv_path, validate=validate, progress=progress, progress_every=progress_every,
+        cancel_token=cancel_token, pipelined=pipelined, memory_limit_mb=memory_limit_mb,
+        checkpoint=checkpoint, checkpoint_every_mb=checkpoint_every_mb, batch_rows=batch_rows,
+        source_epsg=source_epsg, target_epsg=target_epsg, coordinate_precision=coordinate_precision,
+        simplify_tolerance=simplify_tolerance, areas_csv=areas_csv, spatial_order=spatial_order,
+        output_format=output_format, normalize_numbers=normalize_numbers,
+        strict_reprojection=strict_reprojection, routing=routing,
+        duplicates=duplicates
+    )
@@ -3,87 +3,425 @@
 converter_manager – steuert die Auswahl des passenden Converters (BK3/BK4)
 und ist die einzige Schnittstelle für treesta_importer_dialog.py
 
-- detect_profile() → "baumkataster_3" oder "baumkataster_4"
+- detect_profile() → Name des erkannten Profils (profiles.PROFILES),
+                     z. B. "baumkataster_3" oder "baumkataster_4"
 - smart_convert()  → ruft converter_bk3 / converter_bk4 mit den richtigen
                      mapping-Dateien auf und liefert:
                      (out_csv, unmapped_txt, profile)
+                     optional mit Fortschritts-Callback und CancelToken
+                     (siehe conversion_progress)
+- preview_convert() → wandelt nur die ersten Zeilen und eine Stichprobe um
+                     (Vorschau im Dialog, keine Dateien)
+- convert_rows()   → wandelt eine Datei oder ein Dateiobjekt zeilenweise um
+                     und liefert die Zeilen als Iterator, nicht gemappte
+                     Werte laufend (Einbettung in andere Werkzeuge, keine
+                     Dateien)
+- delta_convert()  → wandelt nur neue/geänderte Bäume zwischen zwei Exporten um
+- diff_with_database() → gleicht eine Import-CSV mit tree_data einer
+                     bestehenden database.gpkg ab (neu/geändert/unverändert)
+- transfer_photo_files() → kopiert bzw. verlinkt die Fotos einer oder
+                     mehrerer Import-CSVs in den Treesta-Fotoordner
+                     (photo_transfer_report.csv)
+- share_mappings()  → Mappings als gemeinsame Tabellen laden (Prozess-Pool,
+                     mapping_table)
 """
 
-import csv
+import codecs
 import os
 import importlib
+import threading
+import time
+from itertools import islice
+
+from .area_enrichment import AreaEnricher, AreaIndex
+from .checkpoint import file_signature
+from .conversion_preview import PREVIEW_HEAD_ROWS, PREVIEW_SAMPLE_ROWS, Preview, sample_export
+from .conversion_progress import DEFAULT_PROGRESS_EVERY
+from .csv_io import read_export
+from .engine_selection import ENGINE_AUTO, ENGINE_PIPELINED, choose_engine, format_engine_plan, prescan
+from .export_delta import DELETED_FILENAME, diff_exports
+from .geojson_sink import OUTPUT_CSV
+from .gpkg_delta import diff_against_database
+from .mapping_table import DEFAULT_TABLE_DIR
+from .photo_transfer import MODE_COPY, transfer_photos
+from .pipeline import BATCH_ROWS, DEFAULT_MEMORY_LIMIT_MB
+from .profiles import PROFILES
+from .reprojection import DEFAULT_TARGET_EPSG
+from .simplification import geometry_steps
+from .unmapped_stats import UnmappedStats
+from .wkt import wkt_column_index
 
 
 def detect_profile(input_csv_path: str) -> str:
     """
-    Einfache Profil-Erkennung:
+    Profil-Erkennung über die Signaturspalten der registrierten Profile
+    (profiles.PROFILES): ein Signaturpräfix ("Kontrollen_" → Baumkataster 3)
+    entscheidet, sonst der höchste Anteil gefundener Signaturen; passt keine,
+    wird profiles.UnknownProfile ausgelöst.
+    """
+    return PROFILES.detect_file(input_csv_path).name
+
+
+# Geladene Converter je Profil und Mapping-Dateien (Größe/Änderungszeit):
+# ein Prozess lädt die Mappings nur einmal, geänderte Dateien werden neu geladen
+_converters = {}
+_converters_lock = threading.Lock()
+
+# Ordner der gemeinsamen Mapping-Tabellen bzw. None (Mappings je Prozess als dict)
+_shared_mappings_dir = None
+
 
-    - Wenn eine Kopfzeile mit 'Kontrollen_' beginnt → Baumkataster 3
-    - sonst → Baumkataster 4
+def share_mappings(table_dir: str = DEFAULT_TABLE_DIR):
     """
-    with open(input_csv_path, encoding="utf-8", newline="") as f:
-        reader = csv.reader(f, delimiter=";", quotechar='"')
-        headers = next(reader, [])
+    Converter laden ihre Mappings ab jetzt als Tabellen, die sich alle
+    Prozesse teilen (mapping_table): im Initializer eines Prozess-Pools
+    aufrufen, z. B.
 
-    if any(h.startswith("Kontrollen_") for h in headers):
-        return "baumkataster_3"
-    return "baumkataster_4"
+        ProcessPoolExecutor(initializer=converter_manager.share_mappings)
+
+    Der erste Prozess schreibt die Tabellen, alle weiteren blenden sie nur
+    ein. table_dir=None schaltet zurück auf dicts je Prozess.
+    """
+    global _shared_mappings_dir
+    with _converters_lock:
+        _shared_mappings_dir = table_dir
+        _converters.clear()
 
 
-def _load_converter(profile: str):
+def _load_converter(profile: str, plugin_dir: str):
     """
-    Lädt das passende Converter-Modul.
+    Liefert einen konfigurierten Converter (Klasse Converter des Moduls)
+    mit den Mapping-Dateien des Profils. Converter sind threadsicher und
+    werden zwischen Aufrufen wiederverwendet.
 
-    Erwartet:
-    - profile == "baumkataster_3" → Modul .converter_bk3
-    - profile == "baumkataster_4" → Modul .converter_bk4
+    Modul und Mapping-Dateien stehen im Profil (profiles.PROFILES) und werden
+    erst hier geladen. Ein nicht registriertes Profil löst UnknownProfile aus.
     """
-    if profile == "baumkataster_3":
-        module_name = ".converter_bk3"
-    elif profile == "baumkataster_4":
-        module_name = ".converter_bk4"
-    else:
-        # Fallback: BK4 verwenden
-        module_name = ".converter_bk4"
+    module_name = PROFILES.get(profile).module
 
-    try:
-        return importlib.import_module(module_name, package=__package__)
-    except Exception as e:
-        raise RuntimeError(f"Converter-Modul '{module_name}' konnte nicht geladen werden: {e}")
+    paths = _mapping_paths(profile, plugin_dir)
+    key = (module_name, paths, tuple(str(file_signature(p)) for p in paths))
+
+    with _converters_lock:
+        converter = _converters.get(key)
+        if converter is None:
+            try:
+                module = importlib.import_module(module_name, package=__package__)
+            except Exception as e:
+                raise RuntimeError(f"Converter-Modul '{module_name}' konnte nicht geladen werden: {e}")
+            if _shared_mappings_dir:
+                converter = module.Converter(*paths, shared_mappings_dir=_shared_mappings_dir)
+            else:
+                converter = module.Converter(*paths)
+            _converters[key] = converter
+    return converter
+
+
+def _mapping_paths(profile: str, plugin_dir: str):
+    """
+    Mapping-Dateien und Artentabelle abhängig vom Profil.
+    """
+    fields_mapping_path, value_mapping_path, species_table_path = PROFILES.mapping_paths(profile, plugin_dir)
+
+    if not os.path.exists(fields_mapping_path):
+        raise FileNotFoundError(f"Feldmapping nicht gefunden: {fields_mapping_path}")
+    if not os.path.exists(value_mapping_path):
+        raise FileNotFoundError(f"Wertmapping nicht gefunden: {value_mapping_path}")
+
+    return fields_mapping_path, value_mapping_path, species_table_path
 
 
-def smart_convert(input_csv_path: str, plugin_dir: str):
+def smart_convert(input_csv_path: str, plugin_dir: str, validate: bool = False,
+                  progress=None, progress_every: int = DEFAULT_PROGRESS_EVERY,
+                  cancel_token=None, pipelined: bool = False,
+                  memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB,
+                  checkpoint: bool = False, engine: str = ENGINE_AUTO,
+                  output_dir: str = None, source_epsg=None,
+                  target_epsg=DEFAULT_TARGET_EPSG, coordinate_precision: int = None,
+                  simplify_tolerance: float = None, areas_csv: str = None,
+                  spatial_order: bool = False, output_format: str = OUTPUT_CSV,
+                  normalize_numbers: bool = False, strict_reprojection: bool = False,
+                  routing=None, duplicates=None):
     """
     Haupt-Einstiegspunkt für das Plugin.
 
     input_csv_path – ausgewählte BK3/BK4-CSV
     plugin_dir     – Plugin-Verzeichnis (für die Mapping-Dateien)
+    validate       – Ausgabewerte prüfen (validation_report.csv)
+    progress       – optionaler Callback(ProgressInfo)
+    progress_every – Callback alle n Zeilen
+    cancel_token   – optionales CancelToken (ConversionCancelled bei Abbruch)
+    pipelined      – Lesen, Umwandeln und Schreiben überlappen (große Exporte);
+                     Puffer begrenzt auf memory_limit_mb
+    checkpoint     – Stand regelmäßig sichern; ein erneuter Aufruf nach einem
+                     Abbruch setzt dort fort (checkpoint.py, setzt pipelined)
+    engine         – "auto": Verarbeitungsart und Stapelgröße nach einer kurzen
+                     Vorab-Prüfung wählen (engine_selection, Begründung wird
+                     ausgegeben); "memory" bzw. "pipelined" legen sie fest.
+                     pipelined=True entspricht engine="pipelined".
+    output_dir     – Ordner der Ausgabedateien (Standard: Ordner der Eingabe);
+                     gleichzeitige Umwandlungen brauchen getrennte Ordner
+    source_epsg    – Koordinatensystem der WKT-Spalte (z. B. 31468 Gauß-Krüger
+                     Zone 4, 25832 UTM 32); gesetzt wird die Geometrie nach
+                     target_epsg umprojiziert (reprojection.py) und mit
+                     coordinate_precision Nachkommastellen geschrieben;
+                     nicht umrechenbare Geometrien (unlesbar, anderes SRID)
+                     bleiben unverändert und stehen in reprojection_report.csv
+    strict_reprojection – stattdessen mit ReprojectionError abbrechen
+    simplify_tolerance – Polygone der WKT-Spalte (Flächen, Pläne) mit dieser
+                     Toleranz in Metern vereinfachen und runden
+                     (simplification.py, topologiesicher)
+    areas_csv      – bereits exportierte Flächen (CSV mit WKT-Polygonen im
+                     Koordinatensystem des Baum-Exports); leere green_space/
+                     location der Bäume werden per Punkt-in-Polygon ergänzt
+    spatial_order  – Ausgabezeilen entlang einer Hilbert-Kurve sortieren, damit
+                     benachbarte Bäume auch beim Import nebeneinander liegen
+                     (spatial_order.py; große Exporte extern sortiert)
+    output_format  – "csv" oder "geojsonseq": treesta_import.geojsonl mit
+                     einem GeoJSON-Feature je Zeile, Geometrie und Zahlen
+                     typisiert (geojson_sink.py)
+    normalize_numbers – Messwerte (Höhe, Durchmesser, Umfang) mit Dezimalkomma,
+                     Einheit oder als Bereich als Zahl in der Treesta-Einheit
+                     schreiben (number_normalization.py, number_report.csv)
+    routing        – data_types.DataTypeRouting: einen gemischten Export beim
+                     Schreiben nach Regeln bzw. Geometrie auf die Import-CSVs
+                     der Datentypen (Bäume, Flächen, Pläne) verteilen, jeweils
+                     mit deren field_values/field_renames; treesta_import.csv
+                     entsteht dann nicht, die Dateien stehen in routing.outputs
+    duplicates     – duplicate_trees.DuplicateSearch: doppelt erfasste Bäume im
+                     selben Durchgang wie Prüfung und Flächenabgleich über die
+                     Lage suchen (duplicate_trees.csv, Zahlen in
+                     duplicates.stats); die Import-CSV wird nicht erneut gelesen
 
     Rückgabe:
         out_csv_path, unmapped_txt_path, profile ("baumkataster_3" / "baumkataster_4")
     """
     profile = detect_profile(input_csv_path)
-    converter_module = _load_converter(profile)
+    converter = _load_converter(profile, plugin_dir)
 
-    # Mapping-Dateien abhängig vom Profil
-    if profile == "baumkataster_3":
-        suffix = "bk3"
-    else:
-        suffix = "bk4"
-
-    fields_mapping_path = os.path.join(plugin_dir, f"fields_mapping_baumkataster_{suffix}.csv")
-    value_mapping_path = os.path.join(plugin_dir, f"value_mapping_baumkataster_{suffix}.csv")
-
-    if not os.path.exists(fields_mapping_path):
-        raise FileNotFoundError(f"Feldmapping nicht gefunden: {fields_mapping_path}")
-    if not os.path.exists(value_mapping_path):
-        raise FileNotFoundError(f"Wertmapping nicht gefunden: {value_mapping_path}")
+    # Verarbeitungsart wählen
+    if pipelined or checkpoint:
+        engine = ENGINE_PIPELINED
+    plan = choose_engine(prescan(input_csv_path), engine, memory_limit_mb)
+    print(format_engine_plan(plan))
 
     # Converter aufrufen (beide Versionen sollen dieselbe Signatur haben)
-    out_csv, unmapped_txt = converter_module.convert_kataster(
-        input_csv_path=input_csv_path,
-        field_mapping_path=fields_mapping_path,
-        value_mapping_path=value_mapping_path
+    out_csv, unmapped_txt = converter.convert(
+        input_csv_path,
+        output_dir=output_dir,
+        validate=validate,
+        progress=progress,
+        progress_every=progress_every,
+        cancel_token=cancel_token,
+        pipelined=plan.engine == ENGINE_PIPELINED,
+        memory_limit_mb=plan.memory_limit_mb,
+        checkpoint=checkpoint,
+        batch_rows=plan.batch_rows,
+        source_epsg=source_epsg,
+        target_epsg=target_epsg,
+        coordinate_precision=coordinate_precision,
+        simplify_tolerance=simplify_tolerance,
+        areas_csv=areas_csv,
+        spatial_order=spatial_order,
+        output_format=output_format,
+        normalize_numbers=normalize_numbers,
+        strict_reprojection=strict_reprojection,
+        routing=routing,
+        duplicates=duplicates
     )
 
     return out_csv, unmapped_txt, profile
+
+
+def preview_convert(input_csv_path: str, plugin_dir: str, head_rows: int = PREVIEW_HEAD_ROWS,
+                    sample_rows: int = PREVIEW_SAMPLE_ROWS, seed: int = None) -> Preview:
+    """
+    Vorschau vor einer langen Umwandlung: die ersten head_rows Zeilen und eine
+    Zufallsstichprobe von bis zu sample_rows Zeilen werden mit dem Converter
+    des Profils umgewandelt. Die Datei wird dafür nicht vollständig gelesen
+    (siehe conversion_preview), es entstehen keine Dateien.
+
+    Rückgabe: Preview(profile, fieldnames, rows, origins, unmapped, complete, elapsed)
+        origins  – je Zeile "head" oder "sample"
+        unmapped – (column, value, count, max_overcount, rows) wie
+                   UnmappedStats.ranked(); Zeilennummern der Vorschau
+        complete – die Vorschau enthält alle Zeilen der Datei
+    """
+    started = time.monotonic()
+    profile = detect_profile(input_csv_path)
+    converter = _load_converter(profile, plugin_dir)
+
+    sample = sample_export(input_csv_path, head_rows, sample_rows, seed)
+    fieldnames, rows, unmapped = converter.preview_rows(sample.fieldnames, sample.rows)
+    return Preview(profile, fieldnames, rows, sample.origins, unmapped.ranked(),
+                   sample.complete, time.monotonic() - started)
+
+
+class ConversionStream:
+    """
+    Ergebnis von convert_rows(): Iterator über die umgewandelten Zeilen
+    (Tupel gemäß fieldnames, None = nicht gesetzt).
+
+    profile            – erkanntes bzw. vorgegebenes Profil
+    fieldnames         – Ausgabe-Kopfzeile
+    unmapped           – UnmappedStats, wird beim Iterieren laufend ergänzt
+                         (ranked(), values(), len(); Zeilennummern der
+                         Eingabe, Kopfzeile = 1)
+    unresolved_species – bisher nicht aufgelöste Arten
+
+    Eine selbst geöffnete Eingabedatei wird am Ende der Zeilen bzw. mit
+    close() oder dem with-Block geschlossen.
+    """
+
+    def __init__(self, profile, fieldnames, rows, unmapped, species_resolver, close=None):
+        self.profile = profile
+        self.fieldnames = fieldnames
+        self.unmapped = unmapped
+        self._species_resolver = species_resolver
+        self._rows = rows
+        self._close = close
+
+    @property
+    def unresolved_species(self):
+        return self._species_resolver.unresolved
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._rows)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_rows(source, plugin_dir: str, profile: str = None, source_epsg=None,
+                 target_epsg=DEFAULT_TARGET_EPSG, coordinate_precision: int = None,
+                 simplify_tolerance: float = None, areas_csv: str = None,
+                 batch_rows: int = BATCH_ROWS,
+                 strict_reprojection: bool = False) -> ConversionStream:
+    """
+    Umwandlung als Bibliotheksfunktion: liest source zeilenweise und liefert
+    die umgewandelten Zeilen als Iterator, ohne Dateien zu schreiben und ohne
+    alle Zeilen zu sammeln.
+
+        with convert_rows("export.csv", plugin_dir) as stream:
+            for row in stream:
+                ...
+            print(stream.unmapped.ranked()[:10])
+
+    source     – Pfad oder Dateiobjekt (Text oder Bytes, UTF-8) eines
+                 BK3/BK4-Exports; ein übergebenes Dateiobjekt wird nicht
+                 geschlossen
+    profile    – Standard: Erkennung über die Kopfzeile
+    source_epsg, target_epsg, coordinate_precision, simplify_tolerance,
+    areas_csv, strict_reprojection – wie smart_convert(); diese Schritte laufen stapelweise zu
+                 batch_rows Zeilen
+
+    Beim BK3-Profil enthält fieldnames alle möglichen Spalten (die
+    Import-CSV lässt nie gesetzte Spalten weg).
+    """
+    close = None
+    if isinstance(source, (str, os.PathLike)):
+        f = open(source, encoding="utf-8-sig", newline="")
+        close = f.close
+    elif isinstance(source.read(0), bytes):
+        f = codecs.iterdecode(source, "utf-8-sig")
+    else:
+        f = source
+
+    try:
+        fieldnames, rows = read_export(f)
+        if fieldnames:
+            fieldnames[0] = fieldnames[0].lstrip("\ufeff")
+        profile = profile or PROFILES.detect(fieldnames).name
+        converter = _load_converter(profile, plugin_dir)
+
+        unmapped = UnmappedStats()
+        species_resolver = converter.species_resolver.fork()
+        headers, converted = converter.iter_rows(fieldnames, rows, unmapped, species_resolver)
+
+        steps = geometry_steps(source_epsg, target_epsg, coordinate_precision, simplify_tolerance,
+                               strict_reprojection)
+        wkt_index = wkt_column_index(headers)
+        if areas_csv and wkt_index is not None:
+            steps.insert(0, AreaEnricher(AreaIndex.from_csv(areas_csv), headers))
+        if (steps or areas_csv) and wkt_index is None:
+            print("Hinweis: keine Geometriespalte (wkt) – Umprojektion/Vereinfachung/Flächenabgleich entfällt")
+            steps = []
+        if steps:
+            converted = _apply_steps(converted, steps, wkt_index, batch_rows)
+    except BaseException:
+        if close is not None:
+            close()
+        raise
+
+    return ConversionStream(profile, headers, converted, unmapped, species_resolver, close)
+
+
+def _apply_steps(rows, steps, wkt_index: int, batch_rows: int):
+    while True:
+        batch = list(islice(rows, batch_rows))
+        if not batch:
+            return
+        for step in steps:
+            batch = step.apply_rows(batch, wkt_index)
+        yield from batch
+
+
+def delta_convert(old_csv_path: str, new_csv_path: str, plugin_dir: str,
+                  validate: bool = False):
+    """
+    Wiederholter Export desselben Layers: alter und neuer Export werden über
+    die Baumnummer verglichen, nur neue und geänderte Zeilen werden
+    umgewandelt. Nicht mehr vorhandene Baumnummern stehen in
+    deleted_treenumbers.txt im Ordner des neuen Exports.
+
+    Rückgabe:
+        out_csv_path, unmapped_txt_path, profile, deleted_txt_path, stats
+    """
+    base, ext = os.path.splitext(new_csv_path)
+    delta_csv_path = f"{base}-delta{ext or '.csv'}"
+    deleted_txt_path = os.path.join(os.path.dirname(new_csv_path), DELETED_FILENAME)
+
+    stats = diff_exports(old_csv_path, new_csv_path, delta_csv_path, deleted_txt_path)
+    out_csv, unmapped_txt, profile = smart_convert(delta_csv_path, plugin_dir, validate=validate)
+
+    return out_csv, unmapped_txt, profile, deleted_txt_path, stats
+
+
+def diff_with_database(out_csv_path: str, gpkg_path: str, apply_updates: bool = False) -> dict:
+    """
+    Wiederholte Migration: nur neue Bäume als CSV ausgeben und geänderte
+    Bäume melden bzw. (apply_updates=True) direkt in tree_data aktualisieren.
+
+    Rückgabe siehe gpkg_delta.diff_against_database().
+    """
+    return diff_against_database(out_csv_path, gpkg_path, apply_updates=apply_updates)
+
+
+def transfer_photo_files(out_csv_path, target_dir: str, source_dir: str = None,
+                         mode: str = MODE_COPY, progress=None, cancel_token=None) -> dict:
+    """
+    Optionaler Schritt nach der Umwandlung: alle Fotoverweise der Import-CSV
+    (bzw. einer Liste von Import-CSVs, z. B. nach dem Aufteilen nach
+    Datentypen) in den Treesta-Fotoordner übertragen. Bereits vorhandene Dateien mit
+    gleichem Inhalt werden übersprungen, fehlende Dateien gemeldet.
+
+    Rückgabe siehe photo_transfer.transfer_photos().
+    """
+    return transfer_photos(out_csv_path, target_dir, source_dir, mode,
+                           progress=progress, cancel_token=cancel_token)
+
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+csv_io – kompakte Zeilendarstellung für die Converter
+
+- Eingabezeilen werden als Tupel gelesen; die Spaltennamen stehen nur einmal
+  in der Kopfzeile statt in jeder Zeile (kein DictReader)
+- kurze, wiederkehrende Werte (Kategorien, Codes, Ja/Nein) werden interniert
+  und damit nur einmal im Speicher gehalten
+- die Ausgabe wird positionsbezogen mit csv.writer geschrieben (kein DictWriter)
+- ExportSource liest die Eingabe zeilenweise binär und zählt die verbrauchten
+  Bytes, damit Fortschritt und Position nach jedem Datensatz bekannt sind
+- Ausgaben entstehen als *.part und werden erst am Ende umbenannt
+- die Feldgrößengrenze des csv-Moduls (131072 Zeichen) wird angehoben;
+  Flächen und Pläne mit vielen Stützpunkten überschreiten sie sonst
+"""
+
+import codecs
+import csv
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Längere Werte (WKT, Bemerkungen) sind fast immer eindeutig – nicht internieren
+INTERN_MAX_LENGTH = 64
+
+# Größte Feldlänge beim Lesen (csv.field_size_limit erwartet einen C-long)
+FIELD_SIZE_LIMIT = 2 ** 31 - 1
+
+if csv.field_size_limit() < FIELD_SIZE_LIMIT:
+    csv.field_size_limit(FIELD_SIZE_LIMIT)
+
+_intern = sys.intern
+
+
+def intern_row(row: Sequence[str], width: int) -> tuple:
+    """
+    Zeile auf die Breite der Kopfzeile bringen (fehlende Werte → "",
+    überzählige Werte werden verworfen) und kurze Werte internieren.
+    """
+    if len(row) < width:
+        row = list(row) + [""] * (width - len(row))
+    return tuple(
+        _intern(v) if len(v) <= INTERN_MAX_LENGTH else v
+        for v in row[:width]
+    )
+
+
+class ExportSource:
+    """
+    Eingabedatei als Iterator über dekodierte Zeilen für csv.reader.
+
+    csv.reader liest nur so viele Zeilen, wie der aktuelle Datensatz braucht
+    (auch bei Zeilenumbrüchen in Anführungszeichen). bytes_read ist daher
+    nach jedem gelieferten Datensatz genau dessen Endposition in der Datei.
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8-sig"):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.bytes_read = 0
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._f = open(path, "rb")
+
+    def lines(self) -> Iterator[str]:
+        """
+        Dekodierte Zeilen; die Datei wird nach der letzten Zeile (oder beim
+        Verwerfen des Iterators) geschlossen.
+        """
+        decode = self._decoder.decode
+        try:
+            for raw in self._f:
+                self.bytes_read += len(raw)
+                yield decode(raw)
+        finally:
+            self._f.close()
+
+    def seek(self, offset: int):
+        """
+        Nach dem Lesen der Kopfzeile an eine frühere Datensatzgrenze springen
+        (Fortsetzen ab Checkpoint).
+        """
+        self._f.seek(offset)
+        self.bytes_read = offset
+        self._decoder.reset()
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_export(f, delimiter: str = ";"):
+    """
+    Liest Kopfzeile und liefert (fieldnames, Iterator über Zeilentupel).
+    f – Textdatei oder beliebiger Iterator über Zeilen (ExportSource.lines()).
+    Leere Zeilen werden wie beim DictReader übersprungen.
+    """
+    reader = csv.reader(f, delimiter=delimiter, quotechar='"')
+    fieldnames = next(reader, None) or []
+    width = len(fieldnames)
+
+    def rows() -> Iterator[tuple]:
+        for row in reader:
+            if row:
+                yield intern_row(row, width)
+
+    return fieldnames, rows()
+
+
+def unique_columns(fieldnames: Iterable[str]) -> Dict[str, int]:
+    """
+    Spaltenname → Index. Bei doppelten Namen gilt wie beim DictReader die
+    Position des ersten Vorkommens und der Wert des letzten.
+    """
+    columns: Dict[str, int] = {}
+    for index, name in enumerate(fieldnames):
+        columns[name] = index
+    return columns
+
+
+class ImportCsvFile:
+    """
+    Treesta-Import-CSV (Semikolon, alle Werte in Anführungszeichen) als
+    Kontextmanager.
+
+    Geschrieben wird in path + ".part"; erst beim fehlerfreien Verlassen des
+    with-Blocks wird die Datei umbenannt. Ein Abbruch hinterlässt keine halbe
+    Import-CSV. None-Werte werden als "" geschrieben.
+
+    resume_offset – vorhandene .part-Datei auf diese Länge kürzen und dahinter
+                    weiterschreiben (Checkpoint)
+    keep_part     – .part-Datei bei einem Fehler behalten (für Checkpoints)
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], resume_offset: Optional[int] = None,
+                 keep_part: bool = False):
+        self.path = path
+        self.part_path = path + ".part"
+        self.fieldnames = fieldnames
+        self.resume_offset = resume_offset
+        self.keep_part = keep_part
+        self._f = None
+        self._writer = None
+
+    def __enter__(self):
+        if self.resume_offset is None:
+            self._f = open(self.part_path, "w", encoding="utf-8", newline="")
+        else:
+            with open(self.part_path, "r+b") as f:
+                f.truncate(self.resume_offset)
+            self._f = open(self.part_path, "a", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._f, delimiter=";", quotechar='"', quoting=csv.QUOTE_ALL)
+        if self.resume_offset is None:
+            self._writer.writerow(self.fieldnames)
+        return self
+
+    def sync(self) -> int:
+        """
+        Gepufferte Zeilen auf die Platte schreiben; liefert die Länge der
+        .part-Datei.
+        """
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def writerow(self, row: Sequence):
+        self._writer.writerow(row)
+
+    def writerows(self, rows: Iterable[Sequence]):
+        self._writer.writerows(rows)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.close()
+        if exc_type is None:
+            os.replace(self.part_path, self.path)
+        elif not self.keep_part and os.path.exists(self.part_path):
+            os.remove(self.part_path)
+        return False
+
+
+def write_import_csv(path: str, fieldnames: List[str], rows: Iterable[Sequence],
+                     indexes: Optional[List[int]] = None, reporter=None) -> None:
+    """
+    Schreibt die Treesta-Import-CSV (siehe ImportCsvFile).
+
+    indexes  – optionale Projektion: für jede Ausgabespalte der Index im
+               Zeilentupel
+    reporter – optionaler ProgressReporter (Fortschritt/Abbruch je Zeile)
+    """
+    with ImportCsvFile(path, fieldnames) as output:
+        if indexes is None and reporter is None:
+            output.writerows(rows)
+        else:
+            for row in rows:
+                output.writerow(row if indexes is None else [row[i] for i in indexes])
+                if reporter is not None:
+                    reporter.row()
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+data_types – Treesta-Datentypen und Aufteilen gemischter Exporte
+
+Jeder Datentyp (Bäume, Flächen, Pläne) hat eine eigene Import-CSV mit
+Vorgabewerten (field_values) und umbenannten Spalten (field_renames).
+
+- apply_data_type_values schreibt eine Import-CSV für genau einen Datentyp
+- DataTypeRouting teilt einen Export mit Punkten und Polygonen schon beim
+  Schreiben auf: die Converter schreiben über routing.open()/write() statt
+  über ImportCsvFile, jede Zeile geht nach Regeln (Spalte = Wert) oder nach
+  dem Geometrietyp der WKT-Spalte direkt in die Import-CSV ihres Datentyps,
+  mit dessen field_values/field_renames. Zeilen ohne passenden Datentyp
+  landen in nicht-zugeordnet-treesta-import.csv.
+- route_import_csv teilt eine bereits vorhandene Import-CSV auf dieselbe
+  Weise auf (Kommandozeile)
+
+Beim Aufteilen in der Umwandlung entsteht keine gemeinsame Import-CSV, der
+Export wird einmal gelesen und jede Zeile einmal geschrieben.
+"""
+
+import csv
+import os
+from collections import namedtuple
+from contextlib import ExitStack
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    from .csv_io import ImportCsvFile
+    from .wkt import geometry_type, wkt_column_index
+except ImportError:  # Aufruf als Skript (CLI)
+    from csv_io import ImportCsvFile
+    from wkt import geometry_type, wkt_column_index
+
+POINT_TYPES = ("POINT", "MULTIPOINT")
+POLYGON_TYPES = ("POLYGON", "MULTIPOLYGON")
+
+DATA_TYPES = (
+    {
+        "key": "permanent_trees",
+        "label": "Permanente Bäume",
+        "output_filename": "bäume-treesta-import.csv",
+        "field_values": {"temp": "0"},
+        "geometry_types": POINT_TYPES,
+        "duplicate_check": True,
+        "area_lookup": True,
+    },
+    {
+        "key": "temporary_trees",
+        "label": "Temporäre Bäume",
+        "output_filename": "einzelbäume-treesta-import.csv",
+        "field_values": {"temp": "1"},
+        "geometry_types": POINT_TYPES,
+        "duplicate_check": True,
+        "area_lookup": True,
+    },
+    {
+        "key": "area",
+        "label": "Fläche",
+        "output_filename": "flächen-treesta-import.csv",
+        "field_values": {"documentation": "1", "atlas": "0"},
+        "field_renames": {"date": "last_modified_date"},
+        "geometry_types": POLYGON_TYPES,
+        "simplify_polygons": True,
+    },
+    {
+        "key": "plan",
+        "label": "Plan",
+        "output_filename": "pläne-treesta-import.csv",
+        "field_values": {"atlas": "1"},
+        "field_renames": {"date": "last_modified_date"},
+        "geometry_types": POLYGON_TYPES,
+        "simplify_polygons": True,
+    },
+)
+
+# Auswahl in der Oberfläche: gemischten Export nach Geometrie aufteilen
+MIXED_DATA_TYPE = {
+    "key": "mixed",
+    "label": "Gemischt – nach Geometrie aufteilen",
+    "route": True,
+    "simplify_polygons": True,
+    "area_lookup": True,
+}
+
+UNROUTED_FILENAME = "nicht-zugeordnet-treesta-import.csv"
+
+# Zeilen mit value in column gehen in den Datentyp key (z. B. alle Zeilen
+# mit atlas = 1 in die Pläne); der Vergleich ignoriert Groß-/Kleinschreibung
+RouteRule = namedtuple("RouteRule", "column value key")
+
+# offene Ausgabe eines Datentyps beim Aufteilen
+_RouteTarget = namedtuple("_RouteTarget", "layout output info")
+
+
+def data_type(key: str, data_types: Sequence[dict] = DATA_TYPES) -> dict:
+    for entry in data_types:
+        if entry["key"] == key:
+            return entry
+    raise ValueError(f"Unbekannter Datentyp: {key}")
+
+
+class _DataTypeLayout:
+    """
+    Kopfzeile eines Datentyps und Zuordnung der Werte aus der Import-CSV.
+
+    Wie bisher in der Oberfläche: field_renames benennt Spalten um (ein
+    nicht leerer Wert der alten Spalte hat Vorrang vor der Zielspalte),
+    field_values setzt bzw. ergänzt Spalten mit festen Werten.
+    """
+
+    def __init__(self, fieldnames: Sequence[str], data_type: dict):
+        names = list(fieldnames)
+        # Spalte → (Index in der Import-CSV, Index der umbenannten Spalte)
+        # (doppelte Spaltennamen: wie csv.DictReader gilt die letzte)
+        sources = {name: (i, None) for i, name in enumerate(names)}
+
+        for old_field, new_field in data_type.get("field_renames", {}).items():
+            if old_field not in names:
+                continue
+            old_index = sources.pop(old_field)[0]
+            if new_field in names:
+                names.remove(old_field)
+                sources[new_field] = (sources[new_field][0], old_index)
+            else:
+                names[names.index(old_field)] = new_field
+                sources[new_field] = (None, old_index)
+
+        field_values = data_type.get("field_values", {})
+        for field_name in field_values:
+            if field_name not in names:
+                names.append(field_name)
+
+        self.fieldnames = names
+        self.columns = [
+            (None, None, field_values[name]) if name in field_values else (*sources[name], "")
+            for name in names
+        ]
+
+    def convert(self, row: Sequence[str]) -> list:
+        width = len(row)
+        result = []
+        for index, renamed, value in self.columns:
+            if renamed is not None and renamed < width and row[renamed].strip() != "":
+                value = row[renamed]
+            elif index is not None and index < width:
+                value = row[index]
+            result.append(value)
+        return result
+
+
+def _read_import_csv(csv_path: str):
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(
+            f"Die erzeugte CSV-Datei wurde nicht gefunden: {csv_path}"
+        )
+    f = open(csv_path, encoding="utf-8-sig", newline="")
+    rows = csv.reader(f, delimiter=";", quotechar='"')
+    fieldnames = next(rows, None)
+    if not fieldnames:
+        f.close()
+        raise ValueError(
+            "Die erzeugte CSV-Datei enthält keine Kopfzeile."
+        )
+    return f, fieldnames, rows
+
+
+def apply_data_type_values(csv_path: str, data_type: dict):
+    """
+    Ergänzt oder überschreibt nur die für den Datentyp vorgesehenen Felder.
+    Alle anderen Felder bleiben unverändert; die Datei wird ersetzt.
+    """
+    f, fieldnames, rows = _read_import_csv(csv_path)
+    layout = _DataTypeLayout(fieldnames, data_type)
+    # Eingabe vor dem Ersetzen schließen (unter Windows sonst gesperrt)
+    with ImportCsvFile(csv_path, layout.fieldnames) as output:
+        with f:
+            output.writerows(layout.convert(row) for row in rows if row)
+
+
+class DataTypeRouting:
+    """
+    Aufteilen nach Datentypen als Ausgabe einer Umwandlung (Option routing
+    der Converter). open() und write() ersetzen ImportCsvFile bzw.
+    write_import_csv; nach der Umwandlung stehen die geschriebenen Dateien
+    in outputs.
+
+    rules         – RouteRule-Liste, die erste passende Regel entscheidet
+    default_types – Geometrietyp → Datentyp für Zeilen ohne passende Regel;
+                    Standard: erster Datentyp, dessen geometry_types den Typ
+                    enthält (Punkte → Permanente Bäume, Polygone → Fläche)
+
+    outputs: {Datentyp-Schlüssel oder None (nicht zugeordnet):
+              {"path": Pfad, "rows": n}} – nur Datentypen mit Zeilen
+    """
+
+    def __init__(self, rules: Iterable[RouteRule] = (),
+                 data_types: Sequence[dict] = DATA_TYPES,
+                 default_types: Optional[Dict[str, str]] = None):
+        self.by_key = {entry["key"]: entry for entry in data_types}
+        self.rules = list(rules)
+        for rule in self.rules:
+            if rule.key not in self.by_key:
+                raise ValueError(f"Unbekannter Datentyp in Regel: {rule.key}")
+
+        self.defaults = {}
+        for entry in data_types:
+            for geometry in entry.get("geometry_types", ()):
+                self.defaults.setdefault(geometry, entry["key"])
+        self.defaults.update(default_types or {})
+        self.outputs = {}
+
+    def settings(self) -> dict:
+        """Einstellungen für den Checkpoint-Vergleich."""
+        return {
+            "rules": [list(rule) for rule in self.rules],
+            "defaults": dict(sorted(self.defaults.items())),
+        }
+
+    def open(self, path: str, fieldnames: List[str], resume_offset: Optional[dict] = None,
+             keep_part: bool = False) -> "DataTypeRouter":
+        """
+        Ausgabe wie ImportCsvFile(path, …); die Dateien der Datentypen
+        entstehen im Ordner von path, path selbst wird nicht geschrieben.
+        resume_offset ist der Wert von sync() (je Datei Länge und Zeilen).
+        """
+        return DataTypeRouter(self, os.path.dirname(path), fieldnames, resume_offset, keep_part)
+
+    def write(self, path: str, fieldnames: List[str], rows: Iterable[Sequence],
+              indexes: Optional[List[int]] = None, reporter=None) -> None:
+        """Wie write_import_csv(), aber aufgeteilt nach Datentypen."""
+        with self.open(path, fieldnames) as output:
+            for row in rows:
+                output.writerow(row if indexes is None else [row[i] for i in indexes])
+                if reporter is not None:
+                    reporter.row()
+
+
+class DataTypeRouter:
+    """
+    Verteilt Zeilen auf die Import-CSVs der Datentypen (siehe
+    DataTypeRouting.open). Jede Datei ist eine ImportCsvFile und wird beim
+    ersten Treffer angelegt; erst beim fehlerfreien Verlassen des with-Blocks
+    werden alle umbenannt, bei einem Fehler bleiben vorhandene Dateien
+    unverändert.
+    """
+
+    def __init__(self, routing: DataTypeRouting, output_dir: str, fieldnames: List[str],
+                 resume_offset: Optional[dict] = None, keep_part: bool = False):
+        self.routing = routing
+        self.output_dir = output_dir
+        self.fieldnames = list(fieldnames)
+        self.resume_offset = resume_offset or {}
+        self.keep_part = keep_part
+        self.wkt_index = wkt_column_index(self.fieldnames)
+
+        normalized = [name.strip().lower() for name in self.fieldnames]
+        self.rules = []
+        for rule in routing.rules:
+            column = rule.column.strip().lower()
+            if column in normalized:
+                self.rules.append((normalized.index(column), rule.value.strip().casefold(), rule.key))
+            else:
+                print(f"Hinweis: Spalte {rule.column} fehlt – Regel {rule.column}={rule.value} entfällt")
+        if self.wkt_index is None:
+            print("Hinweis: keine Geometriespalte (wkt) – Zuordnung nur über Regeln")
+
+        self._targets = {}
+        self._stack = None
+
+    def __enter__(self):
+        self.routing.outputs.clear()
+        self._stack = ExitStack()
+        try:
+            # Checkpoint: bereits begonnene Dateien dort fortsetzen
+            keys = {entry["output_filename"]: key for key, entry in self.routing.by_key.items()}
+            for filename, (offset, rows) in self.resume_offset.items():
+                self._open(keys.get(filename), offset).info["rows"] = rows
+        except BaseException:
+            self._stack.close()
+            raise
+        return self
+
+    def _open(self, key: Optional[str], resume_offset: Optional[int] = None):
+        entry = self.routing.by_key.get(key)
+        if entry is None:
+            layout = None
+            path = os.path.join(self.output_dir, UNROUTED_FILENAME)
+            fieldnames = self.fieldnames
+        else:
+            layout = _DataTypeLayout(self.fieldnames, entry)
+            path = os.path.join(self.output_dir, entry["output_filename"])
+            fieldnames = layout.fieldnames
+        output = ImportCsvFile(path, fieldnames, resume_offset, keep_part=self.keep_part)
+        info = self.routing.outputs[key] = {"path": path, "rows": 0}
+        target = self._targets[key] = _RouteTarget(layout, self._stack.enter_context(output), info)
+        return target
+
+    def key(self, row: Sequence[str]) -> Optional[str]:
+        """Datentyp einer Zeile (None: nicht zugeordnet)."""
+        for index, value, rule_key in self.rules:
+            if index < len(row) and row[index].strip().casefold() == value:
+                return rule_key
+        if self.wkt_index is not None and self.wkt_index < len(row):
+            return self.routing.defaults.get(geometry_type(row[self.wkt_index]))
+        return None
+
+    def writerow(self, row: Sequence):
+        key = self.key(row)
+        target = self._targets.get(key)
+        if target is None:
+            target = self._open(key)
+        target.output.writerow(target.layout.convert(row) if target.layout is not None else row)
+        target.info["rows"] += 1
+
+    def writerows(self, rows: Iterable[Sequence]):
+        for row in rows:
+            self.writerow(row)
+
+    def sync(self) -> dict:
+        """
+        Alle Dateien auf die Platte schreiben; liefert je Dateiname Länge
+        der .part-Datei und Zeilenzahl.
+        """
+        return {
+            os.path.basename(target.info["path"]): [target.output.sync(), target.info["rows"]]
+            for target in self._targets.values()
+        }
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._stack.__exit__(exc_type, exc, tb)
+
+
+def route_import_csv(csv_path: str, output_dir: Optional[str] = None,
+                     rules: Iterable[RouteRule] = (),
+                     data_types: Sequence[dict] = DATA_TYPES,
+                     default_types: Optional[Dict[str, str]] = None) -> dict:
+    """
+    Verteilt die Zeilen einer bereits vorhandenen Import-CSV auf die Dateien
+    der Datentypen (die Import-CSV bleibt erhalten). In der Umwandlung selbst
+    stattdessen DataTypeRouting als Ausgabe verwenden.
+
+    rules, default_types – siehe DataTypeRouting
+    output_dir           – Standard: Ordner von csv_path
+
+    Rückgabe: DataTypeRouting.outputs
+    """
+    routing = DataTypeRouting(rules, data_types, default_types)
+    output_dir = output_dir or os.path.dirname(csv_path)
+    f, fieldnames, rows = _read_import_csv(csv_path)
+    with f:
+        routing.write(os.path.join(output_dir, os.path.basename(csv_path)), fieldnames,
+                      (row for row in rows if row))
+    return routing.outputs
+
+
+def format_routing(outputs: dict, data_types: Sequence[dict] = DATA_TYPES) -> str:
+    labels = {entry["key"]: entry["label"] for entry in data_types}
+    parts = [
+        f"{labels.get(key, 'nicht zugeordnet')}: {info['rows']}"
+        for key, info in sorted(outputs.items(), key=lambda item: item[0] is None)
+    ]
+    return "Aufgeteilt – " + (", ".join(parts) if parts else "keine Zeilen")
+
+
+def parse_rule(text: str) -> RouteRule:
+    """
+    "spalte=wert:datentyp" → RouteRule (CLI).
+    """
+    condition, _, key = text.rpartition(":")
+    column, _, value = condition.partition("=")
+    if not column or not key:
+        raise ValueError(f"Regel im Format spalte=wert:datentyp erwartet: {text}")
+    return RouteRule(column, value, key)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Treesta-Import-CSV nach Datentypen aufteilen")
+    ap.add_argument("import_csv", help="Pfad zur Import-CSV")
+    ap.add_argument("--output_dir", default=None)
+    ap.add_argument("--rule", action="append", default=[], type=parse_rule,
+                    help="spalte=wert:datentyp, z. B. atlas=1:plan (mehrfach möglich)")
+    ap.add_argument("--points", default=None, help="Datentyp für Punkte (Standard: permanent_trees)")
+    ap.add_argument("--polygons", default=None, help="Datentyp für Polygone (Standard: area)")
+    args = ap.parse_args()
+
+    defaults = {}
+    for geometries, key in ((POINT_TYPES, args.points), (POLYGON_TYPES, args.polygons)):
+        if key:
+            data_type(key)
+            defaults.update(dict.fromkeys(geometries, key))
+    outputs = route_import_csv(args.import_csv, args.output_dir, args.rule, default_types=defaults)
+    print(format_routing(outputs))
+    for info in outputs.values():
+        print("OK:", info["path"])
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+duplicate_trees – doppelt erfasste Bäume über die Lage finden
+
+Zusammengeführte Kataster enthalten denselben Baum oft zweimal mit leicht
+abweichenden Koordinaten und unterschiedlicher Baumnummer. Dieser optionale
+Schritt der Umwandlung (DuplicateSearch, Option duplicates der Converter)
+
+- nimmt die Punktkoordinaten aus der WKT-Spalte der umgewandelten Zeilen,
+  im selben Durchgang wie Prüfung und Flächenabgleich – die fertige
+  Import-CSV wird nicht noch einmal gelesen
+- sortiert die Punkte in ein gleichmäßiges Raster (Zellgröße = Abstand,
+  Hash-Tabelle Zelle → Punkte)
+- vergleicht jeden Punkt nur mit den Punkten seiner Zelle und der
+  Nachbarzellen – Laufzeit fast linear statt aller Paare
+- meldet Paare mit einem Abstand bis distance_m, auf Wunsch nur bei
+  gleicher Baumart (fehlt die Art bei einem der Bäume, wird das Paar gemeldet)
+
+Koordinaten in Grad (EPSG:4326) werden lokal in Meter umgerechnet (Länge
+mit cos φ gestaucht), projizierte Koordinaten gelten als Meter.
+
+Kandidaten stehen in duplicate_trees.csv
+    distance_m;row_1;treenumber_1;treenumber2_1;species_1;row_2;treenumber_2;treenumber2_2;species_2
+Zeilennummern beziehen sich wie in validation_report.csv auf den Export
+(Kopfzeile = Zeile 1); ohne räumliche Sortierung sind es dieselben wie in
+der Import-CSV. find_duplicate_trees() prüft eine bereits vorhandene
+Import-CSV (Kommandozeile), die Zeilennummern gelten dann für diese.
+"""
+
+import base64
+import csv
+import math
+import os
+import time
+from array import array
+from typing import Iterable, Optional, Sequence
+
+try:
+    from .wkt import point_xy, wkt_column_index
+except ImportError:  # Aufruf als Skript (CLI)
+    from wkt import point_xy, wkt_column_index
+
+DUPLICATES_REPORT_FILENAME = "duplicate_trees.csv"
+
+DEFAULT_DUPLICATE_DISTANCE_M = 1.0
+
+METRES_PER_DEGREE = 111320.0
+
+# Schutz vor Haufen identischer Platzhalter-Koordinaten: ab hier wird die
+# Suche beendet und der Bericht als unvollständig gekennzeichnet
+MAX_PAIRS = 1_000_000
+
+NUMBER_COLUMNS = ("treenumber", "treenumber2")
+SPECIES_COLUMN = "species"
+
+# Nachbarzellen, die von jeder Zelle aus geprüft werden (die andere Hälfte
+# prüft die jeweilige Nachbarzelle selbst)
+_NEIGHBOURS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def _column(fieldnames, name) -> Optional[int]:
+    for i, field in enumerate(fieldnames):
+        if field.strip().lower() == name:
+            return i
+    return None
+
+
+class _Trees:
+    """
+    Punkte und Kennung der Bäume einer Import-CSV (kompakt in Arrays).
+    """
+
+    def __init__(self):
+        self.xs = array("d")
+        self.ys = array("d")
+        self.rows = array("l")
+        self.info = []
+        self.total = 0
+        self.without_point = 0
+
+    def __len__(self):
+        return len(self.xs)
+
+    def add(self, row_no, point, info):
+        self.total += 1
+        if point is None or point == (0.0, 0.0):
+            self.without_point += 1
+            return
+        self.xs.append(point[0])
+        self.ys.append(point[1])
+        self.rows.append(row_no)
+        self.info.append(info)
+
+    def geographic(self) -> bool:
+        return bool(self.xs) and (
+            max(map(abs, self.xs)) <= 180 and max(map(abs, self.ys)) <= 90
+        )
+
+
+class DuplicateSearch:
+    """
+    Suche nach doppelten Bäumen als Schritt der Umwandlung: apply_rows()
+    sammelt Punkt, Baumnummern und Art der durchlaufenden Zeilen (die Zeilen
+    bleiben unverändert), write_report() sucht die Paare und schreibt
+    duplicate_trees.csv. Danach stehen die Zahlen in stats.
+
+        search = DuplicateSearch(1.0)
+        converter.convert(export_csv, duplicates=search)
+        print(format_duplicates(search.stats))
+    """
+
+    def __init__(self, distance_m: float = DEFAULT_DUPLICATE_DISTANCE_M,
+                 match_species: bool = False):
+        self.distance_m = distance_m
+        self.match_species = match_species
+        self.stats = None
+        self.bind([])
+
+    def bind(self, fieldnames: Sequence[str]):
+        """Spalten der Ausgabezeilen festlegen; beginnt eine neue Suche."""
+        self.info_columns = [_column(fieldnames, name) for name in NUMBER_COLUMNS + (SPECIES_COLUMN,)]
+        self.trees = _Trees()
+        self.row_no = 2
+        self.elapsed = 0.0
+        self.stats = None
+
+    def settings(self) -> dict:
+        return {"distance_m": self.distance_m, "match_species": self.match_species}
+
+    def apply_rows(self, rows: Iterable[Sequence], index: int) -> Iterable[Sequence]:
+        started = time.monotonic()
+        trees = self.trees
+        info_columns = self.info_columns
+        for row in rows:
+            try:
+                point = point_xy(row[index])
+            except ValueError:
+                point = None
+            info = tuple(row[i] if i is not None else "" for i in info_columns)
+            trees.add(self.row_no, point, info)
+            self.row_no += 1
+        self.elapsed += time.monotonic() - started
+        return rows
+
+    def to_state(self) -> dict:
+        trees = self.trees
+        return {
+            "row_no": self.row_no,
+            "total": trees.total,
+            "without_point": trees.without_point,
+            "points": [
+                base64.b64encode(values.tobytes()).decode("ascii")
+                for values in (trees.xs, trees.ys, trees.rows)
+            ],
+            "info": trees.info,
+        }
+
+    def load_state(self, state: dict):
+        trees = self.trees = _Trees()
+        self.row_no = state["row_no"]
+        trees.total = state["total"]
+        trees.without_point = state["without_point"]
+        for values, data in zip((trees.xs, trees.ys, trees.rows), state["points"]):
+            values.frombytes(base64.b64decode(data))
+        trees.info = [tuple(info) for info in state["info"]]
+
+    def write_report(self, report_path: str) -> dict:
+        """
+        Paare suchen und duplicate_trees.csv schreiben (bzw. einen
+        veralteten Bericht entfernen).
+
+        Rückgabe: {"trees": n, "without_point": n, "pairs": n, "involved": n,
+                   "truncated": bool, "elapsed": s, "report": Pfad|None}
+        """
+        started = time.monotonic()
+        trees = self.trees
+        pairs, truncated = find_pairs(trees, self.distance_m, self.match_species)
+        pairs.sort(key=lambda p: (p[0], trees.rows[p[1]], trees.rows[p[2]]))
+
+        _write_report(report_path, pairs, trees)
+
+        self.stats = {
+            "trees": trees.total,
+            "without_point": trees.without_point,
+            "pairs": len(pairs),
+            "involved": len({i for _, a, b in pairs for i in (a, b)}),
+            "truncated": truncated,
+            "elapsed": self.elapsed + time.monotonic() - started,
+            "report": report_path if pairs else None,
+        }
+        return self.stats
+
+    def summary(self) -> str:
+        if self.stats is None:
+            return f"Doppelte Bäume: {self.trees.total} Bäume gesammelt, nicht ausgewertet"
+        return format_duplicates(self.stats)
+
+
+def find_pairs(trees: _Trees, distance_m: float, match_species: bool = False):
+    """
+    Paare (Abstand in m, i, j) mit Abstand bis distance_m, dazu ob die Suche
+    bei MAX_PAIRS abgebrochen wurde.
+    """
+    xs, ys = trees.xs, trees.ys
+    if not xs or distance_m <= 0:
+        return [], False
+
+    # Rasterweite in Koordinateneinheiten; bei Grad so, dass auch beim
+    # größten Breitengrad kein Paar über die Nachbarzelle hinausreicht
+    if trees.geographic():
+        scale_y = METRES_PER_DEGREE
+        max_lat = min(max(map(abs, ys)), 89.0)
+        cell_x = distance_m / (METRES_PER_DEGREE * math.cos(math.radians(max_lat)))
+        cell_y = distance_m / METRES_PER_DEGREE
+    else:
+        scale_y = 1.0
+        cell_x = cell_y = distance_m
+
+    grid = {}
+    floor = math.floor
+    for i in range(len(xs)):
+        key = (floor(xs[i] / cell_x), floor(ys[i] / cell_y))
+        members = grid.get(key)
+        if members is None:
+            grid[key] = [i]
+        else:
+            members.append(i)
+
+    species = None
+    if match_species:
+        species = [info[-1].strip().casefold() for info in trees.info]
+
+    geographic = scale_y != 1.0
+    limit2 = distance_m * distance_m
+    pairs = []
+
+    def compare(i, j):
+        if species is not None and species[i] and species[j] and species[i] != species[j]:
+            return
+        dy = (ys[j] - ys[i]) * scale_y
+        dx = xs[j] - xs[i]
+        if geographic:
+            dx *= METRES_PER_DEGREE * math.cos(math.radians((ys[i] + ys[j]) / 2))
+        d2 = dx * dx + dy * dy
+        if d2 <= limit2:
+            pairs.append((math.sqrt(d2), i, j))
+
+    for (gx, gy), members in grid.items():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                compare(members[a], members[b])
+        for ox, oy in _NEIGHBOURS:
+            others = grid.get((gx + ox, gy + oy))
+            if others:
+                for i in members:
+                    for j in others:
+                        compare(i, j)
+        if len(pairs) >= MAX_PAIRS:
+            return pairs, True
+    return pairs, False
+
+
+def find_duplicate_trees(csv_path: str, distance_m: float = DEFAULT_DUPLICATE_DISTANCE_M,
+                         match_species: bool = False, report_path: Optional[str] = None) -> dict:
+    """
+    Sucht doppelt erfasste Bäume in einer bereits vorhandenen Import-CSV
+    (Kommandozeile). In der Umwandlung selbst stattdessen DuplicateSearch
+    als Schritt verwenden.
+
+    distance_m    – höchster Abstand zweier Bäume in Metern
+    match_species – nur Paare mit gleicher (oder fehlender) Baumart melden
+    report_path   – Standard: duplicate_trees.csv neben csv_path
+
+    Rückgabe siehe DuplicateSearch.write_report().
+    """
+    report_path = report_path or os.path.join(os.path.dirname(csv_path), DUPLICATES_REPORT_FILENAME)
+    search = DuplicateSearch(distance_m, match_species)
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        # Nur wenige Spalten werden gebraucht – Zeilen nicht erst umwandeln
+        rows = csv.reader(f, delimiter=";", quotechar='"')
+        fieldnames = next(rows, None) or []
+        wkt_index = wkt_column_index(fieldnames)
+        if wkt_index is None:
+            raise ValueError(f"Keine Geometriespalte (wkt) in {csv_path}")
+        search.bind(fieldnames)
+        search.apply_rows((r for r in rows if r), wkt_index)
+    return search.write_report(report_path)
+
+
+def format_duplicates(stats: dict) -> str:
+    text = (
+        f"Doppelte Bäume: {stats['pairs']} Kandidatenpaare ({stats['involved']} Bäume) "
+        f"unter {stats['trees']} Bäumen in {stats['elapsed']:.2f} s"
+    )
+    if stats["without_point"]:
+        text += f"; {stats['without_point']} ohne Punktgeometrie"
+    if stats["truncated"]:
+        text += f"; Suche nach {MAX_PAIRS} Paaren abgebrochen"
+    return text
+
+
+def _write_report(report_path: str, pairs, trees: _Trees):
+    """
+    Schreibt die Kandidatenpaare bzw. entfernt einen veralteten Bericht.
+    """
+    if not pairs:
+        if os.path.exists(report_path):
+            os.remove(report_path)
+        return
+
+    with open(report_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";", quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(["distance_m",
+                         "row_1", "treenumber_1", "treenumber2_1", "species_1",
+                         "row_2", "treenumber_2", "treenumber2_2", "species_2"])
+        for distance, i, j in pairs:
+            writer.writerow([f"{distance:.2f}",
+                             trees.rows[i], *trees.info[i],
+                             trees.rows[j], *trees.info[j]])
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Doppelt erfasste Bäume in einer Treesta-Import-CSV finden")
+    ap.add_argument("import_csv", help="Pfad zur Import-CSV")
+    ap.add_argument("--distance", type=float, default=DEFAULT_DUPLICATE_DISTANCE_M,
+                    help="höchster Abstand in Metern")
+    ap.add_argument("--match_species", action="store_true", help="nur Bäume gleicher Art melden")
+    args = ap.parse_args()
+
+    stats = find_duplicate_trees(args.import_csv, args.distance, args.match_species)
+    print(format_duplicates(stats))
+    if stats["report"]:
+        print("Hinweise:", stats["report"])
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+engine_selection – Verarbeitungsart anhand einer kurzen Vorab-Prüfung wählen
+
+Kleine Exporte werden am schnellsten vollständig im Speicher umgewandelt;
+große (viele Zeilen, lange WKT-Geometrien) laufen im Pipeline-Modus mit
+begrenztem Speicher. Statt eines festen Schwellwerts für die Dateigröße wird
+der Speicherbedarf aus einer Stichprobe geschätzt (conversion_preview):
+
+- Dateigröße ohne Kopfzeile und mittlere Länge der gelesenen Datensätze
+  (in Bytes, wie sie in der Datei stehen) → geschätzte Zeilenzahl; wird die
+  Datei dabei ganz gelesen, gilt die genaue Zahl
+- je Spalte Anteil unterschiedlicher Werte: wiederkehrende kurze Werte
+  (Kategorien, Codes) werden interniert und kosten je Zeile nur einen
+  Verweis, fast eindeutige Werte (IDs, WKT, Bemerkungen) ihre volle Länge
+- Länge der WKT-Geometrien → Stapelgröße im Pipeline-Modus, damit ein
+  Stapel etwa TARGET_BATCH_BYTES umfasst
+
+Die Entscheidung und ihre Gründe werden als EnginePlan zurückgegeben und vom
+converter_manager ausgegeben. Der Aufrufer kann die Wahl überschreiben
+(engine="memory" bzw. "pipelined").
+"""
+
+import os
+from collections import namedtuple
+from typing import Optional
+
+try:
+    from .conversion_preview import sample_export
+    from .csv_io import INTERN_MAX_LENGTH
+    from .pipeline import BATCH_ROWS, DEFAULT_MEMORY_LIMIT_MB
+    from .wkt import is_wkt_column
+except ImportError:  # Aufruf als Skript (CLI)
+    from conversion_preview import sample_export
+    from csv_io import INTERN_MAX_LENGTH
+    from pipeline import BATCH_ROWS, DEFAULT_MEMORY_LIMIT_MB
+    from wkt import is_wkt_column
+
+ENGINE_AUTO = "auto"
+ENGINE_MEMORY = "memory"
+ENGINE_PIPELINED = "pipelined"
+ENGINES = (ENGINE_AUTO, ENGINE_MEMORY, ENGINE_PIPELINED)
+
+# Bis zu diesem geschätzten Speicherbedarf wird im Speicher umgewandelt
+IN_MEMORY_LIMIT_MB = 512
+
+SCAN_HEAD_ROWS = 200
+SCAN_SAMPLE_ROWS = 200
+SCAN_TIME_BUDGET = 0.3
+
+# Spalten mit höchstens diesem Anteil unterschiedlicher Werte gelten als
+# kategorial (werden beim Lesen interniert und geteilt)
+CATEGORICAL_RATIO = 0.5
+
+# Speicher je Zeilentupel (Objektkopf) und je Verweis, je str-Objekt
+TUPLE_OVERHEAD = 56
+POINTER_SIZE = 8
+STR_OVERHEAD = 49
+
+TARGET_BATCH_BYTES = 1024 * 1024
+MIN_BATCH_ROWS = 20
+MAX_BATCH_ROWS = 5000
+
+ScanResult = namedtuple(
+    "ScanResult",
+    "size sampled_rows row_bytes estimated_rows max_wkt_length "
+    "categorical_columns width row_memory exact_rows"
+)
+
+EnginePlan = namedtuple("EnginePlan", "engine batch_rows memory_limit_mb reasons scan")
+
+
+def prescan(input_csv_path: str) -> ScanResult:
+    """
+    Stichprobe aus Anfang und Rest der Datei auswerten (liest unabhängig von
+    der Dateigröße nur einige hundert Zeilen). Kleine Dateien werden ganz
+    gelesen; estimated_rows ist dann die genaue Zeilenzahl (exact_rows).
+    """
+    size = os.path.getsize(input_csv_path)
+    sample = sample_export(input_csv_path, SCAN_HEAD_ROWS, SCAN_SAMPLE_ROWS, seed=0,
+                           time_budget=SCAN_TIME_BUDGET)
+    rows = sample.rows
+    width = len(sample.fieldnames)
+    if not rows:
+        return ScanResult(size, 0, 0, 0, 0, 0, width, 0, sample.row_count is not None)
+
+    # Zeilenlänge in der Datei (gemessen, mit Trennzeichen, Anführungszeichen
+    # und Zeilenende); die Kopfzeile zählt nicht als Datensatz
+    row_bytes = sample.row_bytes / len(rows)
+    if sample.row_count is not None:
+        estimated_rows = sample.row_count
+    else:
+        estimated_rows = round((size - sample.header_bytes) / row_bytes) if row_bytes else 0
+
+    wkt_columns = [i for i, name in enumerate(sample.fieldnames) if is_wkt_column(name)]
+    max_wkt_length = max((len(row[i]) for row in rows for i in wkt_columns), default=0)
+
+    # Speicher je Zeile: nicht geteilte Werte + Tupel; doppelt gerechnet,
+    # weil die umgewandelten Werte (Mapping, {…}-Listen) neue Objekte sind
+    # (gemessen an BK3/BK4-Exporten mit 150–180 MB)
+    row_memory = 2 * (TUPLE_OVERHEAD + POINTER_SIZE * width)
+    categorical = 0
+    for i in range(width):
+        values = [row[i] for row in rows]
+        distinct = len(set(values)) / len(values)
+        average = sum(len(v) for v in values) / len(values)
+        if distinct <= CATEGORICAL_RATIO and average <= INTERN_MAX_LENGTH:
+            categorical += 1
+        elif average:
+            row_memory += distinct * (STR_OVERHEAD + average)
+
+    return ScanResult(size, len(rows), row_bytes, estimated_rows, max_wkt_length,
+                      categorical, width, int(row_memory), sample.row_count is not None)
+
+
+def choose_engine(scan: ScanResult, engine: str = ENGINE_AUTO,
+                  memory_limit_mb: Optional[float] = None,
+                  in_memory_limit_mb: float = IN_MEMORY_LIMIT_MB) -> EnginePlan:
+    """
+    Verarbeitungsart, Stapelgröße und Puffergrenze festlegen.
+    engine – "auto" oder eine feste Wahl ("memory", "pipelined")
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unbekannte Verarbeitungsart: {engine}")
+
+    estimated_mb = scan.estimated_rows * scan.row_memory / (1024 * 1024)
+    if scan.exact_rows:
+        rows_text = f"{scan.estimated_rows} Zeilen (Ø {scan.row_bytes:.0f} Bytes, vollständig gelesen)"
+    else:
+        rows_text = (f"ca. {scan.estimated_rows} Zeilen "
+                     f"(Ø {scan.row_bytes:.0f} Bytes, Stichprobe {scan.sampled_rows} Zeilen)")
+    reasons = [
+        f"{scan.size / (1024 * 1024):.1f} MB, {rows_text}",
+        f"{scan.categorical_columns} von {scan.width} Spalten kategorial",
+        f"geschätzter Speicherbedarf im Speicher-Modus {estimated_mb:.0f} MB",
+    ]
+    if scan.max_wkt_length:
+        reasons.append(f"WKT bis {scan.max_wkt_length} Zeichen")
+
+    if engine != ENGINE_AUTO:
+        reasons.append(f"Verarbeitungsart vorgegeben: {engine}")
+    elif estimated_mb > in_memory_limit_mb:
+        engine = ENGINE_PIPELINED
+        reasons.append(f"über {in_memory_limit_mb:.0f} MB → Pipeline-Modus")
+    else:
+        engine = ENGINE_MEMORY
+        reasons.append(f"bis {in_memory_limit_mb:.0f} MB → im Speicher")
+
+    batch_rows = BATCH_ROWS
+    if scan.row_bytes:
+        batch_rows = int(min(MAX_BATCH_ROWS, max(MIN_BATCH_ROWS, TARGET_BATCH_BYTES / scan.row_bytes)))
+    if engine == ENGINE_PIPELINED:
+        reasons.append(f"Stapel zu {batch_rows} Zeilen")
+
+    return EnginePlan(engine, batch_rows, memory_limit_mb or DEFAULT_MEMORY_LIMIT_MB, reasons, scan)
+
+
+def format_engine_plan(plan: EnginePlan) -> str:
+    return f"Verarbeitung: {plan.engine} – " + "; ".join(plan.reasons)
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+export_delta – Unterschiede zwischen zwei BK-Exporten desselben Layers
+
+Während einer Übergangszeit wird derselbe Layer wiederholt exportiert. Statt
+jedes Mal den ganzen Bestand umzuwandeln, werden alter und neuer Export
+zeilenweise gelesen und über die Baumnummer (baumnummer, baumnummer2)
+verknüpft:
+
+- neu       – Baumnummer nur im neuen Export
+- geändert  – Baumnummer in beiden, Feldwerte unterschiedlich
+- gelöscht  – Baumnummer nur im alten Export
+
+Neue und geänderte Zeilen werden als verkleinerter Export (gleiche
+Kopfzeile) geschrieben und anschließend normal umgewandelt; gelöschte
+Baumnummern landen in einer eigenen Liste.
+
+Je Baum wird nur ein Hashwert der Feldwerte gehalten. Passt der alte Export
+nicht in max_index_rows, werden beide Seiten in sortierten Teildateien
+zwischengespeichert und per Merge-Join verglichen (externes Sortieren).
+"""
+
+import csv
+import hashlib
+import heapq
+import os
+import tempfile
+from typing import Dict, Iterator, List, Tuple
+
+KEY_COLUMNS = ("baumnummer", "baumnummer2")
+DELETED_FILENAME = "deleted_treenumbers.txt"
+
+# Obergrenze für den Hash-Index im Speicher (Zeilen des alten Exports)
+MAX_INDEX_ROWS = 500_000
+
+
+def _digest(values) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for val in values:
+        h.update(val.strip().encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _open_export(path: str):
+    f = open(path, encoding="utf-8-sig", newline="")
+    reader = csv.reader(f, delimiter=";", quotechar='"')
+    fieldnames = next(reader, None) or []
+    return f, reader, fieldnames
+
+
+def _key_positions(fieldnames: List[str], path: str) -> List[int]:
+    positions = {name.strip(): i for i, name in enumerate(fieldnames)}
+    if KEY_COLUMNS[0] not in positions:
+        raise ValueError(f"Spalte '{KEY_COLUMNS[0]}' fehlt in {path}.")
+    return [positions.get(name) for name in KEY_COLUMNS]
+
+
+def _key(row: List[str], key_positions: List[int]) -> str:
+    # Tabulator trennt die Teile; kommt in Baumnummern nicht vor
+    return "\t".join(
+        row[i].strip() if i is not None and i < len(row) else ""
+        for i in key_positions
+    )
+
+
+def _iter_keyed(path: str, compare_fields: List[str]) -> Iterator[Tuple[str, str, int]]:
+    """
+    Liefert (Schlüssel, Hash, Zeilennummer) je Datenzeile. Die Feldwerte
+    werden in der Reihenfolge compare_fields gehasht, damit Exporte mit
+    abweichender Spaltenreihenfolge vergleichbar bleiben.
+    """
+    f, reader, fieldnames = _open_export(path)
+    with f:
+        key_positions = _key_positions(fieldnames, path)
+        positions = {name.strip(): i for i, name in enumerate(fieldnames)}
+        compare_positions = [positions.get(name) for name in compare_fields]
+        for row_no, row in enumerate(reader):
+            if not row:
+                continue
+            values = [
+                row[i] if i is not None and i < len(row) else ""
+                for i in compare_positions
+            ]
+            yield _key(row, key_positions), _digest(values), row_no
+
+
+def _sorted_runs(records: Iterator[Tuple[str, str, int]], run_size: int,
+                 tmp_dir: str) -> List[str]:
+    """
+    Externes Sortieren, Schritt 1: sortierte Teildateien mit je run_size Zeilen.
+    """
+    paths = []
+    chunk = []
+
+    def flush():
+        chunk.sort()
+        fd, path = tempfile.mkstemp(suffix=".run", dir=tmp_dir)
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+            for key, digest, row_no in chunk:
+                out.write(f"{key}\x1e{digest}\x1e{row_no}\n")
+        paths.append(path)
+        chunk.clear()
+
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= run_size:
+            flush()
+    if chunk:
+        flush()
+    return paths
+
+
+def _merge_runs(paths: List[str]) -> Iterator[Tuple[str, str, int]]:
+    """
+    Externes Sortieren, Schritt 2: Teildateien zusammenführen.
+    """
+    files = [open(p, encoding="utf-8", newline="") for p in paths]
+    try:
+        def parse(f):
+            for line in f:
+                key, digest, row_no = line.rstrip("\n").split("\x1e")
+                yield key, digest, int(row_no)
+        yield from heapq.merge(*(parse(f) for f in files))
+    finally:
+        for f in files:
+            f.close()
+
+
+def _join_in_memory(old_path, new_path, compare_fields):
+    old_index: Dict[str, str] = {}
+    for key, digest, _ in _iter_keyed(old_path, compare_fields):
+        old_index.setdefault(key, digest)
+
+    selected = set()
+    counts = {"added": 0, "changed": 0, "unchanged": 0}
+    for key, digest, row_no in _iter_keyed(new_path, compare_fields):
+        old_digest = old_index.pop(key, None)
+        if old_digest is None:
+            counts["added"] += 1
+            selected.add(row_no)
+        elif old_digest != digest:
+            counts["changed"] += 1
+            selected.add(row_no)
+        else:
+            counts["unchanged"] += 1
+
+    return selected, sorted(old_index), counts
+
+
+def _join_external(old_path, new_path, compare_fields, run_size, tmp_dir):
+    old_runs = _sorted_runs(_iter_keyed(old_path, compare_fields), run_size, tmp_dir)
+    new_runs = _sorted_runs(_iter_keyed(new_path, compare_fields), run_size, tmp_dir)
+    try:
+        selected = set()
+        deleted = []
+        counts = {"added": 0, "changed": 0, "unchanged": 0}
+
+        old_iter = _merge_runs(old_runs)
+        old = next(old_iter, None)
+        last_old_key = None
+
+        for key, digest, row_no in _merge_runs(new_runs):
+            # Alte Schlüssel kleiner als der aktuelle neue → gelöscht
+            while old is not None and old[0] < key:
+                if old[0] != last_old_key:
+                    deleted.append(old[0])
+                last_old_key = old[0]
+                old = next(old_iter, None)
+
+            if old is not None and old[0] == key:
+                if old[1] != digest:
+                    counts["changed"] += 1
+                    selected.add(row_no)
+                else:
+                    counts["unchanged"] += 1
+                last_old_key = old[0]
+                old = next(old_iter, None)
+            else:
+                # auch doppelte Baumnummern im neuen Export (alter Wert verbraucht)
+                counts["added"] += 1
+                selected.add(row_no)
+
+        while old is not None:
+            if old[0] != last_old_key:
+                deleted.append(old[0])
+            last_old_key = old[0]
+            old = next(old_iter, None)
+
+        return selected, deleted, counts
+    finally:
+        for path in old_runs + new_runs:
+            os.remove(path)
+
+
+def diff_exports(old_csv_path: str, new_csv_path: str, delta_csv_path: str,
+                 deleted_txt_path: str, max_index_rows: int = MAX_INDEX_ROWS) -> dict:
+    """
+    Vergleicht zwei BK-Exporte und schreibt
+    - delta_csv_path   – neue und geänderte Zeilen des neuen Exports
+                         (Kopfzeile und Zeilen unverändert)
+    - deleted_txt_path – Baumnummern, die nur im alten Export vorkommen
+
+    Rückgabe: {"added": n, "changed": n, "unchanged": n, "deleted": n,
+               "external_sort": bool}
+    """
+    f, _, new_fields = _open_export(new_csv_path)
+    f.close()
+
+    # Verglichen werden die Spalten des neuen Exports (ohne Schlüssel)
+    compare_fields = [n.strip() for n in new_fields if n.strip() not in KEY_COLUMNS]
+
+    old_size = os.path.getsize(old_csv_path)
+    external = _estimate_rows(old_csv_path, old_size) > max_index_rows
+
+    if external:
+        tmp_dir = os.path.dirname(os.path.abspath(delta_csv_path))
+        selected, deleted, counts = _join_external(
+            old_csv_path, new_csv_path, compare_fields, max_index_rows, tmp_dir
+        )
+    else:
+        selected, deleted, counts = _join_in_memory(old_csv_path, new_csv_path, compare_fields)
+
+    # Zweiter Durchlauf über den neuen Export: nur ausgewählte Zeilen schreiben
+    f, reader, fieldnames = _open_export(new_csv_path)
+    with f, open(delta_csv_path, "w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out, delimiter=";", quotechar='"')
+        writer.writerow(fieldnames)
+        for row_no, row in enumerate(reader):
+            if row_no in selected:
+                writer.writerow(row)
+
+    if deleted:
+        with open(deleted_txt_path, "w", encoding="utf-8") as out:
+            out.write("Nicht mehr im Export enthaltene Baumnummern (baumnummer;baumnummer2):\n")
+            for key in deleted:
+                out.write(key.replace("\t", ";").rstrip(";") + "\n")
+    elif os.path.exists(deleted_txt_path):
+        os.remove(deleted_txt_path)
+
+    return {**counts, "deleted": len(deleted), "external_sort": external}
+
+
+def _estimate_rows(path: str, size: int, sample_bytes: int = 1 << 20) -> int:
+    """
+    Zeilenzahl aus den ersten Bytes hochrechnen (ohne die Datei ganz zu lesen).
+    """
+    if size == 0:
+        return 0
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+    lines = sample.count(b"\n")
+    if len(sample) >= size:
+        return lines
+    return int(size * max(lines, 1) / len(sample))
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+geojson_sink – Ausgabe als GeoJSON-Sequenz (ein Feature je Zeile)
+
+Alternative zur Import-CSV: QGIS muss die Datei nicht als Text mit
+WKT-Spalte auslesen, Geometrie und Zahlen kommen typisiert an. Die Zeilen
+werden wie bei der CSV einzeln geschrieben, der Speicherbedarf bleibt
+konstant.
+
+- Geometrie: die WKT-Spalte wird als Text in GeoJSON-Koordinaten
+  umgesetzt (Zahlen bleiben unverändert, nur die Klammern werden zu
+  Arrays); unbekannte oder ungültige Geometrien werden zu null
+- Eigenschaften: alle übrigen Spalten; Spalten mit Zahlenbereich in den
+  Prüfregeln (Höhe, Durchmesser, …) als Zahl, alles andere als Text;
+  leere Werte entfallen (in QGIS NULL) – die Exporte haben viele leere
+  Spalten, die Datei bleibt so etwa so groß wie die CSV
+- jedes Feature wird direkt als Text zusammengesetzt (Schlüssel einmal je
+  Kopfzeile kodiert), ohne Umweg über dict und json.dumps
+
+Format: RFC 8464 ohne Record-Separator (GDAL-Treiber GeoJSONSeq, Endung
+.geojsonl), UTF-8.
+"""
+
+import os
+import re
+from json.encoder import encode_basestring
+from typing import Iterable, List, Optional, Sequence
+
+try:
+    from .validation import COLUMN_RULES, parse_number
+    from .wkt import split_srid, wkt_column_index
+except ImportError:  # Aufruf als Skript (CLI)
+    from validation import COLUMN_RULES, parse_number
+    from wkt import split_srid, wkt_column_index
+
+OUTPUT_CSV = "csv"
+OUTPUT_GEOJSONSEQ = "geojsonseq"
+OUTPUT_FORMATS = (OUTPUT_CSV, OUTPUT_GEOJSONSEQ)
+
+GEOJSONSEQ_FILENAME = "treesta_import.geojsonl"
+
+# Spalten, die als Zahl geschrieben werden
+NUMERIC_COLUMNS = frozenset(name for name, rule in COLUMN_RULES.items() if "range" in rule)
+
+# Höchstzahl gemerkter Zahlenwerte (Speicher bleibt begrenzt)
+NUMBER_CACHE_SIZE = 65536
+
+_GEOMETRY = re.compile(
+    r"\s*(MULTI)?(POINT|LINESTRING|POLYGON)\s*(?:ZM|Z|M)?\s*(EMPTY\s*$)?", re.IGNORECASE
+)
+_GEOJSON_TYPES = {
+    ("", "POINT"): "Point", ("", "LINESTRING"): "LineString", ("", "POLYGON"): "Polygon",
+    ("MULTI", "POINT"): "MultiPoint", ("MULTI", "LINESTRING"): "MultiLineString",
+    ("MULTI", "POLYGON"): "MultiPolygon",
+}
+_TOKENS = re.compile(r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)")
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?\Z")
+_SEPARATOR = str.maketrans("()", "[]", " \t\r\n")
+_SEPARATOR_CHARS = frozenset("(), \t\r\n")
+
+
+def output_path(run, output_format: str) -> str:
+    """
+    Pfad der Ausgabedatei eines ConversionRun für output_format.
+    """
+    if output_format == OUTPUT_CSV:
+        return run.output_csv_path
+    if output_format == OUTPUT_GEOJSONSEQ:
+        return run.path(GEOJSONSEQ_FILENAME)
+    raise ValueError(f"Unbekanntes Ausgabeformat: {output_format} (erlaubt: {', '.join(OUTPUT_FORMATS)})")
+
+
+def _json_number(text: str) -> str:
+    if _JSON_NUMBER.match(text):
+        return text
+    return repr(float(text))
+
+
+def wkt_to_geojson(text: Optional[str]) -> Optional[str]:
+    """
+    GeoJSON-Geometrie als JSON-Text bzw. None (leer, EMPTY, nicht lesbar).
+
+        "POINT (13.4 52.5)" → '{"type":"Point","coordinates":[13.4,52.5]}'
+    """
+    if not text:
+        return None
+    _, text = split_srid(text)
+    match = _GEOMETRY.match(text)
+    if match is None or match.group(3):
+        return None
+    multi, kind = (match.group(1) or "").upper(), match.group(2).upper()
+    body = text[match.end():]
+    if kind == "POINT":
+        # Punkte haben in WKT teils eigene Klammern ("MULTIPOINT ((1 2), (3 4))")
+        body = body.replace("(", "").replace(")", "")
+        body = f"({body})" if multi else body
+
+    tokens = _TOKENS.split(body)
+    if len(tokens) < 3:
+        return None
+    parts = []
+    last = len(tokens) - 1
+    for i in range(0, len(tokens), 2):
+        separator = tokens[i]
+        if not _SEPARATOR_CHARS.issuperset(separator):
+            return None
+        if i == 0:
+            parts.append(separator.translate(_SEPARATOR) + "[")
+        elif i == last:
+            parts.append("]" + separator.translate(_SEPARATOR))
+        elif separator.strip():
+            parts.append("]" + separator.translate(_SEPARATOR) + "[")
+        else:
+            parts.append(",")
+        if i < last:
+            parts.append(_json_number(tokens[i + 1]))
+    coordinates = "".join(parts)
+    if coordinates.count("[") != coordinates.count("]"):
+        return None
+    return f'{{"type":"{_GEOJSON_TYPES[multi, kind]}","coordinates":{coordinates}}}'
+
+
+def _number_property(value: str) -> str:
+    number = parse_number(value)
+    if number is None:
+        return encode_basestring(value)
+    if number.is_integer() and abs(number) < 2 ** 53:
+        return str(int(number))
+    return repr(number)
+
+
+class FeatureEncoder:
+    """
+    Zeilen einer Kopfzeile als GeoJSON-Feature-Text (eine Zeile je Feature).
+    """
+
+    def __init__(self, fieldnames: Sequence[str]):
+        self.wkt_index = wkt_column_index(fieldnames)
+        self.columns = [
+            (i, encode_basestring(name) + ":", name.strip().lower() in NUMERIC_COLUMNS)
+            for i, name in enumerate(fieldnames) if i != self.wkt_index
+        ]
+        self.invalid_geometries = 0
+        self._numbers = {}
+
+    def _number(self, value: str) -> str:
+        # Messwerte wiederholen sich stark – je Text nur einmal umwandeln
+        encoded = self._numbers.get(value)
+        if encoded is None:
+            if len(self._numbers) >= NUMBER_CACHE_SIZE:
+                self._numbers.clear()
+            encoded = self._numbers[value] = _number_property(value)
+        return encoded
+
+    def encode(self, row: Sequence) -> str:
+        width = len(row)
+        number = self._number
+        properties = ",".join([
+            key + (number(value) if numeric else encode_basestring(value))
+            for i, key, numeric in self.columns
+            if i < width and (value := row[i])
+        ])
+        geometry = None
+        if self.wkt_index is not None and self.wkt_index < len(row):
+            text = row[self.wkt_index]
+            geometry = wkt_to_geojson(text)
+            if geometry is None and text and text.strip():
+                self.invalid_geometries += 1
+        return (
+            '{"type":"Feature","properties":{' + properties
+            + '},"geometry":' + (geometry or "null") + "}\n"
+        )
+
+
+class GeoJsonSeqFile:
+    """
+    GeoJSON-Sequenz mit derselben Schnittstelle wie csv_io.ImportCsvFile
+    (Schreiben in path + ".part", Umbenennen erst nach fehlerfreiem Ende,
+    resume_offset/keep_part für Checkpoints).
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], resume_offset: Optional[int] = None,
+                 keep_part: bool = False):
+        self.path = path
+        self.part_path = path + ".part"
+        self.encoder = FeatureEncoder(fieldnames)
+        self.resume_offset = resume_offset
+        self.keep_part = keep_part
+        self._f = None
+
+    def __enter__(self):
+        if self.resume_offset is None:
+            self._f = open(self.part_path, "w", encoding="utf-8", newline="")
+        else:
+            with open(self.part_path, "r+b") as f:
+                f.truncate(self.resume_offset)
+            self._f = open(self.part_path, "a", encoding="utf-8", newline="")
+        return self
+
+    def sync(self) -> int:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def writerow(self, row: Sequence):
+        self._f.write(self.encoder.encode(row))
+
+    def writerows(self, rows: Iterable[Sequence]):
+        encode = self.encoder.encode
+        self._f.writelines(map(encode, rows))
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.close()
+        if exc_type is None:
+            os.replace(self.part_path, self.path)
+            if self.encoder.invalid_geometries:
+                print(f"Hinweis: {self.encoder.invalid_geometries} Geometrien nicht lesbar – als null geschrieben")
+        elif not self.keep_part and os.path.exists(self.part_path):
+            os.remove(self.part_path)
+        return False
+
+
+def write_import_geojsonseq(path: str, fieldnames: List[str], rows: Iterable[Sequence],
+                            indexes: Optional[List[int]] = None, reporter=None) -> None:
+    """
+    Wie csv_io.write_import_csv, aber als GeoJSON-Sequenz.
+    """
+    with GeoJsonSeqFile(path, fieldnames) as output:
+        if indexes is None and reporter is None:
+            output.writerows(rows)
+        else:
+            for row in rows:
+                output.writerow(row if indexes is None else [row[i] for i in indexes])
+                if reporter is not None:
+                    reporter.row()
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+gpkg_delta – Abgleich einer Import-CSV mit einer bestehenden Treesta-Datenbank
+
+Bei einer wiederholten Migration würden die eingefügten CSV-Zeilen in
+tree_data doppelte Bäume erzeugen. Dieses Modul liest database.gpkg einmal
+und baut einen Hash-Index über (treenumber, treenumber2). Jede Zeile der
+Import-CSV wird anschließend eingeordnet als
+
+- insert    – Baumnummer noch nicht in der Datenbank
+- update    – Baum vorhanden, mindestens ein verglichenes Feld geändert
+- unchanged – Baum vorhanden, keine Änderung
+
+Verglichen werden alle Spalten, die sowohl in der CSV als auch in der
+Tabelle vorkommen (ohne Primärschlüssel und Geometrie). Je Baum wird nur ein
+Hashwert der Feldwerte gehalten, nicht die ganze Zeile.
+
+Ausgabe:
+- <name>-neu.csv        – nur neue Bäume, zum Einfügen wie bisher
+- <name>-geaendert.csv  – geänderte Bäume inkl. fid (zur Prüfung)
+- optional direkte Aktualisierung der geänderten Bäume in Stapeln von
+  UPDATE_BATCH_SIZE Zeilen, noch während des Lesens (eine Transaktion;
+  Zahlen mit Dezimalkomma werden für Zahlenspalten als Zahl gebunden)
+
+Beide CSVs entstehen wie alle Ausgaben als *.part (csv_io.ImportCsvFile).
+
+Die Trigger des räumlichen Index (R-Tree) eines GeoPackage rufen
+ST_IsEmpty, ST_MinX usw. auf, die sqlite3 nicht kennt. Für die
+Aktualisierung werden sie deshalb registriert; die Werte kommen aus dem
+Kopf des GeoPackage-Geometrie-Blobs bzw. aus den WKB-Koordinaten.
+"""
+
+import csv
+import hashlib
+import os
+import math
+import sqlite3
+import struct
+from typing import Dict, List, Tuple
+
+try:
+    from .csv_io import ImportCsvFile
+except ImportError:  # Aufruf als Skript (CLI)
+    from csv_io import ImportCsvFile
+
+TREE_TABLE = "tree_data"
+KEY_COLUMNS = ("treenumber", "treenumber2")
+UPDATE_BATCH_SIZE = 1000
+
+
+def normalize_compare_value(val) -> str:
+    """
+    Werte aus CSV (Text) und GeoPackage (typisiert) vergleichbar machen:
+    NULL = "", Zahlen unabhängig von Schreibweise (12 / 12.0 / 12,0).
+    """
+    if val is None:
+        return ""
+    text = str(val).strip()
+    if not text:
+        return ""
+    try:
+        return repr(float(text.replace(",", ".")))
+    except ValueError:
+        return text
+
+
+def row_digest(values) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for val in values:
+        h.update(normalize_compare_value(val).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.digest()
+
+
+def _key_value(val) -> str:
+    """
+    Baumnummer vergleichbar machen: ganze Zahlen ohne Nachkommastellen
+    (REAL 12.0 in der Datenbank = "12" in der CSV), sonst wie
+    normalize_compare_value.
+    """
+    text = normalize_compare_value(val)
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    if number.is_integer():
+        return str(int(number))
+    return text
+
+
+def tree_key(treenumber, treenumber2) -> Tuple[str, str]:
+    return _key_value(treenumber), _key_value(treenumber2)
+
+
+# === GeoPackage-Geometrie (für die Trigger des R-Tree-Index) =================
+# Koordinaten je Punkt nach WKB-Dimension (ISO: +1000 Z, +2000 M, +3000 ZM)
+_WKB_DIMENSIONS = {0: 2, 1: 3, 2: 3, 3: 4}
+_ENVELOPE_VALUES = {0: 0, 1: 4, 2: 6, 3: 6, 4: 8}
+
+
+def _wkb_points(data: bytes, offset: int, points: list) -> int:
+    """
+    Sammelt die (x, y) einer WKB-Geometrie ab offset; liefert das Ende.
+    """
+    endian = "<" if data[offset] == 1 else ">"
+    geometry_type = struct.unpack_from(endian + "I", data, offset + 1)[0]
+    offset += 5
+    # EWKB-Kennzeichen (Z, M, SRID) bzw. ISO-Tausender
+    has_z = bool(geometry_type & 0x80000000)
+    has_m = bool(geometry_type & 0x40000000)
+    if geometry_type & 0x20000000:
+        offset += 4
+    geometry_type &= 0x0FFFFFFF
+    dimension = _WKB_DIMENSIONS[geometry_type // 1000] if geometry_type >= 1000 else 2 + has_z + has_m
+    base = geometry_type % 1000
+
+    def read_points(count, offset):
+        for _ in range(count):
+            points.append(struct.unpack_from(endian + "dd", data, offset))
+            offset += 8 * dimension
+        return offset
+
+    if base == 1:
+        return read_points(1, offset)
+    count = struct.unpack_from(endian + "I", data, offset)[0]
+    offset += 4
+    if base == 2:
+        return read_points(count, offset)
+    if base == 3:
+        for _ in range(count):
+            ring = struct.unpack_from(endian + "I", data, offset)[0]
+            offset = read_points(ring, offset + 4)
+        return offset
+    # Multi*/GeometryCollection: Teilgeometrien mit eigenem Kopf
+    for _ in range(count):
+        offset = _wkb_points(data, offset, points)
+    return offset
+
+
+def gpkg_envelope(blob):
+    """
+    (min_x, max_x, min_y, max_y) eines GeoPackage-Geometrie-Blobs bzw. None
+    (NULL, leer, nicht lesbar).
+    """
+    if blob is None or len(blob) < 8 or blob[:2] != b"GP":
+        return None
+    flags = blob[3]
+    if flags & 0x10:
+        return None
+    endian = "<" if flags & 0x01 else ">"
+    values = _ENVELOPE_VALUES.get((flags >> 1) & 0x07)
+    if values is None:
+        return None
+    if values:
+        min_x, max_x, min_y, max_y = struct.unpack_from(endian + "4d", blob, 8)
+        return min_x, max_x, min_y, max_y
+    # ohne Hülle im Kopf (bei Punkten üblich): aus den WKB-Koordinaten
+    points = []
+    try:
+        _wkb_points(bytes(blob), 8, points)
+    except (struct.error, KeyError, IndexError):
+        return None
+    points = [(x, y) for x, y in points if not (math.isnan(x) or math.isnan(y))]
+    if not points:
+        return None
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs), max(xs), min(ys), max(ys)
+
+
+def _envelope_function(position):
+    def function(blob):
+        envelope = gpkg_envelope(blob)
+        return None if envelope is None else envelope[position]
+    return function
+
+
+def register_gpkg_functions(conn) -> None:
+    """
+    ST_IsEmpty, ST_MinX, ST_MaxX, ST_MinY und ST_MaxY für die R-Tree-Trigger
+    eines GeoPackage registrieren.
+    """
+    conn.create_function("ST_IsEmpty", 1, lambda blob: 1 if gpkg_envelope(blob) is None else 0,
+                         deterministic=True)
+    for name, position in (("ST_MinX", 0), ("ST_MaxX", 1), ("ST_MinY", 2), ("ST_MaxY", 3)):
+        conn.create_function(name, 1, _envelope_function(position), deterministic=True)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _is_numeric_type(declared: str) -> bool:
+    # Typaffinität nach SQLite: ohne Typ oder mit CHAR/CLOB/TEXT/BLOB kein Zahlentyp
+    declared = (declared or "").upper()
+    return bool(declared) and not any(t in declared for t in ("CHAR", "CLOB", "TEXT", "BLOB"))
+
+
+def bind_value(val: str, numeric: bool):
+    """
+    CSV-Wert für UPDATE: "" → NULL; in Zahlenspalten Zahlen mit Punkt oder
+    Dezimalkomma als int/float (sonst bliebe "12,5" Text in der Spalte).
+    """
+    if val == "":
+        return None
+    if not numeric:
+        return val
+    try:
+        number = float(val.strip().replace(",", "."))
+    except ValueError:
+        return val
+    if not math.isfinite(number):
+        return val
+    return int(number) if number.is_integer() and abs(number) < 2 ** 53 else number
+
+
+def _table_layout(conn, table: str):
+    """
+    Liefert (Spalten, Primärschlüssel, Geometriespalte, Zahlenspalten) der
+    Tabelle.
+    """
+    info = conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+    if not info:
+        raise ValueError(f"Tabelle '{table}' nicht in der Datenbank gefunden.")
+
+    columns = [row[1] for row in info]
+    numeric = {row[1] for row in info if _is_numeric_type(row[2])}
+    pk = next((row[1] for row in info if row[5]), "rowid")
+
+    geometry = None
+    try:
+        found = conn.execute(
+            "SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?",
+            (table,)
+        ).fetchone()
+        geometry = found[0] if found else None
+    except sqlite3.Error:
+        pass
+
+    return columns, pk, geometry, numeric
+
+
+def build_tree_index(conn, table: str, compare_columns: List[str], pk: str):
+    """
+    Ein Durchlauf über die Tabelle: (treenumber, treenumber2) → (pk, Hash).
+    Bei mehrfach vorhandenen Baumnummern gilt der erste Treffer.
+    """
+    select = ", ".join(_quote(c) for c in [pk, *KEY_COLUMNS, *compare_columns])
+    index: Dict[Tuple[str, str], Tuple[object, bytes]] = {}
+    for row in conn.execute(f"SELECT {select} FROM {_quote(table)}"):
+        key = tree_key(row[1], row[2])
+        if key == ("", "") or key in index:
+            continue
+        index[key] = (row[0], row_digest(row[3:]))
+    return index
+
+
+def diff_against_database(csv_path: str, gpkg_path: str, table: str = TREE_TABLE,
+                          apply_updates: bool = False) -> dict:
+    """
+    Vergleicht die Import-CSV mit tree_data in database.gpkg.
+
+    apply_updates – geänderte Bäume direkt in der Datenbank aktualisieren
+                    (nur Sachdaten, keine Geometrie). Neue Bäume werden
+                    immer als CSV ausgegeben.
+
+    Rückgabe: {"insert": n, "update": n, "unchanged": n,
+               "insert_csv": Pfad|None, "update_csv": Pfad|None, "applied": n}
+    """
+    if not os.path.exists(gpkg_path):
+        raise FileNotFoundError(f"Treesta-Datenbank nicht gefunden: {gpkg_path}")
+
+    base, ext = os.path.splitext(csv_path)
+    insert_path = f"{base}-neu{ext or '.csv'}"
+    update_path = f"{base}-geaendert{ext or '.csv'}"
+
+    mode = "rw" if apply_updates else "ro"
+    conn = sqlite3.connect(f"file:{gpkg_path}?mode={mode}", uri=True)
+    if apply_updates:
+        register_gpkg_functions(conn)
+    try:
+        table_columns, pk, geometry, numeric_columns = _table_layout(conn, table)
+        missing = [c for c in KEY_COLUMNS if c not in table_columns]
+        if missing:
+            raise ValueError(f"Spalten {missing} fehlen in Tabelle '{table}'.")
+
+        with open(csv_path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f, delimiter=";", quotechar='"')
+            fieldnames = next(reader, None) or []
+            positions = {name: i for i, name in enumerate(fieldnames)}
+            missing = [c for c in KEY_COLUMNS if c not in positions]
+            if missing:
+                raise ValueError(f"Spalten {missing} fehlen in {csv_path}.")
+
+            excluded = {pk, geometry, *KEY_COLUMNS}
+            compare_columns = [c for c in fieldnames if c in table_columns and c not in excluded]
+            compare_positions = [positions[c] for c in compare_columns]
+            key_positions = [positions[c] for c in KEY_COLUMNS]
+
+            index = build_tree_index(conn, table, compare_columns, pk)
+
+            counts = {"insert": 0, "update": 0, "unchanged": 0}
+            applied = 0
+            numeric = [c in numeric_columns for c in compare_columns]
+            apply = apply_updates and bool(compare_columns)
+            if apply:
+                assignments = ", ".join(f"{_quote(c)} = ?" for c in compare_columns)
+                sql = f"UPDATE {_quote(table)} SET {assignments} WHERE {_quote(pk)} = ?"
+            batch: List[list] = []
+
+            # Eine Transaktion für alle Stapel (Commit vor dem Umbenennen der
+            # CSVs): bei einem Fehler bleibt die Datenbank unverändert und es
+            # entstehen keine halben CSVs
+            with ImportCsvFile(insert_path, list(fieldnames)) as insert_file, \
+                    ImportCsvFile(update_path, [pk] + fieldnames) as update_file, \
+                    conn:
+                for row in reader:
+                    if not row:
+                        continue
+                    row += [""] * (len(fieldnames) - len(row))
+                    key = tree_key(row[key_positions[0]], row[key_positions[1]])
+                    found = index.get(key) if key != ("", "") else None
+
+                    if found is None:
+                        counts["insert"] += 1
+                        insert_file.writerow(row)
+                        continue
+
+                    values = [row[i] for i in compare_positions]
+                    if row_digest(values) == found[1]:
+                        counts["unchanged"] += 1
+                        continue
+
+                    counts["update"] += 1
+                    update_file.writerow([found[0]] + row)
+                    if apply:
+                        batch.append([bind_value(v, n) for v, n in zip(values, numeric)] + [found[0]])
+                        if len(batch) >= UPDATE_BATCH_SIZE:
+                            conn.executemany(sql, batch)
+                            applied += len(batch)
+                            batch = []
+
+                if batch:
+                    conn.executemany(sql, batch)
+                    applied += len(batch)
+    finally:
+        conn.close()
+
+    # Leere Teil-Dateien nicht liegen lassen
+    result_paths = {}
+    for name, path in (("insert_csv", insert_path), ("update_csv", update_path)):
+        has_rows = counts["insert" if name == "insert_csv" else "update"] > 0
+        if has_rows:
+            result_paths[name] = path
+        else:
+            os.remove(path)
+            result_paths[name] = None
+
+    return {**counts, **result_paths, "applied": applied}
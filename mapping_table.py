@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+mapping_table – Mappings als gemeinsam genutzte, schreibgeschützte Tabelle
+
+Laufen Umwandlungen in mehreren Prozessen (Prozess-Pool), liest sonst jeder
+Prozess fields_mapping_*/value_mapping_* selbst ein und hält eigene dicts.
+Hier werden die fertig geladenen Mappings einmal in eine kompakte Datei
+geschrieben, die alle Prozesse nur lesend einblenden (mmap): der Start
+eines Prozesses kostet fast nichts, die Daten liegen nur einmal im
+Speicher (Seiten-Cache des Betriebssystems).
+
+Aufbau der Datei (Little Endian):
+
+    Kopf      MAGIC, Anzahl, Hash-Plätze, Länge der Zusatzangaben
+    meta      JSON: Quelldatei, Signatur (Größe/Änderungszeit), Zusatzangaben
+    Index     Hash-Plätze × uint32 (Eintrag + 1, 0 = frei; CRC-32 des
+              Schlüssels, lineares Sondieren)
+    Einträge  Anzahl × (Schlüssel-Offset, -Länge, Wert-Offset, -Länge),
+              nach Schlüssel sortiert
+    Texte     Schlüssel und Werte in UTF-8
+
+Die Schlüssel kommen unverändert aus den Ladefunktionen der Converter
+(z. B. converter_bk4.load_csv_mapping mit normalisierten Schlüsseln) –
+Nachschlagen liefert dieselben Ergebnisse wie das dict.
+
+Geänderte Mapping-Dateien werden über ihre Signatur erkannt; die Tabelle
+wird dann von dem Prozess neu geschrieben, der sie zuerst braucht.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Optional
+
+try:
+    from .checkpoint import file_signature
+except ImportError:  # Aufruf als Skript (CLI)
+    from checkpoint import file_signature
+
+MAGIC = b"TSMAP001"
+TABLE_SUFFIX = ".tsmap"
+
+# Standardordner der Tabellen (gemeinsam für alle Prozesse eines Rechners)
+DEFAULT_TABLE_DIR = os.path.join(tempfile.gettempdir(), "treesta_mappings")
+
+# Höchstzahl gemerkter Treffer je Prozess (Speicher bleibt begrenzt)
+LOOKUP_CACHE_SIZE = 4096
+
+_HEADER = struct.Struct("<8sIII")
+_SLOT = struct.Struct("<I")
+_ENTRY = struct.Struct("<IIII")
+_FIELDS = 4
+_MISSING = object()
+
+
+def _slot_count(count: int) -> int:
+    # Zweierpotenz, höchstens halb belegt
+    slots = 8
+    while slots < 2 * count:
+        slots <<= 1
+    return slots
+
+
+def write_mapping_table(path: str, mapping: Mapping, meta: Optional[dict] = None) -> None:
+    """
+    Schreibt mapping (str → str) als Tabelle nach path (über path + ".<pid>.part",
+    damit gleichzeitig schreibende Prozesse sich nicht stören).
+    """
+    items = sorted((key.encode("utf-8"), value.encode("utf-8")) for key, value in mapping.items())
+    meta_bytes = json.dumps(meta or {}, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    # Index und Einträge auf 4 Byte ausrichten (Leerzeichen sind gültiges JSON)
+    meta_bytes += b" " * (-len(meta_bytes) % 4)
+    slots = _slot_count(len(items))
+
+    index = [0] * slots
+    entries = bytearray()
+    blob = bytearray()
+    mask = slots - 1
+    for number, (key, value) in enumerate(items):
+        entries += _ENTRY.pack(len(blob), len(key), len(blob) + len(key), len(value))
+        blob += key
+        blob += value
+        slot = zlib.crc32(key) & mask
+        while index[slot]:
+            slot = (slot + 1) & mask
+        index[slot] = number + 1
+
+    part_path = f"{path}.{os.getpid()}.part"
+    try:
+        with open(part_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(items), slots, len(meta_bytes)))
+            f.write(meta_bytes)
+            f.write(struct.pack(f"<{slots}I", *index))
+            f.write(entries)
+            f.write(blob)
+        os.replace(part_path, path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
+class MappingTable(Mapping):
+    """
+    Schreibgeschütztes Mapping über einer eingeblendeten Tabellendatei.
+
+        table = MappingTable(path)
+        table["alt"], "alt" in table, table.get("alt"), len(table)
+
+    Verhält sich wie ein dict aus str-Schlüsseln (Iteration in
+    Schlüsselreihenfolge). Die zuletzt gefundenen Werte werden je Prozess
+    gemerkt (höchstens LOOKUP_CACHE_SIZE).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._slots, meta_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Keine Mapping-Tabelle: {path}")
+        offset = _HEADER.size
+        self.meta = json.loads(self._mm[offset:offset + meta_length].decode("utf-8"))
+        index_offset = offset + meta_length
+        self._blob_offset = index_offset + (self._slots + self._count * _FIELDS) * _SLOT.size
+        words = memoryview(self._mm)[index_offset:self._blob_offset]
+        if sys.byteorder == "little":
+            words = words.cast("I")
+        else:
+            # Kopie mit getauschter Bytefolge (nicht mehr geteilt)
+            words = array("I", words)
+            words.byteswap()
+        self._words = words
+        self._cache = {}
+
+    def close(self):
+        if isinstance(self._words, memoryview):
+            self._words.release()
+        self._mm.close()
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._blob_offset + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _lookup(self, key):
+        if not isinstance(key, str):
+            return _MISSING
+        data = key.encode("utf-8")
+        words = self._words
+        mm = self._mm
+        slots = self._slots
+        mask = slots - 1
+        slot = zlib.crc32(data) & mask
+        while True:
+            number = words[slot]
+            if not number:
+                return _MISSING
+            entry = slots + (number - 1) * _FIELDS
+            start = self._blob_offset + words[entry]
+            if words[entry + 1] == len(data) and mm[start:start + len(data)] == data:
+                return self._text(words[entry + 2], words[entry + 3])
+            slot = (slot + 1) & mask
+
+    def _miss(self, key):
+        value = self._lookup(key)
+        if len(self._cache) >= LOOKUP_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = value
+        return value
+
+    # Werte wiederholen sich in den Exporten stark: zuerst im Cache suchen
+    def __getitem__(self, key):
+        value = self._cache.get(key) or self._miss(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._cache.get(key) or self._miss(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        return (self._cache.get(key) or self._miss(key)) is not _MISSING
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        words = self._words
+        for entry in range(self._slots, self._slots + self._count * _FIELDS, _FIELDS):
+            yield self._text(words[entry], words[entry + 1])
+
+    def __repr__(self):
+        return f"MappingTable({self.path!r}, {self._count} Einträge)"
+
+
+def table_path(source_path: str, label: str, table_dir: str = DEFAULT_TABLE_DIR) -> str:
+    """
+    Pfad der Tabelle zu einer Mapping-Datei (eindeutig je Quelldatei und label).
+    """
+    source = os.path.abspath(source_path)
+    digest = zlib.crc32(source.encode("utf-8"))
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(table_dir, f"{name}-{label}-{digest:08x}{TABLE_SUFFIX}")
+
+
+def shared_mapping(source_path: str, label: str, load: Callable,
+                   table_dir: Optional[str] = None) -> MappingTable:
+    """
+    Mapping einer Datei als gemeinsam genutzte Tabelle.
+
+    load      – lädt das Mapping aus source_path, wenn die Tabelle fehlt oder
+                veraltet ist; liefert das dict oder (dict, meta) mit
+                JSON-fähigen Zusatzangaben (später MappingTable.meta["extra"])
+    table_dir – Ordner der Tabellen (Standard: DEFAULT_TABLE_DIR)
+    """
+    table_dir = table_dir or DEFAULT_TABLE_DIR
+    path = table_path(source_path, label, table_dir)
+    expected = {
+        "source": os.path.abspath(source_path),
+        "label": label,
+        "signature": file_signature(source_path),
+    }
+
+    table = _open_current(path, expected)
+    if table is not None:
+        return table
+
+    loaded = load()
+    mapping, extra = loaded if isinstance(loaded, tuple) else (loaded, None)
+    os.makedirs(table_dir, exist_ok=True)
+    try:
+        write_mapping_table(path, mapping, dict(expected, extra=extra))
+    except OSError:
+        # Unter Windows lässt sich eine eingeblendete Datei nicht ersetzen –
+        # dann hat sie ein anderer Prozess gerade neu geschrieben
+        table = _open_current(path, expected)
+        if table is None:
+            raise
+        return table
+    return MappingTable(path)
+
+
+def _open_current(path: str, expected: dict) -> Optional[MappingTable]:
+    if not os.path.exists(path):
+        return None
+    try:
+        table = MappingTable(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if {name: table.meta.get(name) for name in expected} != expected:
+        table.close()
+        return None
+    return table
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+number_normalization – Messwerte (Höhe, Durchmesser, Umfang) als Zahlen
+
+Die Exporte enthalten Messwerte als Text: mit Dezimalkomma ("12,5"),
+Einheit ("12 m", "35cm") oder als Bereich ("10-12"). Treesta übernimmt
+solche Werte nur als Text. Diese optionale Stufe schreibt die Messspalten
+als Zahl mit Dezimalpunkt in der Einheit, die Treesta erwartet:
+
+- Höhe, Stammhöhe, Kronendurchmesser in m; Stammdurchmesser und
+  -umfang in cm; Stammanzahl ohne Einheit
+- angegebene Einheiten (mm, cm, dm, m) werden umgerechnet, eine Zahl ohne
+  Einheit gilt als Zieleinheit
+- Bereiche ("10-12", "10 – 12 m", "10 bis 12") werden zum Mittelwert;
+  "ca." und "~" entfallen
+- nicht lesbare Werte und unbekannte Einheiten bleiben unverändert
+
+Die Parser werden einmal je Kopfzeile kompiliert (eine Regel je Spalte,
+Spalten derselben Einheit teilen sich einen Parser). Jeder Rohtext wird nur
+einmal zerlegt, danach kommt das Ergebnis aus dem Cache – die Messwerte
+wiederholen sich auch in großen Exporten stark.
+
+Bericht: number_report.csv (Aufbau wie validation_report.csv)
+    column;rule;count;rows;example
+mit nicht lesbaren Werten, unbekannten Einheiten und übernommenen Bereichen.
+"""
+
+import re
+import time
+from typing import Dict, Iterable, Optional
+
+try:
+    from .validation import RowValidator
+except ImportError:  # Aufruf als Skript (CLI)
+    from validation import RowValidator
+
+NUMBER_REPORT_FILENAME = "number_report.csv"
+
+# Höchstzahl gemerkter Rohtexte je Parser (Speicher bleibt begrenzt)
+NUMBER_CACHE_SIZE = 65536
+
+# Treesta-Spalte → Einheit des Werts ("" = Anzahl ohne Einheit)
+COLUMN_UNITS: Dict[str, str] = {
+    "height": "m",
+    "trunk_height": "m",
+    "trunk_number": "",
+    **{f"crown_diameter_{i}": "m" for i in range(1, 5)},
+    **{f"trunk_diameter_{i}": "cm" for i in range(1, 5)},
+    **{f"trunk_circumference_{i}": "cm" for i in range(1, 5)},
+}
+
+# Einheit im Export → Faktor je Zieleinheit
+UNIT_FACTORS: Dict[str, Dict[str, float]] = {
+    "m": {"mm": 0.001, "cm": 0.01, "dm": 0.1, "m": 1.0},
+    "cm": {"mm": 0.1, "cm": 1.0, "dm": 10.0, "m": 100.0},
+    "": {"st": 1.0, "stk": 1.0, "stück": 1.0},
+}
+
+# Bereits sauber geschriebene Zahl – bleibt unverändert
+_PLAIN = re.compile(r"-?\d+(?:\.\d+)?\Z")
+
+_NUMBER = r"[-+]?(?:\d+(?:[.,]\d*)?|[.,]\d+)"
+_MEASURE = re.compile(
+    rf"""(?:ca\.?|~|etwa)?\s*
+         (?P<low>{_NUMBER})\s*(?P<low_unit>(?!bis\b)[^\W\d_]+)?\.?\s*
+         (?:(?:-|–|bis)\s*(?P<high>{_NUMBER})\s*(?P<high_unit>[^\W\d_]+)?\.?\s*)?\Z""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+NOT_A_NUMBER = ("zahl", "keine Zahl – Text übernommen")
+UNKNOWN_UNIT = ("einheit", "unbekannte Einheit – Text übernommen")
+RANGE_AVERAGED = ("bereich", "Bereich – Mittelwert übernommen")
+
+
+def format_number(value: float) -> str:
+    """
+    Zahl mit Dezimalpunkt, höchstens 6 Nachkommastellen, ohne Nullen am Ende.
+    """
+    text = f"{value:.6f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+class NumberParser:
+    """
+    Parser für eine Zieleinheit mit Cache je Rohtext.
+
+        parser = NumberParser("m")
+        parser("35cm")   # ("0.35", None)
+        parser("groß")   # ("groß", NOT_A_NUMBER)
+    """
+
+    def __init__(self, unit: str):
+        self.unit = unit
+        self.factors = UNIT_FACTORS[unit]
+        self.cache: Dict[str, tuple] = {}
+
+    def __call__(self, raw: str) -> tuple:
+        result = self.cache.get(raw)
+        if result is None:
+            if len(self.cache) >= NUMBER_CACHE_SIZE:
+                self.cache.clear()
+            result = self.cache[raw] = self.parse(raw)
+        return result
+
+    def _value(self, number: str, unit: Optional[str]):
+        value = float(number.replace(",", "."))
+        if not unit:
+            return value
+        factor = self.factors.get(unit.lower())
+        return None if factor is None else value * factor
+
+    def parse(self, raw: str) -> tuple:
+        """
+        (Text für die Ausgabe, None bzw. (rule, message) für den Bericht).
+        """
+        text = raw.strip()
+        if not text or _PLAIN.match(text):
+            return raw, None
+        match = _MEASURE.match(text)
+        if match is None:
+            return raw, NOT_A_NUMBER
+
+        low_unit, high_unit = match.group("low_unit"), match.group("high_unit")
+        if match.group("high") is not None and not low_unit:
+            # "10-12 m": die Einheit gilt für beide Zahlen
+            low_unit = high_unit
+        for unit in (low_unit, high_unit):
+            if unit and unit.lower() not in self.factors:
+                return raw, UNKNOWN_UNIT
+
+        value = self._value(match.group("low"), low_unit)
+        if match.group("high") is None:
+            return format_number(value), None
+        high = self._value(match.group("high"), high_unit)
+        return format_number((value + high) / 2), RANGE_AVERAGED
+
+
+class NumberNormalizer(RowValidator):
+    """
+    Kompilierte Parser für die Messspalten einer Kopfzeile; Bericht und
+    Checkpoint-Zustand wie RowValidator.
+
+    columns – Liste (index, column, parser); index ist die Position im
+              Ausgabetupel.
+    """
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        # Cache-Zugriff ohne Methodenaufruf (clear() behält das dict)
+        self._lookups = [(index, column, parser.cache.get, parser) for index, column, parser in columns]
+        self.normalized = 0
+
+    def normalize(self, row_no: int, row):
+        """
+        Ausgabezeile mit vereinheitlichten Messwerten (dasselbe Tupel, wenn
+        nichts zu ändern war).
+        """
+        started = time.perf_counter()
+        changed = None
+        for index, column, cached, parser in self._lookups:
+            raw = row[index]
+            if not raw:
+                continue
+            text, problem = cached(raw) or parser(raw)
+            if problem is not None:
+                self.record(row_no, column, problem, raw)
+            if text != raw:
+                if changed is None:
+                    changed = list(row)
+                changed[index] = text
+                self.normalized += 1
+        self.elapsed += time.perf_counter() - started
+        return row if changed is None else tuple(changed)
+
+    def to_state(self) -> dict:
+        return dict(super().to_state(), normalized=self.normalized)
+
+    def load_state(self, state: dict):
+        super().load_state(state)
+        self.normalized = state["normalized"]
+
+    def summary(self) -> str:
+        return (
+            f"Messwerte: {self.normalized} Werte als Zahl geschrieben, "
+            f"{self.violation_count} Hinweise ({NUMBER_REPORT_FILENAME}) in {self.elapsed:.2f} s"
+        )
+
+
+def compile_number_normalizer(columns: Iterable[str],
+                              units: Dict[str, str] = None) -> Optional[NumberNormalizer]:
+    """
+    Parser für die Messspalten unter columns (Reihenfolge wie in den
+    Ausgabetupeln) bzw. None, wenn keine Messspalte vorkommt.
+    Spaltennamen werden ohne Beachtung der Groß-/Kleinschreibung zugeordnet.
+    """
+    units = COLUMN_UNITS if units is None else units
+    parsers = {}
+    compiled = []
+    for index, column in enumerate(columns):
+        unit = units.get(column, units.get(str(column).lower()))
+        if unit is None:
+            continue
+        parser = parsers.get(unit)
+        if parser is None:
+            parser = parsers[unit] = NumberParser(unit)
+        compiled.append((index, column, parser))
+    return NumberNormalizer(compiled) if compiled else None
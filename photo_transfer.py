@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+photo_transfer – Fotodateien in den Treesta-Fotoordner übertragen
+
+Die Fotofelder (doc_01 … doc_10) werden mit Dateinamen bzw. Pfaden in die
+Import-CSV übernommen; die Bilddateien selbst mussten bisher von Hand
+kopiert werden. Dieser optionale Schritt
+
+- sammelt alle Fotoverweise aus der Import-CSV (jede Datei nur einmal)
+- sucht die Dateien im Quellordner (Standard: Ordner des Exports)
+- kopiert oder verlinkt (Hardlink) sie mit einem Thread-Pool in den Zielordner
+- überspringt Dateien, die im Ziel bereits mit gleichem Inhalt liegen
+  (Größe, danach BLAKE2-Hash)
+- überschreibt keine abweichenden Dateien gleichen Namens (Konflikt)
+
+Fehlende Dateien und Konflikte stehen in photo_transfer_report.csv
+    status;reference;rows;source;target
+Zeilennummern beziehen sich auf die Import-CSV (Kopfzeile = Zeile 1); bei
+mehreren Import-CSVs (aufgeteilt nach Datentypen) steht der Dateiname davor.
+"""
+
+import csv
+import hashlib
+import os
+import re
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .conversion_progress import STAGE_PHOTOS, ConversionCancelled, ProgressReporter
+    from .csv_io import read_export
+except ImportError:  # Aufruf als Skript (CLI)
+    from conversion_progress import STAGE_PHOTOS, ConversionCancelled, ProgressReporter
+    from csv_io import read_export
+
+PHOTO_REPORT_FILENAME = "photo_transfer_report.csv"
+
+# Fotospalten der Import-CSV (ohne *_comment)
+PHOTO_COLUMN_RE = re.compile(r"^doc_\d+$")
+
+# Mehrere Dateien in einem Feld: Semikolon, senkrechter Strich, Zeilenumbruch.
+# Kommas kommen auch in Dateinamen vor ("Baum 12, Nord.jpg") – an ihnen wird
+# nur geteilt, wenn es den ganzen Verweis nicht, alle Teile aber als Datei gibt
+PHOTO_SEPARATOR_RE = re.compile(r"\s*[;|\r\n]\s*")
+PHOTO_COMMA_RE = re.compile(r"\s*,\s*")
+
+MODE_COPY = "copy"
+MODE_LINK = "link"
+
+DEFAULT_WORKERS = 8
+HASH_CHUNK_SIZE = 1 << 20
+
+# Höchstens so viele Zeilennummern je Eintrag im Bericht auflisten
+MAX_REPORTED_ROWS = 20
+
+# Ergebnis je Zieldatei
+COPIED = "copied"
+LINKED = "linked"
+SKIPPED = "skipped"
+MISSING = "missing"
+CONFLICT = "conflict"
+
+
+class PhotoTransferCancelled(ConversionCancelled):
+    """
+    Fotoübertragung abgebrochen; transferred Dateien liegen bereits im
+    Zielordner (sie werden nicht wieder entfernt).
+    """
+
+    def __init__(self, transferred: int):
+        super().__init__(f"Fotoübertragung abgebrochen – {transferred} Dateien bereits übertragen.")
+        self.transferred = transferred
+
+
+def split_photo_references(value: str, source_dir: Optional[str] = None) -> List[str]:
+    """
+    Fotoverweise eines Felds. Ohne source_dir wird an Kommas nicht geteilt.
+    """
+    references = []
+    for reference in PHOTO_SEPARATOR_RE.split(value.strip()):
+        if not reference:
+            continue
+        if "," in reference and source_dir is not None and _resolve_source(reference, source_dir) is None:
+            parts = [part for part in PHOTO_COMMA_RE.split(reference) if part]
+            if len(parts) > 1 and all(_resolve_source(part, source_dir) for part in parts):
+                references.extend(parts)
+                continue
+        references.append(reference)
+    return references
+
+
+def collect_photo_references(csv_path: str, source_dir: Optional[str] = None) -> Dict[str, List[int]]:
+    """
+    Fotoverweis → Zeilennummern der Import-CSV.
+    source_dir – Ordner der Originalfotos; nur damit werden durch Kommas
+                 getrennte Verweise erkannt (split_photo_references)
+    """
+    references: Dict[str, List[int]] = {}
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        fieldnames, rows = read_export(f)
+        columns = [i for i, name in enumerate(fieldnames) if PHOTO_COLUMN_RE.match(name.strip())]
+        if not columns:
+            return references
+
+        for row_index, row in enumerate(rows):
+            for i in columns:
+                val = row[i].strip()
+                if not val:
+                    continue
+                for reference in split_photo_references(val, source_dir):
+                    references.setdefault(reference, []).append(row_index + 2)
+    return references
+
+
+def _relative_target(reference: str) -> str:
+    """
+    Pfad im Zielordner: relative Pfade bleiben erhalten (ohne ".."),
+    absolute Pfade werden auf den Dateinamen reduziert.
+    """
+    normalized = reference.replace("\\", "/")
+    if os.path.isabs(normalized) or re.match(r"^[A-Za-z]:/", normalized):
+        return os.path.basename(normalized)
+    parts = [p for p in normalized.split("/") if p not in ("", ".", "..")]
+    return os.path.join(*parts) if parts else ""
+
+
+def _resolve_source(reference: str, source_dir: str) -> Optional[str]:
+    """
+    Quelldatei suchen: absoluter Pfad, relativ zum Quellordner, sonst nur der
+    Dateiname im Quellordner.
+    """
+    normalized = reference.replace("\\", "/")
+    candidates = []
+    if os.path.isabs(normalized):
+        candidates.append(normalized)
+    candidates.append(os.path.join(source_dir, _relative_target(reference)))
+    candidates.append(os.path.join(source_dir, os.path.basename(normalized)))
+
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def file_digest(path: str) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def _same_content(a: str, b: str) -> bool:
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    if os.path.samefile(a, b):
+        return True
+    return file_digest(a) == file_digest(b)
+
+
+def _transfer(sources: List[str], target: str, mode: str) -> List[Tuple[str, str]]:
+    """
+    Überträgt die Quelldateien für eine Zieldatei. Die erste Quelle wird
+    übertragen, weitere nur verglichen (gleicher Inhalt → übersprungen).
+    Liefert (Quelle, Ergebnis) je Quelle.
+    """
+    results = []
+    for source in sources:
+        if os.path.exists(target):
+            results.append((source, SKIPPED if _same_content(source, target) else CONFLICT))
+            continue
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if mode == MODE_LINK:
+            try:
+                os.link(source, target)
+                results.append((source, LINKED))
+                continue
+            except OSError:
+                pass  # anderes Laufwerk o. Ä. → kopieren
+
+        # Erst vollständig kopieren, dann umbenennen – keine halben Fotos im Ziel
+        part = target + ".part"
+        try:
+            shutil.copy2(source, part)
+            os.replace(part, target)
+        except BaseException:
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+        results.append((source, COPIED))
+    return results
+
+
+def transfer_photos(csv_path: Union[str, Sequence[str]], target_dir: str, source_dir: Optional[str] = None,
+                    mode: str = MODE_COPY, workers: int = DEFAULT_WORKERS,
+                    report_path: Optional[str] = None, progress=None,
+                    progress_every: int = 100, cancel_token=None) -> dict:
+    """
+    Überträgt alle in csv_path verwiesenen Fotos nach target_dir.
+
+    csv_path    – Import-CSV oder Liste von Import-CSVs (dieselbe Datei wird
+                  auch dann nur einmal übertragen)
+    source_dir  – Ordner der Originalfotos (Standard: Ordner der ersten CSV)
+    mode        – "copy" oder "link" (Hardlink, sonst Kopie)
+    report_path – Standard: photo_transfer_report.csv neben der ersten CSV
+
+    Rückgabe: {"references": n, "copied": n, "linked": n, "skipped": n,
+               "missing": n, "conflict": n, "report": Pfad|None}
+    Abbruch über cancel_token: PhotoTransferCancelled mit der Zahl der
+    bereits übertragenen Dateien.
+    """
+    if mode not in (MODE_COPY, MODE_LINK):
+        raise ValueError(f"Unbekannter Übertragungsmodus: {mode}")
+
+    csv_paths = [csv_path] if isinstance(csv_path, str) else list(csv_path)
+    if not csv_paths:
+        raise ValueError("Keine Import-CSV für die Fotoübertragung angegeben.")
+    source_dir = source_dir or os.path.dirname(os.path.abspath(csv_paths[0]))
+    report_path = report_path or os.path.join(os.path.dirname(csv_paths[0]), PHOTO_REPORT_FILENAME)
+    os.makedirs(target_dir, exist_ok=True)
+
+    references = {}
+    for path in csv_paths:
+        for reference, rows in collect_photo_references(path, source_dir).items():
+            if len(csv_paths) > 1:
+                rows = [f"{os.path.basename(path)}:{row}" for row in rows]
+            references.setdefault(reference, []).extend(rows)
+
+    # Verweise auf Zieldateien verteilen; jede Zieldatei bearbeitet genau ein
+    # Thread, dieselbe Quelldatei wird nur einmal übertragen
+    counts = {COPIED: 0, LINKED: 0, SKIPPED: 0, MISSING: 0, CONFLICT: 0}
+    problems = []
+    by_target: Dict[str, Dict[str, List[str]]] = {}
+    for reference in references:
+        source = _resolve_source(reference, source_dir)
+        relative = _relative_target(reference)
+        if source is None or not relative:
+            counts[MISSING] += 1
+            problems.append((MISSING, reference, "", ""))
+            continue
+        target = os.path.join(target_dir, relative)
+        by_target.setdefault(target, {}).setdefault(os.path.realpath(source), []).append(reference)
+
+    reporter = ProgressReporter(progress, progress_every, cancel_token=cancel_token)
+    reporter.stage(STAGE_PHOTOS, len(by_target))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="treesta-photo") as pool:
+        pending = {
+            pool.submit(_transfer, list(sources), target, mode): (target, sources)
+            for target, sources in by_target.items()
+        }
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    target, sources = pending.pop(future)
+                    for source, result in future.result():
+                        counts[result] += 1
+                        if result == CONFLICT:
+                            for reference in sources[source]:
+                                problems.append((CONFLICT, reference, source, target))
+                    reporter.row()
+        except ConversionCancelled as cancelled:
+            # laufende Übertragungen noch abwarten und mitzählen, damit der
+            # Aufrufer weiß, was schon im Zielordner liegt
+            for future in pending:
+                future.cancel()
+            for future in pending:
+                if not future.cancelled() and future.exception() is None:
+                    for source, result in future.result():
+                        counts[result] += 1
+            raise PhotoTransferCancelled(counts[COPIED] + counts[LINKED]) from cancelled
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    _write_report(report_path, problems, references)
+    reporter.report()
+
+    return {
+        "references": len(references),
+        **counts,
+        "report": report_path if problems else None,
+    }
+
+
+def _write_report(report_path: str, problems, references: Dict[str, List[int]]):
+    """
+    Schreibt fehlende Dateien und Konflikte bzw. entfernt einen veralteten Bericht.
+    """
+    if not problems:
+        if os.path.exists(report_path):
+            os.remove(report_path)
+        return
+
+    with open(report_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";", quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(["status", "reference", "rows", "source", "target"])
+        for status, reference, source, target in sorted(problems):
+            rows = references.get(reference, [])
+            text = ", ".join(str(r) for r in rows[:MAX_REPORTED_ROWS])
+            if len(rows) > MAX_REPORTED_ROWS:
+                text += ", …"
+            writer.writerow([status, reference, text, source, target])
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Fotos aus einer Treesta-Import-CSV in den Fotoordner übertragen")
+    ap.add_argument("import_csv", help="Pfad zur Import-CSV")
+    ap.add_argument("target_dir", help="Treesta-Fotoordner")
+    ap.add_argument("--source_dir", default=None, help="Ordner der Originalfotos (Standard: Ordner der CSV)")
+    ap.add_argument("--link", action="store_true", help="Hardlinks statt Kopien anlegen")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = ap.parse_args()
+
+    stats = transfer_photos(args.import_csv, args.target_dir, args.source_dir,
+                            MODE_LINK if args.link else MODE_COPY, args.workers)
+    print(f"Fotos: {stats['copied']} kopiert, {stats['linked']} verlinkt, "
+          f"{stats['skipped']} bereits vorhanden, {stats['missing']} fehlen, "
+          f"{stats['conflict']} Konflikte")
+    if stats["report"]:
+        print("Hinweise:", stats["report"])
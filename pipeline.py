@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+pipeline – Lesen, Umwandeln und Schreiben überlappend ausführen
+
+Bei großen Exporten (WKT-Geometrien) entfällt der Großteil der Laufzeit auf
+das Parsen und Schreiben von Text. Im Pipeline-Modus laufen die Stufen
+gleichzeitig:
+
+    Lese-Thread → Puffer → Umwandlung (aufrufender Thread) → Puffer → Schreib-Thread
+
+- Zeilen werden in Stapeln zu BATCH_ROWS weitergereicht
+- beide Puffer sind begrenzt (memory_limit_mb); ist ein Puffer voll, wartet
+  die vorgelagerte Stufe – so bleibt der Speicherbedarf unabhängig von der
+  Dateigröße
+- die Reihenfolge der Ausgabe entspricht der Eingabe (je Stufe genau ein
+  Thread, Puffer nach dem FIFO-Prinzip)
+- ein Fehler in einer Stufe beendet alle Stufen und wird im aufrufenden
+  Thread erneut ausgelöst
+"""
+
+import threading
+from collections import deque
+
+BATCH_ROWS = 500
+DEFAULT_MEMORY_LIMIT_MB = 64
+
+# Zeilentupel im Speicher sind deutlich größer als die Zeilen in der Datei
+# (Objekt-Overhead je Wert); Faktor für die Abschätzung der Puffergröße
+MEMORY_PER_INPUT_BYTE = 4
+
+
+class PipelineAborted(Exception):
+    """Interner Abbruch einer Stufe, weil eine andere Stufe fehlgeschlagen ist."""
+
+
+class BoundedBuffer:
+    """
+    FIFO-Puffer zwischen zwei Threads, begrenzt über die geschätzte Größe
+    der Einträge. Ein einzelner Eintrag über der Grenze wird angenommen,
+    wenn der Puffer leer ist (sonst bliebe die Pipeline stehen).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self._items = deque()
+        self._size = 0
+        self._closed = False
+        self._aborted = False
+        self._cond = threading.Condition()
+
+    def put(self, item, size: int):
+        with self._cond:
+            while not self._aborted and self._items and self._size + size > self.max_size:
+                self._cond.wait()
+            if self._aborted:
+                raise PipelineAborted()
+            self._items.append((item, size))
+            self._size += size
+            self._cond.notify_all()
+
+    def get(self):
+        """
+        Nächster Eintrag oder None, wenn der Erzeuger fertig ist.
+        """
+        with self._cond:
+            while not self._items and not self._closed and not self._aborted:
+                self._cond.wait()
+            if self._aborted:
+                raise PipelineAborted()
+            if not self._items:
+                return None
+            item, size = self._items.popleft()
+            self._size -= size
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self):
+        with self._cond:
+            self._aborted = True
+            self._items.clear()
+            self._size = 0
+            self._cond.notify_all()
+
+
+def read_batches(rows, source, batch_rows: int = BATCH_ROWS):
+    """
+    Zeilen einer ExportSource in Stapeln.
+    Liefert (Zeilen, Bytes des Stapels in der Datei, Dateiposition danach).
+    """
+    batch = []
+    start = source.bytes_read
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            position = source.bytes_read
+            yield batch, position - start, position
+            batch = []
+            start = position
+    if batch:
+        yield batch, source.bytes_read - start, source.bytes_read
+
+
+class Pipeline:
+    """
+    Lese- und Schreib-Thread um die Umwandlung im aufrufenden Thread.
+
+        with Pipeline(read_batches(rows, source), output.writerows) as pipe:
+            for batch, size, position in pipe.batches():
+                pipe.emit([convert(row) for row in batch], size)
+            pipe.finish()
+
+    batches     – Iterator über (Zeilen, Bytes, Position); läuft im Lese-Thread
+    write_batch – Funktion(Zeilen); läuft im Schreib-Thread
+    """
+
+    def __init__(self, batches, write_batch, memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB):
+        budget = int(memory_limit_mb * 1024 * 1024 / MEMORY_PER_INPUT_BYTE) // 2
+        self._input = BoundedBuffer(budget)
+        self._output = BoundedBuffer(budget)
+        self._error = None
+        # übergebene / geschriebene Stapel (für drain)
+        self._emitted = 0
+        self._written = 0
+        self._written_cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._read, args=(batches,), name="treesta-reader", daemon=True),
+            threading.Thread(target=self._write, args=(write_batch,), name="treesta-writer", daemon=True),
+        ]
+
+    def __enter__(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._input.abort()
+            self._output.abort()
+        for thread in self._threads:
+            thread.join()
+        return False
+
+    def _fail(self, error):
+        if self._error is None:
+            self._error = error
+        self._input.abort()
+        self._output.abort()
+        with self._written_cond:
+            self._written_cond.notify_all()
+
+    def _raise(self):
+        raise self._error or RuntimeError("Pipeline abgebrochen.")
+
+    def _read(self, batches):
+        try:
+            for batch, size, position in batches:
+                self._input.put((batch, size, position), size)
+            self._input.close()
+        except PipelineAborted:
+            pass
+        except BaseException as error:
+            self._fail(error)
+
+    def _write(self, write_batch):
+        try:
+            while True:
+                rows = self._output.get()
+                if rows is None:
+                    return
+                write_batch(rows)
+                with self._written_cond:
+                    self._written += 1
+                    self._written_cond.notify_all()
+        except PipelineAborted:
+            pass
+        except BaseException as error:
+            self._fail(error)
+
+    def batches(self):
+        """
+        Eingelesene Stapel in Dateireihenfolge.
+        """
+        while True:
+            try:
+                item = self._input.get()
+            except PipelineAborted:
+                self._raise()
+            if item is None:
+                return
+            yield item
+
+    def emit(self, rows, size: int):
+        """
+        Umgewandelte Zeilen an den Schreib-Thread übergeben (size wie beim
+        zugehörigen Eingabestapel).
+        """
+        try:
+            self._output.put(rows, size)
+        except PipelineAborted:
+            self._raise()
+        self._emitted += 1
+
+    def drain(self):
+        """
+        Warten, bis der Schreib-Thread alle übergebenen Stapel geschrieben hat
+        (z. B. vor einem Checkpoint). Die Pipeline läuft danach weiter.
+        """
+        with self._written_cond:
+            while self._written < self._emitted and self._error is None:
+                self._written_cond.wait()
+        if self._error is not None:
+            raise self._error
+
+    def finish(self):
+        """
+        Auf den Schreib-Thread warten und dessen Fehler weitergeben.
+        """
+        self._output.close()
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+profiles – Register der Export-Profile und Erkennung über die Kopfzeile
+
+Jedes Profil (Baumkataster 3, Baumkataster 4, weitere Kataster-Programme)
+beschreibt:
+
+- Converter-Modul und Endung der Mapping-Dateien
+  (fields_mapping_baumkataster_<suffix>.csv, value_mapping_…)
+- Signaturspalten: Spaltennamen, die nur in Exporten dieses Profils vorkommen
+- Signaturpräfixe: Namensanfänge bis einschließlich des ersten "_"
+  (z. B. "Kontrollen_" bei BK3)
+
+Beim Registrieren werden alle Signaturen in einen gemeinsamen Index
+eingetragen (normalisierter Spaltenname → Profile). Die Erkennung läuft
+einmal über die Kopfzeile und schlägt je Spalte zwei Schlüssel im Index nach
+(ganzer Name, Präfix) – die Laufzeit hängt nicht von der Zahl der Profile ab.
+Ein gefundenes Signaturpräfix entscheidet vor allen Spaltennamen (wie
+bisher: "Kontrollen_" heißt Baumkataster 3, auch wenn einzelne Spalten wie
+in BK4 heißen). Sonst wird der Anteil der gefundenen Signaturen eines
+Profils bewertet; bei Gleichstand gewinnt das zuerst registrierte Profil.
+Passt keine Signatur, bricht die Erkennung mit UnknownProfile ab.
+
+Converter-Module und Mapping-Dateien werden erst geladen, wenn ein Profil
+gewählt ist (converter_manager._load_converter).
+"""
+
+import csv
+import os
+from collections import namedtuple
+from typing import Iterable, Optional
+
+Profile = namedtuple("Profile", "name label module mapping_suffix signature prefixes")
+
+ProfileMatch = namedtuple("ProfileMatch", "profile score matched prefixes")
+
+
+class UnknownProfile(ValueError):
+    """Profil ist nicht registriert."""
+
+
+def normalize_column(name: str) -> str:
+    return name.strip().lstrip("\ufeff").casefold()
+
+
+def _prefix_of(name: str) -> Optional[str]:
+    cut = name.find("_")
+    return name[:cut + 1] if cut > 0 else None
+
+
+class ProfileRegistry:
+    """
+    Register der Profile mit Index der Signaturspalten.
+
+    default – Profil, wenn keine Signatur passt (None: UnknownProfile)
+    """
+
+    def __init__(self, default: Optional[str] = None):
+        self.default = default
+        self._profiles = {}
+        self._columns = {}
+        self._prefixes = {}
+
+    def register(self, profile: Profile) -> Profile:
+        if profile.name in self._profiles:
+            raise ValueError(f"Profil bereits registriert: {profile.name}")
+        for column in profile.signature:
+            self._columns.setdefault(normalize_column(column), []).append(profile.name)
+        for prefix in profile.prefixes:
+            prefix = normalize_column(prefix)
+            if _prefix_of(prefix) != prefix:
+                raise ValueError(f"Signaturpräfix muss mit dem ersten '_' enden: {prefix}")
+            self._prefixes.setdefault(prefix, []).append(profile.name)
+        self._profiles[profile.name] = profile
+        return profile
+
+    def get(self, name: str) -> Profile:
+        try:
+            return self._profiles[name]
+        except KeyError:
+            raise UnknownProfile(f"Unbekanntes Profil: {name}") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._profiles
+
+    def names(self):
+        return list(self._profiles)
+
+    def label(self, name: str) -> str:
+        profile = self._profiles.get(name)
+        return profile.label if profile else f"Unbekannt/extern ({name})"
+
+    def score(self, headers: Iterable[str]):
+        """
+        Alle Profile mit mindestens einer gefundenen Signatur, bestes zuerst:
+        Profile mit gefundenem Signaturpräfix vor allen anderen, dann nach
+        Anteil der gefundenen Signaturen.
+        """
+        found = {}
+        found_prefixes = {}
+        for header in headers:
+            column = normalize_column(header)
+            for name in self._columns.get(column, ()):
+                found.setdefault(name, set()).add(column)
+            prefix = _prefix_of(column)
+            if prefix is not None:
+                for name in self._prefixes.get(prefix, ()):
+                    found_prefixes.setdefault(name, set()).add(prefix)
+
+        order = {name: i for i, name in enumerate(self._profiles)}
+        matches = []
+        for name in found.keys() | found_prefixes.keys():
+            profile = self._profiles[name]
+            total = len(profile.signature) + len(profile.prefixes)
+            prefixes = len(found_prefixes.get(name, ()))
+            matched = len(found.get(name, ())) + prefixes
+            matches.append(ProfileMatch(profile, matched / total, matched, prefixes))
+        matches.sort(key=lambda m: (-m.prefixes, -m.score, order[m.profile.name]))
+        return matches
+
+    def detect(self, headers: Iterable[str]) -> Profile:
+        """
+        Bestes Profil nach score(). Passt keine Signatur, wird das
+        Standardprofil mit einem Hinweis verwendet bzw. UnknownProfile
+        ausgelöst, wenn keines festgelegt ist.
+        """
+        matches = self.score(headers)
+        if matches:
+            return matches[0].profile
+        if self.default is None:
+            expected = "; ".join(
+                f"{profile.label}: " + ", ".join((*(f"{p}…" for p in profile.prefixes), *profile.signature[:3]))
+                for profile in self._profiles.values()
+            )
+            raise UnknownProfile(
+                "Das Quellprogramm wurde an der Kopfzeile nicht erkannt – keine der "
+                f"typischen Spalten gefunden (z. B. {expected})."
+            )
+        profile = self.get(self.default)
+        print(f"Hinweis: Kein Profil anhand der Kopfzeile erkannt – verwende {profile.label}.")
+        return profile
+
+    def detect_file(self, input_csv_path: str, encoding: str = "utf-8-sig",
+                    delimiter: str = ";") -> Profile:
+        with open(input_csv_path, encoding=encoding, newline="") as f:
+            headers = next(csv.reader(f, delimiter=delimiter, quotechar='"'), [])
+        return self.detect(headers)
+
+    def mapping_paths(self, name: str, plugin_dir: str):
+        """
+        Feldmapping, Wertmapping und Artentabelle des Profils.
+        """
+        suffix = self.get(name).mapping_suffix
+        return (
+            os.path.join(plugin_dir, f"fields_mapping_baumkataster_{suffix}.csv"),
+            os.path.join(plugin_dir, f"value_mapping_baumkataster_{suffix}.csv"),
+            os.path.join(plugin_dir, "species_table.csv"),
+        )
+
+
+PROFILES = ProfileRegistry()
+
+PROFILES.register(Profile(
+    name="baumkataster_3",
+    label="Baumkataster 3",
+    module=".converter_bk3",
+    mapping_suffix="bk3",
+    signature=(
+        "Kontrollen_zustand", "Kontrollen_vitalitaet",
+        "Kontrollen_massnahme1", "Kontrollen_dringlichkeit1",
+        "Kontrollen_massnahme2", "Kontrollen_dringlichkeit2",
+        "grunflache", "struktur_krone1",
+    ),
+    prefixes=("Kontrollen_",),
+))
+
+PROFILES.register(Profile(
+    name="baumkataster_4",
+    label="Baumkataster 4",
+    module=".converter_bk4",
+    mapping_suffix="bk4",
+    signature=(
+        "gruenflaeche", "laufnummer", "stu",
+        "massnahme_hoch", "massnahme_normal", "massnahme_niedrig",
+        "schaden_krone", "schaden_stamm", "lebenserwartung",
+        "verkehrssicherheit", "schaden_stammfuss_wurzelanlauf",
+    ),
+    prefixes=(),
+))
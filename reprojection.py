@@ -0,0 +1,494 @@
+# -*- coding: utf-8 -*-
+"""
+reprojection – WKT-Geometrien stapelweise in ein anderes Koordinatensystem
+
+BK-Exporte liegen meist in Gauß-Krüger (DHDN) oder ETRS89/UTM vor, Treesta
+erwartet EPSG:4326. Statt eines zusätzlichen Umprojektionsschritts in QGIS
+kann der Converter die Geometriespalte selbst umrechnen:
+
+- die WKT-Texte eines Stapels werden in Text und Zahlen zerlegt (wkt.py),
+  alle Koordinaten des Stapels landen in zwei Arrays
+- die Arrays werden in einem Schritt umgerechnet; mit NumPy (in QGIS
+  enthalten) vektorisiert, sonst Punkt für Punkt mit denselben Formeln
+- die Zahlen werden mit fester Nachkommastellenzahl zurückgeschrieben
+  (Standard: 7 bei Grad ≈ 1 cm, 3 bei Metern)
+
+Rechenweg:
+- Transversale Mercator-Abbildung (Gauß-Krüger, UTM) nach Krüger mit Reihen
+  bis n⁶ (Karney 2011) – Fehler im Nanometerbereich
+- Datumsübergang DHDN → ETRS89/WGS84 über eine 7-Parameter-Helmert-
+  Transformation (EPSG:1777, Deutschland gesamt, Genauigkeit etwa 1–3 m;
+  für Zentimetergenauigkeit ist das BeTA2007-Gitter in QGIS zu verwenden);
+  die Gegenrichtung nach DHDN mit umgekehrten Parametern (±1 cm)
+- ETRS89 und WGS84 werden gleichgesetzt (EPSG:1149, Abweichung < 1 m)
+
+Die Höhe (Z) bleibt unverändert; für die Helmert-Transformation wird die
+Ellipsoidhöhe 0 angenommen (Lagefehler dadurch im Millimeterbereich).
+
+Nicht lesbare Geometrien und Werte mit einem anderen SRID als dem
+Quellsystem werden nicht umgerechnet. Sie werden gezählt und mit
+Zeilennummern in reprojection_report.csv aufgeführt (Aufbau wie
+validation_report.csv); im strengen Modus bricht die Umwandlung beim ersten
+solchen Wert mit ReprojectionError ab, statt eine Datei mit gemischten
+Koordinatensystemen zu schreiben.
+
+Durchsatz (ein Kern): mit NumPy etwa 0,25 Mio. Punkte/s bei Polygonen und
+0,15 Mio. bei Einzelpunkten, ohne NumPy etwa 0,06 Mio. Punkte/s. Die Zeit geht vor allem in das Zerlegen und
+Zurückschreiben der WKT-Texte, nicht in die Rechnung.
+"""
+
+import cmath
+import math
+import re
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+from typing import Iterable, List, Optional
+
+try:
+    import numpy
+except ImportError:  # ohne NumPy: gleiche Formeln je Punkt
+    numpy = None
+
+try:
+    from .validation import RowValidator
+    from .wkt import coordinate_dims, geometry_type, split_srid, split_wkt
+except ImportError:  # Aufruf als Skript (CLI)
+    from validation import RowValidator
+    from wkt import coordinate_dims, geometry_type, split_srid, split_wkt
+
+DEFAULT_TARGET_EPSG = 4326
+
+# Nachkommastellen, wenn keine Genauigkeit vorgegeben ist
+GEOGRAPHIC_PRECISION = 7
+PROJECTED_PRECISION = 3
+
+# WKT-Text je Rechenschritt (begrenzt die Größe der Arrays)
+CHUNK_CHARS = 8 << 20
+
+REPROJECTION_REPORT_FILENAME = "reprojection_report.csv"
+
+# Befunde im Bericht (Spalte "wkt")
+NOT_READABLE = ("geometrie", "nicht lesbar – unverändert übernommen")
+OTHER_SRID = ("srid", "anderes Koordinatensystem als die Quelle – unverändert übernommen")
+
+# Trennzeichen zwischen den WKT-Texten eines Blocks (kommt in WKT nicht vor)
+_SEPARATOR = "\x00"
+_EWKT = re.compile(r"SRID=", re.IGNORECASE)
+# Geometrietypen, die als WKT gelten (geometry_type liefert jedes erste Wort)
+_WKT_TYPES = frozenset((
+    "POINT", "LINESTRING", "POLYGON", "MULTIPOINT", "MULTILINESTRING", "MULTIPOLYGON",
+    "GEOMETRYCOLLECTION", "CIRCULARSTRING", "COMPOUNDCURVE", "CURVEPOLYGON",
+    "MULTICURVE", "MULTISURFACE", "TRIANGLE", "TIN", "POLYHEDRALSURFACE",
+))
+
+Ellipsoid = namedtuple("Ellipsoid", "a f")
+
+BESSEL_1841 = Ellipsoid(6377397.155, 1 / 299.1528128)
+GRS_1980 = Ellipsoid(6378137.0, 1 / 298.257222101)
+WGS_84 = Ellipsoid(6378137.0, 1 / 298.257223563)
+
+# Helmert-Parameter zum WGS84 (Position Vector): tx, ty, tz [m],
+# rx, ry, rz [Bogensekunden], Maßstab [ppm]; None = WGS84 gleichwertig
+DATUMS = {
+    "DHDN": (598.1, 73.7, 418.2, 0.202, 0.045, -2.455, 6.7),
+    "ETRS89": None,
+    "WGS84": None,
+}
+
+# projection: (Mittelmeridian [Grad], Maßstab, False Easting, False Northing)
+CRS = namedtuple("CRS", "epsg name datum ellipsoid projection")
+
+_CRS_LIST = [
+    CRS(4326, "WGS 84", "WGS84", WGS_84, None),
+    CRS(4258, "ETRS89", "ETRS89", GRS_1980, None),
+    CRS(25832, "ETRS89 / UTM zone 32N", "ETRS89", GRS_1980, (9.0, 0.9996, 500000.0, 0.0)),
+    CRS(25833, "ETRS89 / UTM zone 33N", "ETRS89", GRS_1980, (15.0, 0.9996, 500000.0, 0.0)),
+    CRS(4647, "ETRS89 / UTM zone 32N (zE-N)", "ETRS89", GRS_1980, (9.0, 0.9996, 32500000.0, 0.0)),
+    CRS(5650, "ETRS89 / UTM zone 33N (zE-N)", "ETRS89", GRS_1980, (15.0, 0.9996, 33500000.0, 0.0)),
+    CRS(32632, "WGS 84 / UTM zone 32N", "WGS84", WGS_84, (9.0, 0.9996, 500000.0, 0.0)),
+    CRS(32633, "WGS 84 / UTM zone 33N", "WGS84", WGS_84, (15.0, 0.9996, 500000.0, 0.0)),
+]
+for _zone in (2, 3, 4, 5):
+    _CRS_LIST.append(CRS(31464 + _zone, f"DHDN / 3-degree Gauss-Kruger zone {_zone}", "DHDN",
+                         BESSEL_1841, (3.0 * _zone, 1.0, _zone * 1000000.0 + 500000.0, 0.0)))
+
+SUPPORTED_CRS = {crs.epsg: crs for crs in _CRS_LIST}
+
+_MATH = SimpleNamespace(
+    sin=math.sin, cos=math.cos, sinh=math.sinh, cosh=math.cosh, asinh=math.asinh,
+    atan=math.atan, atan2=math.atan2, asin=math.asin, hypot=math.hypot, sqrt=math.sqrt,
+    csin=cmath.sin, ccos=cmath.cos,
+)
+if numpy is not None:
+    _NUMPY = SimpleNamespace(
+        sin=numpy.sin, cos=numpy.cos, sinh=numpy.sinh, cosh=numpy.cosh, asinh=numpy.arcsinh,
+        atan=numpy.arctan, atan2=numpy.arctan2, asin=numpy.arcsin, hypot=numpy.hypot,
+        sqrt=numpy.sqrt, csin=numpy.sin, ccos=numpy.cos,
+    )
+
+
+class ReprojectionError(ValueError):
+    """Geometrie nicht umrechenbar (strenger Modus)."""
+
+
+def get_crs(epsg) -> CRS:
+    try:
+        return SUPPORTED_CRS[int(str(epsg).upper().replace("EPSG:", ""))]
+    except (KeyError, ValueError):
+        codes = ", ".join(f"EPSG:{code}" for code in sorted(SUPPORTED_CRS))
+        raise ValueError(f"Koordinatensystem {epsg} wird nicht unterstützt ({codes})") from None
+
+
+class TransverseMercator:
+    """
+    Gauß-Krüger/UTM nach Krüger (Reihen bis n⁶, komplex mit ζ = ξ + iη).
+    Die Methoden arbeiten mit Zahlen (m = _MATH) und mit NumPy-Arrays
+    (m = _NUMPY).
+    """
+
+    def __init__(self, ellipsoid: Ellipsoid, lon0: float, k0: float,
+                 false_easting: float, false_northing: float):
+        f = ellipsoid.f
+        n = f / (2 - f)
+        n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+        self.e = math.sqrt(f * (2 - f))
+        self.lon0 = math.radians(lon0)
+        self.k0A = k0 * ellipsoid.a / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+        self.x0 = false_easting
+        self.y0 = false_northing
+        self.alpha = (
+            n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+            13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+            61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+            49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+            34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+            212378941 * n6 / 319334400,
+        )
+        self.beta = (
+            n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+            n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+            17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+            4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+            4583 * n5 / 161280 - 108847 * n6 / 3991680,
+            20648693 * n6 / 638668800,
+        )
+        self.delta = (
+            2 * n - 2 * n2 / 3 - 2 * n3 + 116 * n4 / 45 + 26 * n5 / 45 - 2854 * n6 / 675,
+            7 * n2 / 3 - 8 * n3 / 5 - 227 * n4 / 45 + 2704 * n5 / 315 + 2323 * n6 / 945,
+            56 * n3 / 15 - 136 * n4 / 35 - 1262 * n5 / 105 + 73814 * n6 / 2835,
+            4279 * n4 / 630 - 332 * n5 / 35 - 399572 * n6 / 14175,
+            4174 * n5 / 315 - 144838 * n6 / 6237,
+            601676 * n6 / 22275,
+        )
+
+    def inverse(self, m, x, y):
+        """Rechts-/Hochwert → (Länge, Breite) im Bogenmaß."""
+        zeta = (y - self.y0) / self.k0A + 1j * ((x - self.x0) / self.k0A)
+        zeta = zeta - _sin_series(self.beta, m.csin(2 * zeta), m.ccos(2 * zeta))
+        xi_ = zeta.real
+        eta_ = zeta.imag
+        chi = m.asin(m.sin(xi_) / m.cosh(eta_))
+        lat = chi + _sin_series(self.delta, m.sin(2 * chi), m.cos(2 * chi))
+        lon = self.lon0 + m.atan2(m.sinh(eta_), m.cos(xi_))
+        return lon, lat
+
+    def forward(self, m, lon, lat):
+        """(Länge, Breite) im Bogenmaß → Rechts-/Hochwert."""
+        e = self.e
+        dlon = lon - self.lon0
+        tau = m.sin(lat) / m.cos(lat)
+        sigma = m.sinh(e * _atanh(m, e * tau / m.sqrt(1 + tau * tau)))
+        tau_ = tau * m.sqrt(1 + sigma * sigma) - sigma * m.sqrt(1 + tau * tau)
+        cos_dlon = m.cos(dlon)
+        zeta = m.atan2(tau_, cos_dlon) + 1j * m.asinh(m.sin(dlon) / m.sqrt(tau_ * tau_ + cos_dlon * cos_dlon))
+        zeta = zeta + _sin_series(self.alpha, m.csin(2 * zeta), m.ccos(2 * zeta))
+        return self.x0 + self.k0A * zeta.imag, self.y0 + self.k0A * zeta.real
+
+
+def _sin_series(coefficients, sin2, cos2):
+    """
+    Σ a_j·sin(2jθ) aus sin 2θ und cos 2θ (Clenshaw-Summation; auch komplex).
+    """
+    factor = 2 * cos2
+    b1 = b2 = 0
+    for a in reversed(coefficients):
+        b1, b2 = a + factor * b1 - b2, b1
+    return sin2 * b1
+
+
+def _atanh(m, x):
+    # atanh(x) = asinh(x / sqrt(1 - x²)); NumPy und math gleichermaßen
+    return m.asinh(x / m.sqrt(1 - x * x))
+
+
+def _helmert(m, lon, lat, source: Ellipsoid, target: Ellipsoid, params, sign: int):
+    """
+    Geographische Koordinaten über geozentrische Koordinaten in ein anderes
+    Datum (sign=1: Parameter wie angegeben, -1: umgekehrte Richtung).
+    """
+    tx, ty, tz, rx, ry, rz, ppm = (sign * p for p in params)
+    rx, ry, rz = (math.radians(r / 3600) for r in (rx, ry, rz))
+    scale = 1 + ppm * 1e-6
+
+    e2 = source.f * (2 - source.f)
+    sin_lat = m.sin(lat)
+    cos_lat = m.cos(lat)
+    nu = source.a / m.sqrt(1 - e2 * sin_lat * sin_lat)
+    x = nu * cos_lat * m.cos(lon)
+    y = nu * cos_lat * m.sin(lon)
+    z = nu * (1 - e2) * sin_lat
+
+    x, y, z = (
+        tx + scale * (x - rz * y + ry * z),
+        ty + scale * (rz * x + y - rx * z),
+        tz + scale * (-ry * x + rx * y + z),
+    )
+
+    # geozentrisch → geographisch (Bowring)
+    a = target.a
+    b = a * (1 - target.f)
+    e2 = target.f * (2 - target.f)
+    ep2 = (a * a - b * b) / (b * b)
+    p = m.hypot(x, y)
+    theta = m.atan2(z * a, p * b)
+    sin_t = m.sin(theta)
+    cos_t = m.cos(theta)
+    lat = m.atan2(z + ep2 * b * sin_t ** 3, p - e2 * a * cos_t ** 3)
+    lon = m.atan2(y, x)
+    return lon, lat
+
+
+class CoordinateTransform:
+    """
+    Umrechnung zwischen zwei unterstützten Koordinatensystemen.
+    Geographische Koordinaten in Grad, Reihenfolge Länge/Breite (x/y wie in WKT).
+    """
+
+    def __init__(self, source_epsg, target_epsg=DEFAULT_TARGET_EPSG):
+        self.source = get_crs(source_epsg)
+        self.target = get_crs(target_epsg)
+        self._source_tm = TransverseMercator(self.source.ellipsoid, *self.source.projection) \
+            if self.source.projection else None
+        self._target_tm = TransverseMercator(self.target.ellipsoid, *self.target.projection) \
+            if self.target.projection else None
+
+    def _apply(self, m, x, y):
+        if self._source_tm is not None:
+            lon, lat = self._source_tm.inverse(m, x, y)
+        else:
+            lon, lat = x * (math.pi / 180), y * (math.pi / 180)
+
+        source_params = DATUMS[self.source.datum]
+        target_params = DATUMS[self.target.datum]
+        if source_params != target_params:
+            if source_params is not None:
+                lon, lat = _helmert(m, lon, lat, self.source.ellipsoid, WGS_84, source_params, 1)
+            if target_params is not None:
+                lon, lat = _helmert(m, lon, lat, WGS_84, self.target.ellipsoid, target_params, -1)
+
+        if self._target_tm is not None:
+            return self._target_tm.forward(m, lon, lat)
+        return lon * (180 / math.pi), lat * (180 / math.pi)
+
+    def transform(self, xs, ys):
+        """
+        Koordinatenlisten umrechnen; liefert zwei Listen bzw. Arrays.
+        """
+        if numpy is not None:
+            return self._apply(_NUMPY, numpy.asarray(xs, dtype=float), numpy.asarray(ys, dtype=float))
+        out_x = []
+        out_y = []
+        for x, y in zip(xs, ys):
+            x, y = self._apply(_MATH, x, y)
+            out_x.append(x)
+            out_y.append(y)
+        return out_x, out_y
+
+
+class Reprojector:
+    """
+    Geometriespalte einer Umwandlung umprojizieren.
+
+        reprojector = Reprojector(31468)
+        rows = reprojector.apply_rows(rows, wkt_index)
+
+    Nicht lesbare Geometrien und Werte mit anderem SRID bleiben unverändert,
+    werden gezählt (failed) und mit Zeilennummer vermerkt (write_report).
+    strict – stattdessen mit ReprojectionError abbrechen
+    """
+
+    def __init__(self, source_epsg, target_epsg=DEFAULT_TARGET_EPSG, precision: Optional[int] = None,
+                 strict: bool = False):
+        self.transform = CoordinateTransform(source_epsg, target_epsg)
+        if precision is None:
+            precision = PROJECTED_PRECISION if self.transform.target.projection else GEOGRAPHIC_PRECISION
+        self.precision = precision
+        self.strict = strict
+        self._format = f"%.{int(precision)}f"
+        self._srid = f"SRID={self.transform.target.epsg};"
+        self.points = 0
+        self.geometries = 0
+        self.failed = 0
+        self.rows = 0
+        self.problems = RowValidator([])
+        self.elapsed = 0.0
+
+    def settings(self) -> dict:
+        settings = {
+            "source_epsg": self.transform.source.epsg,
+            "target_epsg": self.transform.target.epsg,
+            "precision": self.precision,
+        }
+        if self.strict:
+            settings["strict"] = True
+        return settings
+
+    def _fail(self, row_no: int, problem: tuple, value: str):
+        self.failed += 1
+        self.problems.record(row_no, "wkt", problem, value)
+        if self.strict:
+            raise ReprojectionError(
+                f"Zeile {row_no}: Geometrie nicht umprojiziert ({problem[1].split(' – ')[0]}): "
+                f"{value[:80]}"
+            )
+
+    def reproject_values(self, values: Iterable[str]) -> List[str]:
+        """
+        WKT-Texte umprojizieren (Reihenfolge bleibt erhalten). Die Werte
+        folgen auf die bisher bearbeiteten Zeilen (Zeilennummern im Bericht).
+        """
+        started = time.perf_counter()
+        result = []
+        chunk = []
+        chars = 0
+        # Zeilennummer des ersten Werts im Block (Kopfzeile = 1)
+        first_row = self.rows + 2
+        for value in values:
+            chunk.append(value)
+            chars += len(value)
+            if chars >= CHUNK_CHARS:
+                result.extend(self._reproject_chunk(chunk, first_row))
+                first_row += len(chunk)
+                chunk = []
+                chars = 0
+        if chunk:
+            result.extend(self._reproject_chunk(chunk, first_row))
+        self.rows += len(result)
+        self.elapsed += time.perf_counter() - started
+        return result
+
+    def _reproject_chunk(self, values: List[str], first_row: int) -> List[str]:
+        """
+        Alle Texte eines Blocks verbunden in einem Schritt zerlegen, umrechnen
+        und wieder aufteilen. Das setzt reine XY-Koordinaten ohne SRID voraus:
+        zwischen X und Y steht nur Leerraum, zwischen zwei Punkten nie. Passt
+        ein Block nicht dazu (XYZ, EWKT, kein WKT), wird er Text für Text
+        umgerechnet.
+        """
+        text = _SEPARATOR.join(values)
+        tokens = split_wkt(text)
+        if (
+            len(tokens) == 1
+            or text.count(_SEPARATOR) != len(values) - 1
+            or len(tokens) % 4 != 1
+            or "".join(tokens[2::4]).strip()
+            or "" in map(str.strip, tokens[4:-1:4])
+            or _EWKT.search(text)
+            or not all(geometry_type(value) in _WKT_TYPES for value in values if value)
+        ):
+            return self._reproject_each(values, first_row)
+
+        xs = list(map(float, tokens[1::4]))
+        ys = list(map(float, tokens[3::4]))
+        tokens[1::4], tokens[3::4] = self._format_points(xs, ys)
+        self.geometries += len(values) - values.count("")
+        return "".join(tokens).split(_SEPARATOR)
+
+    def _reproject_each(self, values: List[str], first_row: int) -> List[str]:
+        result = list(values)
+        pending = []  # (Index, SRID-Präfix, Tokens, Dimensionen)
+        xs = []
+        ys = []
+        source_epsg = self.transform.source.epsg
+        for position, value in enumerate(values):
+            if not value or not value.strip():
+                continue
+            srid, text = split_srid(value)
+            if srid and int(srid.strip()[5:-1]) != source_epsg:
+                self._fail(first_row + position, OTHER_SRID, value)
+                continue
+            if geometry_type(text) not in _WKT_TYPES:
+                self._fail(first_row + position, NOT_READABLE, value)
+                continue
+            tokens = split_wkt(text)
+            numbers = len(tokens) // 2
+            if not numbers:
+                continue  # EMPTY
+            dims = coordinate_dims(tokens)
+            if dims < 2 or dims > 4 or numbers % dims:
+                self._fail(first_row + position, NOT_READABLE, value)
+                continue
+            xs.extend(map(float, tokens[1::2 * dims]))
+            ys.extend(map(float, tokens[3::2 * dims]))
+            pending.append((position, srid, tokens, dims))
+        if not pending:
+            return result
+
+        out_x, out_y = self._format_points(xs, ys)
+        start = 0
+        for position, srid, tokens, dims in pending:
+            count = len(tokens) // (2 * dims)
+            tokens[1::2 * dims] = out_x[start:start + count]
+            tokens[3::2 * dims] = out_y[start:start + count]
+            start += count
+            result[position] = (self._srid if srid else "") + "".join(tokens)
+        self.geometries += len(pending)
+        return result
+
+    def _format_points(self, xs, ys):
+        out_x, out_y = self.transform.transform(xs, ys)
+        if numpy is not None:
+            out_x, out_y = out_x.tolist(), out_y.tolist()
+        fmt = self._format
+        self.points += len(xs)
+        return [fmt % v for v in out_x], [fmt % v for v in out_y]
+
+    def apply_rows(self, rows: List[tuple], index: int) -> List[tuple]:
+        """
+        Spalte index aller Zeilen umprojizieren; liefert neue Zeilentupel
+        (leere und nicht gesetzte Werte bleiben unverändert).
+        """
+        values = self.reproject_values([row[index] or "" for row in rows])
+        return [
+            row if not row[index] else row[:index] + (value,) + row[index + 1:]
+            for row, value in zip(rows, values)
+        ]
+
+    def summary(self) -> str:
+        rate = self.points / self.elapsed if self.elapsed else 0
+        text = (
+            f"Umprojektion EPSG:{self.transform.source.epsg} → EPSG:{self.transform.target.epsg}: "
+            f"{self.geometries} Geometrien, {self.points} Punkte in {self.elapsed:.2f} s "
+            f"({rate / 1e6:.2f} Mio. Punkte/s, {'NumPy' if numpy is not None else 'ohne NumPy'})"
+        )
+        if self.failed:
+            text += f"; {self.failed} Geometrien nicht umgerechnet ({REPROJECTION_REPORT_FILENAME})"
+        return text
+
+    def to_state(self) -> dict:
+        """
+        Zähler und Befunde als JSON-taugliches dict (Checkpoint).
+        """
+        return {"rows": self.rows, "failed": self.failed, "problems": self.problems.to_state()}
+
+    def load_state(self, state: dict):
+        self.rows = state["rows"]
+        self.failed = state["failed"]
+        self.problems.load_state(state["problems"])
+
+    def write_report(self, output_path: str):
+        """
+        Schreibt reprojection_report.csv bzw. entfernt einen veralteten Bericht.
+        """
+        return self.problems.write_report(output_path)
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+simplification – Flächen- und Plan-Polygone vereinfachen und runden
+
+Digitalisierte Flächen und Pläne haben oft Tausende Stützpunkte mit 15
+Nachkommastellen. Das bläht die Import-CSV auf, überschreitet die
+Feldgrößengrenze des csv-Moduls und verlangsamt das Laden in QGIS.
+
+Der WktSimplifier bearbeitet die Geometriespalte während der Umwandlung:
+
+- Koordinaten werden auf precision Nachkommastellen gerundet (nachfolgende
+  Nullen entfallen), doppelte Punkte entfernt
+- jeder Ring wird mit Douglas-Peucker auf tolerance Meter vereinfacht
+  (bei geographischen Koordinaten in Grad umgerechnet, Länge mit cos φ
+  gestaucht)
+- topologiesicher: Ringe behalten mindestens vier Punkte und eine Fläche,
+  vereinfachte Ringe eines Polygons dürfen sich weder selbst noch
+  gegenseitig schneiden (Prüfung über ein Raster der Segmente). Sonst wird
+  mit halber Toleranz wiederholt und zuletzt das gerundete Original behalten.
+
+Der WKT-Text wird nicht vollständig in Objekte zerlegt: ein regulärer
+Ausdruck findet die Polygone nacheinander, nur die Ringe des aktuellen
+Polygons liegen als Koordinatenlisten vor. Andere Geometrietypen und
+Geometrien mit Z/M bleiben unverändert.
+"""
+
+import math
+import re
+import time
+from typing import Iterable, List, Optional
+
+try:
+    import numpy
+except ImportError:  # ohne NumPy: Abstände Punkt für Punkt
+    numpy = None
+
+try:
+    from .reprojection import DEFAULT_TARGET_EPSG, GEOGRAPHIC_PRECISION, PROJECTED_PRECISION, Reprojector
+except ImportError:  # Aufruf als Skript (CLI)
+    from reprojection import DEFAULT_TARGET_EPSG, GEOGRAPHIC_PRECISION, PROJECTED_PRECISION, Reprojector
+
+POLYGON_TOLERANCE_M = 0.5
+
+METRES_PER_DEGREE = 111320.0
+
+# Ab dieser Abschnittslänge rechnet Douglas-Peucker mit NumPy
+NUMPY_MIN_POINTS = 64
+
+# Wiederholungen mit halbierter Toleranz, bevor ein Polygon unverändert bleibt
+MAX_RETRIES = 3
+
+_POLYGON_TYPE = re.compile(r"\s*(?:SRID=\d+;\s*)?(?:MULTI)?POLYGON\s*\(", re.IGNORECASE)
+_POLYGON = re.compile(r"\((\s*\([^()]*\)(?:\s*,\s*\([^()]*\))*\s*)\)")
+_RING = re.compile(r"\(([^()]*)\)")
+
+
+def _douglas_peucker(points, tolerance: float, kx: float):
+    """
+    Markierung der beibehaltenen Punkte einer offenen Linie (iterativ).
+    kx – Stauchung der x-Werte (cos φ bei Grad)
+    """
+    last = len(points) - 1
+    keep = [False] * len(points)
+    keep[0] = keep[last] = True
+    tolerance2 = tolerance * tolerance
+    if numpy is not None and len(points) >= NUMPY_MIN_POINTS:
+        xs = numpy.array([p[0] for p in points]) * kx
+        ys = numpy.array([p[1] for p in points])
+    stack = [(0, last)]
+    while stack:
+        first, end = stack.pop()
+        if end - first < 2:
+            continue
+        if numpy is not None and end - first >= NUMPY_MIN_POINTS:
+            # Abstände eines Abschnitts auf einmal
+            x1, y1 = xs[first], ys[first]
+            dx = xs[end] - x1
+            dy = ys[end] - y1
+            px = xs[first + 1:end] - x1
+            py = ys[first + 1:end] - y1
+            length2 = dx * dx + dy * dy
+            if length2:
+                d2 = (px * dy - py * dx) ** 2 / length2
+            else:
+                d2 = px * px + py * py
+            i = int(d2.argmax())
+            farthest = first + 1 + i if d2[i] > tolerance2 else -1
+        else:
+            x1, y1 = points[first]
+            x2, y2 = points[end]
+            dx = (x2 - x1) * kx
+            dy = y2 - y1
+            length2 = dx * dx + dy * dy
+            farthest = -1
+            distance2 = tolerance2
+            for i in range(first + 1, end):
+                px = (points[i][0] - x1) * kx
+                py = points[i][1] - y1
+                if length2:
+                    cross = px * dy - py * dx
+                    d2 = cross * cross / length2
+                else:
+                    d2 = px * px + py * py
+                if d2 > distance2:
+                    farthest = i
+                    distance2 = d2
+        if farthest >= 0:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, end))
+    return keep
+
+
+def simplify_ring(ring, tolerance: float, kx: float = 1.0):
+    """
+    Geschlossenen Ring vereinfachen; Teilung am vom Startpunkt entferntesten
+    Punkt, damit Anfang und Ende nicht zusammenfallen.
+    """
+    if len(ring) <= 4 or tolerance <= 0:
+        return ring
+    x0, y0 = ring[0]
+    split = max(range(len(ring)), key=lambda i: ((ring[i][0] - x0) * kx) ** 2 + (ring[i][1] - y0) ** 2)
+    first = _douglas_peucker(ring[:split + 1], tolerance, kx)
+    second = _douglas_peucker(ring[split:], tolerance, kx)
+    keep = first[:-1] + second
+    return [p for p, k in zip(ring, keep) if k]
+
+
+def _area2(ring) -> float:
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:]))
+
+
+def _orientation(ax, ay, bx, by, cx, cy) -> int:
+    value = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (value > 0) - (value < 0)
+
+
+def _on_segment(ax, ay, bx, by, cx, cy) -> bool:
+    return min(ax, bx) <= cx <= max(ax, bx) and min(ay, by) <= cy <= max(ay, by)
+
+
+def _segments_intersect(s, t) -> bool:
+    (ax, ay), (bx, by) = s
+    (cx, cy), (dx, dy) = t
+    o1 = _orientation(ax, ay, bx, by, cx, cy)
+    o2 = _orientation(ax, ay, bx, by, dx, dy)
+    o3 = _orientation(cx, cy, dx, dy, ax, ay)
+    o4 = _orientation(cx, cy, dx, dy, bx, by)
+    if o1 != o2 and o3 != o4:
+        return True
+    return (
+        (o1 == 0 and _on_segment(ax, ay, bx, by, cx, cy))
+        or (o2 == 0 and _on_segment(ax, ay, bx, by, dx, dy))
+        or (o3 == 0 and _on_segment(cx, cy, dx, dy, ax, ay))
+        or (o4 == 0 and _on_segment(cx, cy, dx, dy, bx, by))
+    )
+
+
+def rings_are_simple(rings) -> bool:
+    """
+    True, wenn sich keine Segmente der Ringe schneiden oder berühren
+    (außer benachbarten Segmenten desselben Rings am gemeinsamen Punkt).
+    Segmente werden in ein Raster einsortiert; verglichen werden nur
+    Segmente derselben Zelle.
+    """
+    segments = []
+    boxes = []
+    for ring_no, ring in enumerate(rings):
+        count = len(ring) - 1
+        for i in range(count):
+            (x1, y1), (x2, y2) = ring[i], ring[i + 1]
+            segments.append((ring_no, i, count, ring[i], ring[i + 1]))
+            boxes.append((x1 if x1 < x2 else x2, x2 if x1 < x2 else x1,
+                          y1 if y1 < y2 else y2, y2 if y1 < y2 else y1))
+    if not segments:
+        return True
+
+    min_x = min(box[0] for box in boxes)
+    min_y = min(box[2] for box in boxes)
+    # Zellgröße: doppelte mittlere Segmentlänge (wenige Segmente je Zelle)
+    cell = 2 * sum(x_hi - x_lo + y_hi - y_lo for x_lo, x_hi, y_lo, y_hi in boxes) / len(boxes) or 1.0
+
+    grid = {}
+    for index, (x_lo, x_hi, y_lo, y_hi) in enumerate(boxes):
+        gx_hi = int((x_hi - min_x) / cell)
+        gy_lo = int((y_lo - min_y) / cell)
+        gy_hi = int((y_hi - min_y) / cell)
+        for gx in range(int((x_lo - min_x) / cell), gx_hi + 1):
+            for gy in range(gy_lo, gy_hi + 1):
+                members = grid.get((gx, gy))
+                if members is None:
+                    grid[(gx, gy)] = [index]
+                else:
+                    members.append(index)
+
+    checked = set()
+    for members in grid.values():
+        if len(members) < 2:
+            continue
+        for a, first in enumerate(members):
+            ring_a, i, count, p1, p2 = segments[first]
+            ax_lo, ax_hi, ay_lo, ay_hi = boxes[first]
+            for second in members[a + 1:]:
+                # Umgebende Rechtecke überlappen nicht
+                bx_lo, bx_hi, by_lo, by_hi = boxes[second]
+                if ax_hi < bx_lo or bx_hi < ax_lo or ay_hi < by_lo or by_hi < ay_lo:
+                    continue
+                ring_b, j, _, q1, q2 = segments[second]
+                if ring_a == ring_b and (abs(i - j) == 1 or abs(i - j) == count - 1):
+                    continue
+                pair = (first, second)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if _segments_intersect((p1, p2), (q1, q2)):
+                    return False
+    return True
+
+
+class WktSimplifier:
+    """
+    Polygone der Geometriespalte vereinfachen und runden.
+
+        simplifier = WktSimplifier(0.5)
+        rows = simplifier.apply_rows(rows, wkt_index)
+
+    tolerance  – Toleranz in Metern (0: nur runden)
+    precision  – Nachkommastellen (Standard: 7 bei Grad, 3 bei Metern)
+    geographic – Koordinaten in Grad (EPSG:4326); None: am Wertebereich des
+                 ersten Polygons erkennen (|x| ≤ 180 und |y| ≤ 90 → Grad)
+    """
+
+    def __init__(self, tolerance: float = POLYGON_TOLERANCE_M, precision: Optional[int] = None,
+                 geographic: Optional[bool] = None):
+        self.tolerance = float(tolerance)
+        self.precision = None if precision is None else int(precision)
+        self.geographic = None
+        self._settings = {"simplify_tolerance": self.tolerance, "precision": self.precision,
+                          "geographic": geographic}
+        if geographic is not None:
+            self._set_geographic(geographic)
+        self.geometries = 0
+        self.vertices_in = 0
+        self.vertices_out = 0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.unchanged = 0
+        self.elapsed = 0.0
+
+    def settings(self) -> dict:
+        # Vorgaben, nicht das erkannte Ergebnis (Checkpoint-Vergleich)
+        return dict(self._settings)
+
+    def _set_geographic(self, geographic: bool):
+        self.geographic = geographic
+        if self.precision is None:
+            self.precision = GEOGRAPHIC_PRECISION if geographic else PROJECTED_PRECISION
+
+    def _detect_geographic(self, ring_text: str):
+        try:
+            numbers = [abs(float(value)) for value in ring_text.replace(",", " ").split()]
+        except ValueError:
+            return
+        if len(numbers) >= 2:
+            self._set_geographic(max(numbers[0::2]) <= 180 and max(numbers[1::2]) <= 90)
+
+    def _format(self, value: float) -> str:
+        text = ("%.*f" % (self.precision, value)).rstrip("0").rstrip(".")
+        return "0" if text == "-0" else text
+
+    def _parse_ring(self, text: str):
+        first = text.split(",", 1)[0].split()
+        if len(first) != 2:
+            return None
+        numbers = text.replace(",", " ").split()
+        precision = self.precision
+        ring = []
+        previous = None
+        for i in range(0, len(numbers) - 1, 2):
+            point = (round(float(numbers[i]), precision), round(float(numbers[i + 1]), precision))
+            if point != previous:
+                ring.append(point)
+            previous = point
+        return ring
+
+    def _simplify_polygon(self, match) -> str:
+        rings = []
+        ring_texts = _RING.findall(match.group(1))
+        if self.geographic is None and ring_texts:
+            self._detect_geographic(ring_texts[0])
+            if self.geographic is None:
+                return match.group(0)
+        for ring_text in ring_texts:
+            try:
+                ring = self._parse_ring(ring_text)
+            except ValueError:
+                ring = None
+            if ring is None or len(ring) < 4 or ring[0] != ring[-1]:
+                return match.group(0)
+            rings.append(ring)
+        self.vertices_in += sum(len(ring) for ring in rings)
+
+        tolerance = self.tolerance
+        kx = 1.0
+        if self.geographic:
+            tolerance /= METRES_PER_DEGREE
+            kx = math.cos(math.radians(rings[0][0][1]))
+
+        result = rings
+        if tolerance > 0:
+            for _ in range(MAX_RETRIES + 1):
+                candidate = [simplify_ring(ring, tolerance, kx) for ring in rings]
+                if all(len(ring) >= 4 and _area2(ring) for ring in candidate) and rings_are_simple(candidate):
+                    result = candidate
+                    break
+                tolerance /= 2
+            else:
+                self.unchanged += 1
+
+        self.vertices_out += sum(len(ring) for ring in result)
+        fmt = self._format
+        return "(" + ", ".join(
+            "(" + ", ".join(f"{fmt(x)} {fmt(y)}" for x, y in ring) + ")" for ring in result
+        ) + ")"
+
+    def simplify(self, text: str) -> str:
+        """
+        Eine Geometrie bearbeiten; andere Typen als (Multi-)Polygon bleiben
+        unverändert.
+        """
+        if not text or not _POLYGON_TYPE.match(text):
+            return text
+        started = time.perf_counter()
+        result = _POLYGON.sub(self._simplify_polygon, text)
+        self.elapsed += time.perf_counter() - started
+        self.geometries += 1
+        self.chars_in += len(text)
+        self.chars_out += len(result)
+        return result
+
+    def simplify_values(self, values: Iterable[str]) -> List[str]:
+        return [self.simplify(value) for value in values]
+
+    def apply_rows(self, rows: List[tuple], index: int) -> List[tuple]:
+        """
+        Spalte index aller Zeilen bearbeiten; liefert neue Zeilentupel.
+        """
+        result = []
+        for row in rows:
+            value = row[index]
+            simplified = self.simplify(value)
+            result.append(row if simplified is value else row[:index] + (simplified,) + row[index + 1:])
+        return result
+
+    def summary(self) -> str:
+        reduction = 100 * (1 - self.chars_out / self.chars_in) if self.chars_in else 0
+        if self.geographic is None:
+            return f"Vereinfachung ({self.tolerance:g} m): keine Polygone"
+        units = "Grad" if self.geographic else "Metern"
+        text = (
+            f"Vereinfachung ({self.tolerance:g} m, Koordinaten in {units}, "
+            f"{self.precision} Nachkommastellen): "
+            f"{self.geometries} Polygone, Stützpunkte {self.vertices_in} → {self.vertices_out}, "
+            f"WKT {self.chars_in / 1e6:.1f} → {self.chars_out / 1e6:.1f} Mio. Zeichen "
+            f"(−{reduction:.0f} %) in {self.elapsed:.2f} s"
+        )
+        if self.unchanged:
+            text += f"; {self.unchanged} Polygone nur gerundet (Topologie)"
+        return text
+
+
+def geometry_steps(source_epsg=None, target_epsg=DEFAULT_TARGET_EPSG,
+                   coordinate_precision: Optional[int] = None,
+                   simplify_tolerance: Optional[float] = None,
+                   strict_reprojection: bool = False) -> list:
+    """
+    Geometrie-Schritte einer Umwandlung in Reihenfolge: Umprojektion
+    (source_epsg gesetzt; strict_reprojection: Abbruch bei nicht
+    umrechenbaren Geometrien), dann Vereinfachung (simplify_tolerance gesetzt).
+    Jeder Schritt hat apply_rows(rows, index), settings() und summary().
+    Mit Umprojektion bestimmt das Ziel-KBS, ob in Grad oder Metern
+    vereinfacht wird; ohne wird es am Wertebereich der Koordinaten erkannt.
+    """
+    steps = []
+    geographic = None
+    if source_epsg is not None:
+        reprojector = Reprojector(source_epsg, target_epsg, coordinate_precision, strict_reprojection)
+        geographic = not reprojector.transform.target.projection
+        steps.append(reprojector)
+    if simplify_tolerance is not None:
+        steps.append(WktSimplifier(simplify_tolerance, coordinate_precision, geographic))
+    return steps
+
+
+def reprojection_step(steps) -> Optional[Reprojector]:
+    """
+    Umprojektion unter den Geometrie-Schritten (Bericht, Checkpoint) bzw. None.
+    """
+    return next((step for step in steps if isinstance(step, Reprojector)), None)
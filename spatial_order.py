@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+spatial_order – Ausgabezeilen räumlich entlang einer Hilbert-Kurve sortieren
+
+Bäume stehen in den Exporten in beliebiger Reihenfolge. Beim Einfügen in
+tree_data und beim Aufbau räumlicher Indizes springt Treesta dadurch
+ständig zwischen Datenbankseiten. Sortiert nach dem Hilbert-Schlüssel der
+Koordinaten liegen benachbarte Bäume auch in der Datei nebeneinander.
+
+- Schlüssel: erste Koordinate der WKT-Spalte, auf 32 Bit je Achse
+  quantisiert (Grad: ganze Erde, etwa 1 cm; Meter: ±21 474 km in 1 cm)
+  und mit einer Zustandstabelle in 4-Bit-Schritten auf die Kurve abgebildet
+- Zeilen ohne Geometrie kommen ans Ende, gleiche Schlüssel behalten die
+  Reihenfolge der Eingabe
+- im Speicher: list.sort; im Pipeline-Modus externes Sortieren – sortierte
+  Läufe bis memory_limit_mb werden in Zwischendateien geschrieben und beim
+  Schreiben der Import-CSV zusammengeführt (heapq.merge)
+
+Die Reihenfolge gilt für alles, was die Import-CSV weiterverarbeitet
+(QGIS-Import, gpkg_delta).
+"""
+
+import csv
+import heapq
+import os
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+try:
+    from .csv_io import ImportCsvFile, read_export
+    from .pipeline import DEFAULT_MEMORY_LIMIT_MB, MEMORY_PER_INPUT_BYTE
+    from .wkt import first_xy, wkt_column_index
+except ImportError:  # Aufruf als Skript (CLI)
+    from csv_io import ImportCsvFile, read_export
+    from pipeline import DEFAULT_MEMORY_LIMIT_MB, MEMORY_PER_INPUT_BYTE
+    from wkt import first_xy, wkt_column_index
+
+HILBERT_BITS = 32
+
+# Schlüssel als Text fester Länge (Hex), damit Läufe ohne Umwandlung
+# verglichen werden können; Zeilen ohne Geometrie sortieren ans Ende
+KEY_DIGITS = HILBERT_BITS // 2
+NO_KEY = "g" * KEY_DIGITS
+
+_FULL = (1 << HILBERT_BITS) - 1
+_OFFSET = 1 << (HILBERT_BITS - 1)
+
+
+def _hilbert_step(state: int, xb: int, yb: int):
+    """
+    Ein Bit je Achse: (Quadrant 0–3, Folgezustand). Zustand = Spiegeln
+    (Bit 1) und Tauschen (Bit 0) der folgenden Bits.
+    """
+    if state & 2:
+        xb ^= 1
+        yb ^= 1
+    if state & 1:
+        xb, yb = yb, xb
+    quadrant = (3 * xb) ^ yb
+    if yb == 0:
+        state ^= 1
+        if xb == 1:
+            state ^= 2
+    return quadrant, state
+
+
+def _build_table():
+    """
+    Zustand, 4 Bit x, 4 Bit y → (8 Bit Kurvenposition, Folgezustand).
+    """
+    table = []
+    for state in range(4):
+        for x in range(16):
+            for y in range(16):
+                s = state
+                d = 0
+                for bit in range(3, -1, -1):
+                    quadrant, s = _hilbert_step(s, (x >> bit) & 1, (y >> bit) & 1)
+                    d = (d << 2) | quadrant
+                table.append((d, s))
+    return table
+
+
+_TABLE = _build_table()
+
+
+def hilbert_index(x: int, y: int) -> int:
+    """
+    Position von (x, y) auf der Hilbert-Kurve (0 ≤ x, y < 2**HILBERT_BITS).
+    """
+    table = _TABLE
+    state = 0
+    d = 0
+    for shift in range(HILBERT_BITS - 4, -1, -4):
+        d_part, state = table[(state << 8) | (((x >> shift) & 15) << 4) | ((y >> shift) & 15)]
+        d = (d << 8) | d_part
+    return d
+
+
+def _quantize(value: float, low: float, span: float) -> int:
+    q = int((value - low) / span * _FULL)
+    return 0 if q < 0 else _FULL if q > _FULL else q
+
+
+def hilbert_key(wkt: Optional[str]) -> str:
+    """
+    Sortierschlüssel einer Geometrie (Hex-Text fester Länge).
+    """
+    try:
+        point = first_xy(wkt)
+    except ValueError:
+        point = None
+    if point is None:
+        return NO_KEY
+    x, y = point
+    if -180.0 <= x <= 180.0 and -90.0 <= y <= 90.0:
+        qx = _quantize(x, -180.0, 360.0)
+        qy = _quantize(y, -90.0, 180.0)
+    else:
+        # Meter in Zentimetern um den Nullpunkt verschoben
+        qx = min(max(int(x * 100) + _OFFSET, 0), _FULL)
+        qy = min(max(int(y * 100) + _OFFSET, 0), _FULL)
+    return "%0*x" % (KEY_DIGITS, hilbert_index(qx, qy))
+
+
+def sort_rows(rows: List[Sequence], index: int) -> List[Sequence]:
+    """
+    Zeilen im Speicher nach dem Hilbert-Schlüssel der Spalte index sortieren.
+    """
+    rows.sort(key=lambda row: hilbert_key(row[index]))
+    return rows
+
+
+def external_sorted(rows: Iterable[Sequence], index: int, run_prefix: str,
+                    memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB) -> Iterator[list]:
+    """
+    Zeilen in Hilbert-Reihenfolge, ohne alle gleichzeitig im Speicher zu
+    halten: Läufe bis memory_limit_mb werden sortiert nach
+    run_prefix + ".runN" geschrieben und anschließend zusammengeführt.
+    Passt alles in einen Lauf, wird keine Zwischendatei angelegt.
+    Die Zwischendateien werden auch bei einem Abbruch entfernt.
+    """
+    limit = max(1, int(memory_limit_mb * (1 << 20) / MEMORY_PER_INPUT_BYTE))
+    run_paths = []
+    try:
+        run = []
+        size = 0
+        for row in rows:
+            run.append((hilbert_key(row[index]), row))
+            size += sum(len(value) for value in row if value) + len(row)
+            if size >= limit:
+                run_paths.append(_write_run(run, f"{run_prefix}.run{len(run_paths)}"))
+                run = []
+                size = 0
+
+        run.sort(key=lambda item: item[0])
+        if not run_paths:
+            for _, row in run:
+                yield row
+            return
+        if run:
+            run_paths.append(_write_run(run, f"{run_prefix}.run{len(run_paths)}"))
+        run = None
+
+        files = [open(path, encoding="utf-8", newline="") for path in run_paths]
+        try:
+            readers = [csv.reader(f, delimiter=";", quotechar='"') for f in files]
+            for row in heapq.merge(*readers, key=lambda r: r[0]):
+                yield row[1:]
+        finally:
+            for f in files:
+                f.close()
+    finally:
+        for path in run_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _write_run(run, path: str) -> str:
+    run.sort(key=lambda item: item[0])
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";", quotechar='"')
+        writer.writerows([key, *("" if value is None else value for value in row)] for key, row in run)
+    return path
+
+
+def sort_import_csv(path: str, memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB) -> bool:
+    """
+    Eine fertige Import-CSV räumlich sortieren (ersetzt die Datei erst nach
+    fehlerfreiem Durchlauf). False, wenn keine Geometriespalte vorhanden ist.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        fieldnames, _ = read_export(f)
+    index = wkt_column_index(fieldnames)
+    if index is None:
+        return False
+    # Eingabe vor dem Ersetzen schließen (unter Windows sonst gesperrt)
+    with ImportCsvFile(path, fieldnames) as output:
+        with open(path, encoding="utf-8", newline="") as f:
+            _, rows = read_export(f)
+            output.writerows(external_sorted(rows, index, path, memory_limit_mb))
+    return True
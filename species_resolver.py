@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+species_resolver – Baumarten gegen eine indizierte Artentabelle auflösen
+
+Die Artentabelle (species_table.csv, Spalten species;alias) ordnet deutsche
+Namen und Schreibvarianten dem botanischen Namen zu. Beim Laden werden alle
+Namen auf einen gefalteten Schlüssel (Kleinschreibung, Umlaute gefaltet, ohne
+Leer- und Satzzeichen) in einen Hash-Index gelegt.
+
+Auflösung eines Eingabewerts:
+- führende Nummern und Sortenangaben ('Globosum', cv. Globosum) abtrennen
+- ganzer Name → Index (lateinisch oder deutsch, auch aus der Klammer)
+- sonst längstes Wort-Präfix → Art, Rest als Sorte bzw. var./subsp.
+- sonst Gattung + "spec."/"sp." → "<Gattung> spec."
+
+Jeder unterschiedliche Rohwert wird nur einmal aufgelöst (Memo). Nicht
+aufgelöste Werte laufen wie bisher bereinigt durch und werden in
+unresolved_species.txt gemeldet.
+"""
+
+import csv
+import os
+import re
+from typing import Callable, Dict, Optional
+
+SPECIES_TABLE_FILENAME = "species_table.csv"
+UNRESOLVED_SPECIES_FILENAME = "unresolved_species.txt"
+
+UMLAUT_FOLDING = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+LEADING_NUMBER_RE = re.compile(r"^\s*\d+\s*")
+PAREN_RE = re.compile(r"\s*\(([^)]*)\)")
+QUOTED_CULTIVAR_RE = re.compile(r"\s*['‘’\"]([^'‘’\"]+)['‘’\"]")
+CV_CULTIVAR_RE = re.compile(r"\s+cv\.?\s+(.+)$", re.IGNORECASE)
+
+INFRA_RANKS = {"var", "var.", "subsp", "subsp.", "ssp", "ssp.", "f", "f."}
+GENUS_ONLY_MARKERS = {"spec", "spec.", "sp", "sp.", "spp", "spp."}
+
+
+def fold_species_key(val: str) -> str:
+    if not isinstance(val, str):
+        return ""
+    return NON_ALNUM_RE.sub("", val.lower().translate(UMLAUT_FOLDING))
+
+
+def load_species_table(path: str) -> Dict[str, str]:
+    """
+    Lädt species_table.csv und liefert {gefalteter Schlüssel: Artname}.
+    Der Artname selbst wird ebenfalls als Schlüssel eingetragen.
+    """
+    index: Dict[str, str] = {}
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f, delimiter=";")
+        cols = {c.strip().lower(): c for c in (reader.fieldnames or []) if c}
+        if "species" not in cols:
+            raise ValueError(f"species_table: Spalte 'species' nicht gefunden in {path}")
+        species_col = cols["species"]
+        alias_col = cols.get("alias")
+
+        for row in reader:
+            species = (row.get(species_col) or "").strip()
+            if not species:
+                continue
+            index.setdefault(fold_species_key(species), species)
+            alias = (row.get(alias_col) or "").strip() if alias_col else ""
+            if alias:
+                index.setdefault(fold_species_key(alias), species)
+
+    if not index:
+        raise ValueError(f"species_table: keine Einträge geladen aus {path}")
+    return index
+
+
+class SpeciesResolver:
+    """
+    Auflösung mit Memo je Rohwert.
+
+    clean – Bereinigung des jeweiligen Converters (clean_species); wird für
+            nicht aufgelöste Werte verwendet, damit die Ausgabe ohne Tabelle
+            unverändert bleibt.
+    """
+
+    def __init__(self, index: Optional[Dict[str, str]], clean: Callable):
+        self.index = index or {}
+        self.clean = clean
+        self.genera = {
+            fold_species_key(name.split()[0]): name.split()[0]
+            for name in self.index.values()
+        }
+        self.memo: Dict[str, object] = {}
+        self.unresolved = set()
+
+    @classmethod
+    def from_path(cls, path: Optional[str], clean: Callable):
+        if path and os.path.exists(path):
+            return cls(load_species_table(path), clean)
+        return cls(None, clean)
+
+    def fork(self) -> "SpeciesResolver":
+        """
+        Resolver für eine weitere Umwandlung: Index und Gattungen werden
+        geteilt, Memo und nicht aufgelöste Werte sind neu.
+        """
+        resolver = object.__new__(type(self))
+        resolver.index = self.index
+        resolver.clean = self.clean
+        resolver.genera = self.genera
+        resolver.memo = {}
+        resolver.unresolved = set()
+        return resolver
+
+    def resolve(self, value):
+        if not isinstance(value, str) or not self.index:
+            return self.clean(value)
+
+        cached = self.memo.get(value)
+        if cached is not None:
+            return cached
+
+        resolved = self._lookup(value)
+        if resolved is None:
+            resolved = self.clean(value)
+            if resolved:
+                self.unresolved.add(resolved)
+        self.memo[value] = resolved
+        return resolved
+
+    def _lookup(self, value: str) -> Optional[str]:
+        text = LEADING_NUMBER_RE.sub("", value)
+        paren_names = PAREN_RE.findall(text)
+        text = PAREN_RE.sub("", text)
+
+        cultivar = ""
+        m = QUOTED_CULTIVAR_RE.search(text) or CV_CULTIVAR_RE.search(text)
+        if m:
+            cultivar = m.group(1).strip()
+            text = text[:m.start()] + text[m.end():]
+
+        words = text.split()
+        if not words:
+            return None
+
+        # 1. Ganzer Name
+        species = self.index.get(fold_species_key(" ".join(words)))
+        remainder = []
+
+        # 2. Längstes Wort-Präfix (mind. Gattung + Art)
+        if species is None:
+            for n in range(len(words) - 1, 1, -1):
+                species = self.index.get(fold_species_key(" ".join(words[:n])))
+                if species is not None:
+                    remainder = words[n:]
+                    break
+
+        # 3. Name in Klammern, z. B. "Acer spec. (Spitz-Ahorn)"
+        if species is None:
+            for name in paren_names:
+                species = self.index.get(fold_species_key(name))
+                if species is not None:
+                    break
+
+        # 4. Nur Gattung bekannt
+        if species is None:
+            genus = self.genera.get(fold_species_key(words[0]))
+            if genus and (len(words) == 1 or words[1].lower() in GENUS_ONLY_MARKERS):
+                return f"{genus} spec."
+            return None
+
+        if remainder and remainder[0].lower() in INFRA_RANKS:
+            return f"{species} {' '.join(remainder)}"
+        if remainder and not cultivar:
+            cultivar = " ".join(w.capitalize() for w in remainder)
+        if cultivar:
+            return f"{species} '{cultivar}'"
+        return species
+
+
+def write_unresolved_species(output_path: str, unresolved):
+    """
+    Schreibt unresolved_species.txt analog zu unmapped_values.txt bzw.
+    entfernt eine veraltete Datei.
+    """
+    if unresolved:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("Nicht aufgelöste Baumarten (species_table ergänzen):\n")
+            for val in sorted(unresolved):
+                f.write(f"{val}\n")
+    elif os.path.exists(output_path):
+        os.remove(output_path)
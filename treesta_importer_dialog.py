@@ -1,22 +1,53 @@
 # -*- coding: utf-8 -*-
 
-import csv
 import os
 
 from qgis.PyQt import uic
-from qgis.PyQt.QtCore import QUrl
+from qgis.PyQt.QtCore import QCoreApplication, QUrl
 from qgis.PyQt.QtGui import QDesktopServices
 from qgis.PyQt.QtWidgets import (
+    QCheckBox,
     QComboBox,
     QDialog,
+    QDialogButtonBox,
+    QDoubleSpinBox,
     QFileDialog,
     QGroupBox,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
 )
 
-from .converter_manager import smart_convert
+from .conversion_progress import (
+    CancelToken,
+    ConversionCancelled,
+    format_progress,
+    progress_percent,
+)
+from .conversion_preview import SAMPLE
+from .converter_manager import (
+    preview_convert,
+    smart_convert,
+    transfer_photo_files,
+)
+from .data_types import (
+    DATA_TYPES,
+    MIXED_DATA_TYPE,
+    DataTypeRouting,
+    apply_data_type_values,
+    format_routing,
+)
+from .duplicate_trees import DEFAULT_DUPLICATE_DISTANCE_M, DuplicateSearch
+from .photo_transfer import MODE_COPY, MODE_LINK, PhotoTransferCancelled
+from .profiles import PROFILES
+from .reprojection import DEFAULT_TARGET_EPSG, SUPPORTED_CRS
+from .simplification import POLYGON_TOLERANCE_M
 
 
 FORM_CLASS, _ = uic.loadUiType(
@@ -29,35 +60,7 @@ FORM_CLASS, _ = uic.loadUiType(
 
 class TreestaImporterDialog(QDialog, FORM_CLASS):
 
-    DATA_TYPES = (
-        {
-            "key": "permanent_trees",
-            "label": "Permanente Bäume",
-            "output_filename": "bäume-treesta-import.csv",
-            "field_values": {"temp": "0"},
-        },
-        {
-            "key": "temporary_trees",
-            "label": "Temporäre Bäume",
-            "output_filename": "einzelbäume-treesta-import.csv",
-            "field_values": {"temp": "1"},
-        },
-        {
-            "key": "area",
-            "label": "Fläche",
-            "output_filename": "flächen-treesta-import.csv",
-            "field_values": {"documentation": "1"},
-            "field_values": {"atlas": "0"},
-            "field_renames": {"date": "last_modified_date"},
-        },
-        {
-            "key": "plan",
-            "label": "Plan",
-            "output_filename": "pläne-treesta-import.csv",
-            "field_values": {"atlas": "1"},
-            "field_renames": {"date": "last_modified_date"},
-        },
-    )
+    DATA_TYPES = DATA_TYPES + (MIXED_DATA_TYPE,)
 
     def __init__(self, parent=None, plugin_dir=None):
         super().__init__(parent)
@@ -68,6 +71,25 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
         # Auswahl des Datentyps ergänzen
         self._setup_data_type_selection()
 
+        # Optionale Übertragung der Fotodateien ergänzen
+        self._setup_photo_transfer()
+
+        # Optionale Umprojektion der Geometrie ergänzen
+        self._setup_reprojection()
+
+        # Optionale Suche nach doppelten Bäumen ergänzen
+        self._setup_duplicate_check()
+
+        # Optionaler Abgleich mit einem Flächen-Export ergänzen
+        self._setup_area_lookup()
+
+        # Vorschau ergänzen
+        self._setup_preview()
+
+        # Fortschritt und Abbruch ergänzen
+        self._setup_progress()
+        self.cancel_token = None
+
         # UI-Verkabelung
         self.btnBrowse.clicked.connect(self.browse_input)
         self.btnConvert.clicked.connect(self.convert)
@@ -101,9 +123,424 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
 
         data_type_layout.addWidget(self.comboDataType, 1)
 
+        # Messwerte mit Dezimalkomma, Einheit oder Bereich als Zahl schreiben
+        self.checkNormalizeNumbers = QCheckBox("Messwerte als Zahl")
+        self.checkNormalizeNumbers.setToolTip(
+            "Höhe, Kronen- und Stammdurchmesser sowie Stammumfang mit "
+            "Dezimalkomma, Einheit (\"12 m\", \"35cm\") oder als Bereich "
+            "als Zahl in der Treesta-Einheit schreiben; nicht lesbare Werte "
+            "stehen in number_report.csv."
+        )
+        data_type_layout.addWidget(self.checkNormalizeNumbers)
+
         # Direkt unterhalb der Dateiauswahl einfügen
         self.verticalLayout.insertWidget(1, self.groupDataType)
 
+    # --- Fotoübertragung -------------------------------------------------------
+
+    def _setup_photo_transfer(self):
+        """
+        Ergänzt die optionale Übertragung der Fotodateien in den
+        Treesta-Fotoordner. Standardmäßig ausgeschaltet.
+        """
+        self.groupPhotos = QGroupBox("Fotos in den Treesta-Fotoordner übertragen")
+        self.groupPhotos.setCheckable(True)
+        self.groupPhotos.setChecked(False)
+
+        photo_layout = QHBoxLayout(self.groupPhotos)
+
+        self.lineEditPhotoTarget = QLineEdit()
+        self.lineEditPhotoTarget.setPlaceholderText("Fotoordner des Treesta-Projekts")
+        photo_layout.addWidget(self.lineEditPhotoTarget, 1)
+
+        self.btnBrowsePhotoTarget = QPushButton("…")
+        self.btnBrowsePhotoTarget.clicked.connect(self.browse_photo_target)
+        photo_layout.addWidget(self.btnBrowsePhotoTarget)
+
+        self.checkPhotoLink = QCheckBox("Hardlinks statt Kopien")
+        self.checkPhotoLink.setToolTip(
+            "Spart Speicherplatz, wenn Quell- und Fotoordner auf demselben "
+            "Laufwerk liegen. Sonst wird kopiert."
+        )
+        photo_layout.addWidget(self.checkPhotoLink)
+
+        # Unterhalb der Datentyp-Auswahl einfügen
+        self.verticalLayout.insertWidget(2, self.groupPhotos)
+
+    # --- Umprojektion ----------------------------------------------------------
+
+    def _setup_reprojection(self):
+        """
+        Ergänzt die Auswahl des Koordinatensystems der exportierten Geometrie.
+        Standard: keine Umrechnung (Export bereits in EPSG:4326).
+        """
+        self.groupReprojection = QGroupBox("Koordinatensystem")
+        reprojection_layout = QHBoxLayout(self.groupReprojection)
+
+        reprojection_layout.addWidget(QLabel("Geometrie im Export:"))
+
+        self.comboSourceCrs = QComboBox()
+        self.comboSourceCrs.addItem(f"EPSG:{DEFAULT_TARGET_EPSG} – keine Umrechnung", None)
+        for epsg, crs in sorted(SUPPORTED_CRS.items()):
+            if epsg != DEFAULT_TARGET_EPSG:
+                self.comboSourceCrs.addItem(f"EPSG:{epsg} – {crs.name}", epsg)
+        self.comboSourceCrs.setToolTip(
+            "Liegt der Export in Gauß-Krüger oder UTM vor, wird die Geometrie "
+            f"bei der Umwandlung nach EPSG:{DEFAULT_TARGET_EPSG} umgerechnet."
+        )
+        reprojection_layout.addWidget(self.comboSourceCrs, 1)
+
+        # Nicht umrechenbare Geometrien: abbrechen statt unverändert übernehmen
+        self.checkStrictReprojection = QCheckBox("bei Fehlern abbrechen")
+        self.checkStrictReprojection.setToolTip(
+            "Geometrien, die nicht gelesen werden können oder ein anderes "
+            "Koordinatensystem angeben, brechen die Umwandlung ab. Sonst "
+            "werden sie unverändert übernommen und in reprojection_report.csv "
+            "aufgeführt."
+        )
+        reprojection_layout.addWidget(self.checkStrictReprojection)
+
+        # Vereinfachung der Polygone (nur Flächen und Pläne)
+        self.checkSimplify = QCheckBox("Polygone vereinfachen, Toleranz:")
+        self.checkSimplify.setChecked(False)
+        self.checkSimplify.setToolTip(
+            "Stützpunkte von Flächen- und Plan-Polygonen innerhalb der Toleranz "
+            "entfernen und Koordinaten runden (kleinere Import-CSV)."
+        )
+        reprojection_layout.addWidget(self.checkSimplify)
+
+        self.spinSimplifyTolerance = QDoubleSpinBox()
+        self.spinSimplifyTolerance.setRange(0.0, 10.0)
+        self.spinSimplifyTolerance.setSingleStep(0.1)
+        self.spinSimplifyTolerance.setValue(POLYGON_TOLERANCE_M)
+        self.spinSimplifyTolerance.setSuffix(" m")
+        reprojection_layout.addWidget(self.spinSimplifyTolerance)
+
+        # Räumliche Reihenfolge der Ausgabe
+        self.checkSpatialOrder = QCheckBox("räumlich sortieren")
+        self.checkSpatialOrder.setToolTip(
+            "Zeilen der Import-CSV entlang einer Hilbert-Kurve ordnen, damit "
+            "benachbarte Objekte beim Import nebeneinander liegen."
+        )
+        reprojection_layout.addWidget(self.checkSpatialOrder)
+
+        self.comboDataType.currentIndexChanged.connect(self._update_simplify_enabled)
+        self.checkSimplify.toggled.connect(self._update_simplify_enabled)
+        self._update_simplify_enabled()
+
+        # Unterhalb der Fotoübertragung einfügen
+        self.verticalLayout.insertWidget(3, self.groupReprojection)
+
+    def _update_simplify_enabled(self, *args):
+        polygons = bool(self._selected_data_type().get("simplify_polygons"))
+        self.checkSimplify.setEnabled(polygons)
+        self.spinSimplifyTolerance.setEnabled(polygons and self.checkSimplify.isChecked())
+
+    def _simplify_tolerance(self, data_type):
+        """
+        Toleranz der Polygon-Vereinfachung bzw. None (Bäume, ausgeschaltet).
+        """
+        if not data_type.get("simplify_polygons") or not self.checkSimplify.isChecked():
+            return None
+        return self.spinSimplifyTolerance.value()
+
+    def browse_photo_target(self):
+        path = QFileDialog.getExistingDirectory(
+            self,
+            "Treesta-Fotoordner auswählen",
+            self.lineEditPhotoTarget.text().strip()
+        )
+
+        if path:
+            self.lineEditPhotoTarget.setText(path)
+
+    def _transfer_photos(self, out_csv, input_path):
+        """
+        Überträgt die Fotos der erzeugten Import-CSV (bzw. einer Liste von
+        Import-CSVs). Die Originalfotos werden im Ordner der Eingabedatei
+        gesucht.
+        Liefert einen kurzen Statustext.
+        """
+        stats = transfer_photo_files(
+            out_csv,
+            self.lineEditPhotoTarget.text().strip(),
+            source_dir=os.path.dirname(input_path),
+            mode=MODE_LINK if self.checkPhotoLink.isChecked() else MODE_COPY,
+            progress=self._on_progress,
+            cancel_token=self.cancel_token
+        )
+
+        text = (
+            f"Fotos: {stats['copied'] + stats['linked']} übertragen, "
+            f"{stats['skipped']} bereits vorhanden"
+        )
+        if stats["missing"] or stats["conflict"]:
+            text += (
+                f", {stats['missing']} fehlen, {stats['conflict']} Konflikte "
+                f"(siehe {os.path.basename(stats['report'])})"
+            )
+        return text
+
+    def _cancelled_text(self, written, transferred=0):
+        """
+        Statustext nach einem Abbruch. Vor dem Schreiben der Import-CSV bleibt
+        alles unverändert; in der Fotoübertragung sind die Import-CSV(s) schon
+        geschrieben und ein Teil der Fotos schon übertragen.
+        """
+        if not written:
+            return "⏹ Umwandlung abgebrochen – bestehende Dateien unverändert."
+        text = "⏹ Fotoübertragung abgebrochen – bereits geschrieben: " + ", ".join(written)
+        if transferred:
+            text += f"; {transferred} Fotos bereits übertragen (bleiben im Fotoordner)"
+        else:
+            text += "; noch keine Fotos übertragen"
+        return text
+
+    # --- Doppelte Bäume --------------------------------------------------------
+
+    def _setup_duplicate_check(self):
+        """
+        Ergänzt die optionale Suche nach doppelt erfassten Bäumen (nur für
+        Baum-Datentypen). Standardmäßig ausgeschaltet.
+        """
+        self.groupDuplicates = QGroupBox("Doppelte Bäume suchen")
+        self.groupDuplicates.setCheckable(True)
+        self.groupDuplicates.setChecked(False)
+
+        duplicates_layout = QHBoxLayout(self.groupDuplicates)
+        duplicates_layout.addWidget(QLabel("Abstand bis:"))
+
+        self.spinDuplicateDistance = QDoubleSpinBox()
+        self.spinDuplicateDistance.setRange(0.1, 20.0)
+        self.spinDuplicateDistance.setSingleStep(0.5)
+        self.spinDuplicateDistance.setValue(DEFAULT_DUPLICATE_DISTANCE_M)
+        self.spinDuplicateDistance.setSuffix(" m")
+        duplicates_layout.addWidget(self.spinDuplicateDistance)
+
+        self.checkDuplicateSpecies = QCheckBox("nur gleiche Baumart")
+        duplicates_layout.addWidget(self.checkDuplicateSpecies, 1)
+
+        self.comboDataType.currentIndexChanged.connect(self._update_duplicate_check_enabled)
+        self._update_duplicate_check_enabled()
+
+        # Unterhalb des Koordinatensystems einfügen
+        self.verticalLayout.insertWidget(4, self.groupDuplicates)
+
+    def _update_duplicate_check_enabled(self, *args):
+        self.groupDuplicates.setEnabled(bool(self._selected_data_type().get("duplicate_check")))
+
+    def _duplicate_search(self, data_type):
+        """
+        Suche nach doppelt erfassten Bäumen für die Umwandlung (läuft im
+        selben Durchgang mit) bzw. None, wenn ausgeschaltet.
+        """
+        if not (data_type.get("duplicate_check") and self.groupDuplicates.isChecked()):
+            return None
+        return DuplicateSearch(
+            self.spinDuplicateDistance.value(),
+            match_species=self.checkDuplicateSpecies.isChecked()
+        )
+
+    def _duplicates_text(self, duplicates):
+        """
+        Kurzer Statustext zur Suche nach doppelten Bäumen.
+        """
+        stats = duplicates.stats
+        if stats is None:
+            return "keine Suche nach doppelten Bäumen (keine Geometriespalte)"
+        if not stats["pairs"]:
+            return "keine doppelten Bäume gefunden"
+        return (
+            f"{stats['pairs']} mögliche Doppelerfassungen "
+            f"(siehe {os.path.basename(stats['report'])})"
+        )
+
+    # --- Flächenabgleich -------------------------------------------------------
+
+    def _setup_area_lookup(self):
+        """
+        Ergänzt die Auswahl eines Flächen-Exports, aus dem leere Grünfläche
+        und Ort der Bäume über die Lage ergänzt werden (nur für
+        Baum-Datentypen). Standardmäßig ausgeschaltet.
+        """
+        self.groupAreas = QGroupBox("Grünfläche und Ort aus Flächen-Export ergänzen")
+        self.groupAreas.setCheckable(True)
+        self.groupAreas.setChecked(False)
+
+        areas_layout = QHBoxLayout(self.groupAreas)
+
+        self.lineEditAreas = QLineEdit()
+        self.lineEditAreas.setPlaceholderText("Flächen-Export (CSV, gleiches Koordinatensystem)")
+        areas_layout.addWidget(self.lineEditAreas, 1)
+
+        self.btnBrowseAreas = QPushButton("…")
+        self.btnBrowseAreas.clicked.connect(self.browse_areas)
+        areas_layout.addWidget(self.btnBrowseAreas)
+
+        self.comboDataType.currentIndexChanged.connect(self._update_area_lookup_enabled)
+        self._update_area_lookup_enabled()
+
+        # Unterhalb der Suche nach doppelten Bäumen einfügen
+        self.verticalLayout.insertWidget(5, self.groupAreas)
+
+    def _update_area_lookup_enabled(self, *args):
+        self.groupAreas.setEnabled(bool(self._selected_data_type().get("area_lookup")))
+
+    def _areas_csv(self, data_type):
+        """
+        Pfad des Flächen-Exports bzw. None (Flächen, Pläne, ausgeschaltet).
+        """
+        if not data_type.get("area_lookup") or not self.groupAreas.isChecked():
+            return None
+        return self.lineEditAreas.text().strip() or None
+
+    def browse_areas(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Flächen-Export auswählen",
+            self.lineEditAreas.text().strip() or os.path.dirname(self.lineEditInput.text().strip()),
+            "CSV (*.csv);;Alle Dateien (*.*)"
+        )
+
+        if path:
+            self.lineEditAreas.setText(path)
+
+    # --- Vorschau --------------------------------------------------------------
+
+    def _setup_preview(self):
+        """
+        Ergänzt die Schaltfläche "Vorschau" vor der Umwandeln-Schaltfläche.
+        """
+        self.btnPreview = QPushButton("Vorschau")
+        self.btnPreview.setToolTip(
+            "Erste Zeilen und eine Stichprobe umwandeln, ohne Dateien zu schreiben"
+        )
+        self.btnPreview.clicked.connect(self.show_preview)
+
+        self.verticalLayout.insertWidget(
+            self.verticalLayout.indexOf(self.btnConvert),
+            self.btnPreview
+        )
+
+    def show_preview(self):
+        input_path = self.lineEditInput.text().strip()
+
+        if not input_path or not os.path.exists(input_path):
+            QMessageBox.warning(
+                self,
+                "Fehler",
+                "Bitte zuerst eine gültige Eingabedatei wählen."
+            )
+            return
+
+        try:
+            preview = preview_convert(input_path, self.plugin_dir)
+        except Exception as error:
+            QMessageBox.critical(
+                self,
+                "Fehler",
+                str(error)
+            )
+            return
+
+        sample_count = preview.origins.count(SAMPLE)
+        summary = (
+            f"{len(preview.rows) - sample_count} erste Zeilen"
+            + (f" und {sample_count} Zeilen aus einer Stichprobe" if sample_count else "")
+            + (" (vollständige Datei)" if preview.complete else "")
+            + f", umgewandelt in {preview.elapsed:.2f} s"
+        )
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Vorschau der Umwandlung")
+        dialog.resize(900, 600)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(summary))
+
+        # Umgewandelte Zeilen; die erste Spalte nennt die Herkunft
+        rows_table = QTableWidget(len(preview.rows), len(preview.fieldnames) + 1)
+        rows_table.setHorizontalHeaderLabels(["Herkunft"] + list(preview.fieldnames))
+        for row_index, (row, origin) in enumerate(zip(preview.rows, preview.origins)):
+            rows_table.setItem(
+                row_index, 0,
+                QTableWidgetItem("Stichprobe" if origin == SAMPLE else "Anfang")
+            )
+            for column_index, value in enumerate(row):
+                rows_table.setItem(
+                    row_index, column_index + 1,
+                    QTableWidgetItem("" if value is None else str(value))
+                )
+        rows_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(rows_table, 3)
+
+        layout.addWidget(QLabel(
+            f"Nicht gemappte Werte in der Vorschau: {len(preview.unmapped)}"
+        ))
+        unmapped_table = QTableWidget(len(preview.unmapped), 4)
+        unmapped_table.setHorizontalHeaderLabels(
+            ["Spalte", "Wert", "Anzahl", "Zeilen der Vorschau"]
+        )
+        for row_index, (column, value, count, _, rows) in enumerate(preview.unmapped):
+            for column_index, text in enumerate(
+                (column, value, str(count), ", ".join(str(r) for r in rows))
+            ):
+                unmapped_table.setItem(row_index, column_index, QTableWidgetItem(text))
+        unmapped_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(unmapped_table, 1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        dialog.exec_()
+
+    # --- Fortschritt -----------------------------------------------------------
+
+    def _setup_progress(self):
+        """
+        Ergänzt Fortschrittsbalken und Abbrechen-Schaltfläche.
+        Beide sind nur während einer Umwandlung sichtbar.
+        """
+        progress_layout = QHBoxLayout()
+
+        self.progressBar = QProgressBar()
+        self.progressBar.setRange(0, 100)
+        progress_layout.addWidget(self.progressBar, 1)
+
+        self.btnCancel = QPushButton("Abbrechen")
+        self.btnCancel.clicked.connect(self.cancel_conversion)
+        progress_layout.addWidget(self.btnCancel)
+
+        self.progressBar.hide()
+        self.btnCancel.hide()
+
+        # Zwischen Umwandeln-Schaltfläche und Statuszeile einfügen
+        self.verticalLayout.insertLayout(
+            self.verticalLayout.indexOf(self.btnConvert) + 1,
+            progress_layout
+        )
+
+    def _on_progress(self, info):
+        """
+        Callback der Umwandlung: Balken und Status aktualisieren und die
+        Oberfläche (inkl. Abbrechen-Schaltfläche) bedienbar halten.
+        """
+        percent = progress_percent(info)
+        if percent is None:
+            self.progressBar.setRange(0, 0)
+        else:
+            self.progressBar.setRange(0, 100)
+            self.progressBar.setValue(percent)
+
+        self.labelStatus.setText("⏳ " + format_progress(info))
+        QCoreApplication.processEvents()
+
+    def cancel_conversion(self):
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+            self.btnCancel.setEnabled(False)
+            self.labelStatus.setText("⏳ Breche ab …")
+
     def _selected_data_type(self):
         """
         Liefert die Konfiguration des ausgewählten Datentyps.
@@ -117,82 +554,10 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
         """
         Ergänzt oder überschreibt nur die für den ausgewählten Datentyp
         vorgesehenen Felder. Alle anderen Felder bleiben unverändert.
+        Das gemeinsame Feldmapping erzeugt für "datum" zunächst "date";
+        Flächen und Pläne erwarten stattdessen "last_modified_date".
         """
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(
-                f"Die erzeugte CSV-Datei wurde nicht gefunden: {csv_path}"
-            )
-
-        with open(
-            csv_path,
-            "r",
-            encoding="utf-8-sig",
-            newline=""
-        ) as input_file:
-            reader = csv.DictReader(
-                input_file,
-                delimiter=";",
-                quotechar='"'
-            )
-
-            fieldnames = list(reader.fieldnames or [])
-            rows = list(reader)
-
-        if not fieldnames:
-            raise ValueError(
-                "Die erzeugte CSV-Datei enthält keine Kopfzeile."
-            )
-
-        field_values = data_type.get("field_values", {})
-        field_renames = data_type.get("field_renames", {})
-
-        # Datentypabhängige Feldnamen anpassen. Das gemeinsame Feldmapping
-        # erzeugt für "datum" zunächst "date". Flächen und Pläne erwarten
-        # stattdessen "last_modified_date".
-        for old_field, new_field in field_renames.items():
-            if old_field not in fieldnames:
-                continue
-
-            if new_field in fieldnames:
-                fieldnames.remove(old_field)
-            else:
-                field_index = fieldnames.index(old_field)
-                fieldnames[field_index] = new_field
-
-            for row in rows:
-                old_value = row.pop(old_field, None)
-
-                # Ein vorhandener Wert aus dem umzubenennenden Feld hat
-                # Vorrang. Leere Werte überschreiben keinen bereits
-                # vorhandenen Wert im Zielfeld.
-                if old_value is not None and str(old_value).strip() != "":
-                    row[new_field] = old_value
-
-        for field_name in field_values:
-            if field_name not in fieldnames:
-                fieldnames.append(field_name)
-
-        for row in rows:
-            for field_name, field_value in field_values.items():
-                row[field_name] = field_value
-
-        with open(
-            csv_path,
-            "w",
-            encoding="utf-8",
-            newline=""
-        ) as output_file:
-            writer = csv.DictWriter(
-                output_file,
-                fieldnames=fieldnames,
-                delimiter=";",
-                quotechar='"',
-                quoting=csv.QUOTE_ALL,
-                extrasaction="ignore"
-            )
-
-            writer.writeheader()
-            writer.writerows(rows)
+        apply_data_type_values(csv_path, data_type)
 
     def _rename_output_csv(self, csv_path, output_filename):
         """
@@ -209,6 +574,22 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
 
         return output_path
 
+    def _show_unmapped(self, unmapped_txt):
+        """
+        Zeigt die nicht gemappten Werte der letzten Umwandlung an.
+        """
+        if os.path.exists(unmapped_txt):
+            with open(
+                unmapped_txt,
+                "r",
+                encoding="utf-8"
+            ) as unmapped_file:
+                self.textEditUnmapped.setPlainText(
+                    unmapped_file.read()
+                )
+        else:
+            self.textEditUnmapped.clear()
+
     # --- Helper ---------------------------------------------------------------
 
     def browse_input(self):
@@ -252,9 +633,25 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
         enabled = not busy
 
         self.btnConvert.setEnabled(enabled)
+        self.btnPreview.setEnabled(enabled)
         self.btnBrowse.setEnabled(enabled)
         self.btnOpenFolder.setEnabled(enabled)
         self.groupDataType.setEnabled(enabled)
+        self.groupPhotos.setEnabled(enabled)
+        self.groupReprojection.setEnabled(enabled)
+        self.groupDuplicates.setEnabled(
+            enabled and bool(self._selected_data_type().get("duplicate_check"))
+        )
+        self.groupAreas.setEnabled(
+            enabled and bool(self._selected_data_type().get("area_lookup"))
+        )
+
+        self.progressBar.setVisible(busy)
+        self.btnCancel.setVisible(busy)
+        self.btnCancel.setEnabled(busy)
+        if busy:
+            self.progressBar.setRange(0, 100)
+            self.progressBar.setValue(0)
 
     # --- Kernaktion -----------------------------------------------------------
 
@@ -271,19 +668,77 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
 
         data_type = self._selected_data_type()
 
+        if (
+            self.groupPhotos.isChecked()
+            and not self.lineEditPhotoTarget.text().strip()
+        ):
+            QMessageBox.warning(
+                self,
+                "Fehler",
+                "Bitte einen Fotoordner wählen oder die Fotoübertragung ausschalten."
+            )
+            return
+
+        if self._areas_csv(data_type) is None and data_type.get("area_lookup") and self.groupAreas.isChecked():
+            QMessageBox.warning(
+                self,
+                "Fehler",
+                "Bitte einen Flächen-Export wählen oder den Flächenabgleich ausschalten."
+            )
+            return
+
         self._set_busy(True)
         self.labelStatus.setText(
             "⏳ Erkenne Profil und konvertiere …"
         )
         self.textEditUnmapped.clear()
+        self.cancel_token = CancelToken()
+
+        # Gemischter Export: die Zeilen gleich beim Schreiben auf die
+        # Import-CSVs der Datentypen verteilen
+        routing = DataTypeRouting() if data_type.get("route") else None
+        duplicates = self._duplicate_search(data_type)
+
+        # bereits geschriebene Import-CSVs (für die Meldung bei Abbruch)
+        written = []
 
         try:
             # Auto-Erkennung BK3/BK4 und Konvertierung
             out_csv, unmapped_txt, profile = smart_convert(
                 input_path,
-                self.plugin_dir
+                self.plugin_dir,
+                progress=self._on_progress,
+                cancel_token=self.cancel_token,
+                source_epsg=self.comboSourceCrs.currentData(),
+                simplify_tolerance=self._simplify_tolerance(data_type),
+                areas_csv=self._areas_csv(data_type),
+                spatial_order=self.checkSpatialOrder.isChecked(),
+                normalize_numbers=self.checkNormalizeNumbers.isChecked(),
+                strict_reprojection=self.checkStrictReprojection.isChecked(),
+                routing=routing,
+                duplicates=duplicates
             )
 
+            # Profil verständlich darstellen
+            profile_text = PROFILES.label(profile)
+
+            if routing is not None:
+                written = [os.path.basename(info["path"]) for info in routing.outputs.values()]
+                status_text = (
+                    "✅ Umwandlung abgeschlossen – "
+                    f"erkanntes Profil: {profile_text}; "
+                    f"{format_routing(routing.outputs)}"
+                )
+                if self.groupPhotos.isChecked() and routing.outputs:
+                    routed_csvs = [info["path"] for info in routing.outputs.values()]
+                    status_text += "; " + self._transfer_photos(routed_csvs, input_path)
+
+                self.labelStatus.setText(status_text)
+                self._show_unmapped(unmapped_txt)
+                return
+
+            written = [os.path.basename(out_csv)]
+
             # Vorgabewerte des gewählten Datentyps schreiben
             self._apply_data_type_values(
                 out_csv,
@@ -295,34 +750,27 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
                 out_csv,
                 data_type["output_filename"]
             )
+            written = [os.path.basename(out_csv)]
 
-            # Profil verständlich darstellen
-            if profile == "baumkataster_3":
-                profile_text = "Baumkataster 3"
-            elif profile == "baumkataster_4":
-                profile_text = "Baumkataster 4"
-            else:
-                profile_text = f"Unbekannt/extern ({profile})"
-
-            self.labelStatus.setText(
+            status_text = (
                 "✅ Umwandlung abgeschlossen – "
                 f"erkanntes Profil: {profile_text}; "
                 f"Datentyp: {data_type['label']}; "
                 f"Datei: {data_type['output_filename']}"
             )
 
+            # Optional: doppelt erfasste Bäume (in der Umwandlung gesucht)
+            if duplicates is not None:
+                status_text += "; " + self._duplicates_text(duplicates)
+
+            # Optional: Fotodateien übertragen
+            if self.groupPhotos.isChecked():
+                status_text += "; " + self._transfer_photos(out_csv, input_path)
+
+            self.labelStatus.setText(status_text)
+
             # Nicht gemappte Werte anzeigen
-            if os.path.exists(unmapped_txt):
-                with open(
-                    unmapped_txt,
-                    "r",
-                    encoding="utf-8"
-                ) as unmapped_file:
-                    self.textEditUnmapped.setPlainText(
-                        unmapped_file.read()
-                    )
-            else:
-                self.textEditUnmapped.clear()
+            self._show_unmapped(unmapped_txt)
 
             # Ausgabedatei prüfen
             if not os.path.exists(out_csv):
@@ -332,6 +780,16 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
                     "Die Zieldatei wurde nicht gefunden."
                 )
 
+        except PhotoTransferCancelled as cancelled:
+            self.labelStatus.setText(
+                self._cancelled_text(written, cancelled.transferred)
+            )
+
+        except ConversionCancelled:
+            self.labelStatus.setText(
+                self._cancelled_text(written)
+            )
+
         except Exception as error:
             self.labelStatus.setText(
                 "❌ Fehler bei der Konvertierung."
@@ -343,4 +801,5 @@ class TreestaImporterDialog(QDialog, FORM_CLASS):
             )
 
         finally:
+            self.cancel_token = None
             self._set_busy(False)
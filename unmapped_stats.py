@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+unmapped_stats – Häufigkeiten nicht gemappter Werte mit begrenztem Speicher
+
+Statt einer bloßen Menge wird je (Spalte, Wert) gezählt, wie viele Zeilen
+betroffen sind, und es werden einige Zeilennummern als Beispiel behalten.
+So kann die Pflege des Wertmappings mit den Werten beginnen, die die meisten
+Zeilen betreffen.
+
+Gezählt wird nach dem Space-Saving-Verfahren: höchstens max_entries
+Einträge. Ist die Tabelle voll, ersetzt ein neuer Wert den seltensten
+Eintrag und übernimmt dessen Zählerstand als mögliche Überzählung (error).
+Häufige Werte bleiben damit sicher erhalten; bei sauberen Exporten (weniger
+Werte als max_entries) sind alle Zahlen exakt.
+
+Ausgabe zusätzlich zu unmapped_values.txt:
+- unmapped_values.csv   column;value;count;max_overcount;rows
+- unmapped_values.json  dieselben Einträge + Kennzahlen
+"""
+
+import csv
+import heapq
+import json
+import os
+from typing import Dict, List, Set
+
+UNMAPPED_TEXT_FILENAME = "unmapped_values.txt"
+UNMAPPED_CSV_FILENAME = "unmapped_values.csv"
+UNMAPPED_JSON_FILENAME = "unmapped_values.json"
+
+MAX_TRACKED_VALUES = 50_000
+SAMPLE_ROWS = 5
+
+
+class _ColumnRecorder:
+    """
+    Mengen-Schnittstelle (add) für eine Spalte – wird anstelle des bisherigen
+    unmapped-Sets an die Mapping-Funktionen übergeben.
+    """
+
+    __slots__ = ("stats", "column")
+
+    def __init__(self, stats, column):
+        self.stats = stats
+        self.column = column
+
+    def add(self, value):
+        self.stats.record(self.column, value)
+
+
+class UnmappedStats:
+    """
+    Zähler für nicht gemappte Werte.
+
+    row_no – aktuelle Zeilennummer der Eingabedatei; wird vom Converter je
+             Zeile gesetzt und als Beispiel gespeichert
+    """
+
+    def __init__(self, max_entries: int = MAX_TRACKED_VALUES, sample_rows: int = SAMPLE_ROWS):
+        self.max_entries = max(1, max_entries)
+        self.sample_rows = sample_rows
+        self.row_no = 0
+        # (Spalte, Wert) → [count, error, [Zeilennummern]]
+        self.entries: Dict[tuple, list] = {}
+        self.total = 0
+        self.evicted = 0
+        self._heap: List[tuple] = []
+        self._recorders: Dict[str, _ColumnRecorder] = {}
+
+    def column(self, column: str) -> _ColumnRecorder:
+        recorder = self._recorders.get(column)
+        if recorder is None:
+            recorder = self._recorders[column] = _ColumnRecorder(self, column)
+        return recorder
+
+    def record(self, column: str, value: str):
+        self.total += 1
+        key = (column, value)
+        entry = self.entries.get(key)
+
+        if entry is None:
+            if len(self.entries) >= self.max_entries:
+                count, error = self._evict_min()
+                entry = [count, error, []]
+            else:
+                entry = [0, 0, []]
+            self.entries[key] = entry
+            heapq.heappush(self._heap, (entry[0] + 1, key))
+
+        entry[0] += 1
+        rows = entry[2]
+        if len(rows) < self.sample_rows and (not rows or rows[-1] != self.row_no):
+            rows.append(self.row_no)
+
+    def _evict_min(self):
+        """
+        Seltensten Eintrag entfernen (Heap mit verzögerter Aktualisierung:
+        veraltete Zählerstände werden beim Entnehmen neu eingereiht).
+        """
+        while True:
+            count, key = heapq.heappop(self._heap)
+            entry = self.entries.get(key)
+            if entry is None:
+                continue
+            if entry[0] != count:
+                heapq.heappush(self._heap, (entry[0], key))
+                continue
+            del self.entries[key]
+            self.evicted += 1
+            return count, count
+
+    def to_state(self) -> dict:
+        """
+        Zählerstand als JSON-taugliches dict (Checkpoint).
+        """
+        return {
+            "total": self.total,
+            "evicted": self.evicted,
+            "entries": [[column, value, *entry] for (column, value), entry in self.entries.items()],
+        }
+
+    def load_state(self, state: dict):
+        self.total = state["total"]
+        self.evicted = state["evicted"]
+        self.entries = {
+            (column, value): [count, error, rows]
+            for column, value, count, error, rows in state["entries"]
+        }
+        self._heap = [(entry[0], key) for key, entry in self.entries.items()]
+        heapq.heapify(self._heap)
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def values(self) -> Set[str]:
+        """
+        Unterschiedliche Werte (über alle Spalten), wie bisher das unmapped-Set.
+        """
+        return {value for _, value in self.entries}
+
+    def ranked(self) -> List[tuple]:
+        """
+        (column, value, count, max_overcount, rows), häufigste zuerst.
+        """
+        return sorted(
+            ((column, value, entry[0], entry[1], entry[2])
+             for (column, value), entry in self.entries.items()),
+            key=lambda item: (-item[2], item[0], item[1])
+        )
+
+    def write_reports(self, project_dir: str):
+        """
+        Schreibt unmapped_values.txt, .csv und .json bzw. entfernt veraltete
+        Dateien, wenn alle Werte gemappt wurden.
+        """
+        text_path = os.path.join(project_dir, UNMAPPED_TEXT_FILENAME)
+        csv_path = os.path.join(project_dir, UNMAPPED_CSV_FILENAME)
+        json_path = os.path.join(project_dir, UNMAPPED_JSON_FILENAME)
+
+        if not self.entries:
+            for path in (text_path, csv_path, json_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return None
+
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("Nicht gemappte Werte (value_mapping ergänzen):\n")
+            for val in sorted(self.values()):
+                f.write(f"{val}\n")
+            if self.evicted:
+                f.write(f"… weitere seltene Werte nicht erfasst, Häufigkeiten siehe {UNMAPPED_CSV_FILENAME}\n")
+
+        ranked = self.ranked()
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter=";", quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(["column", "value", "count", "max_overcount", "rows"])
+            for column, value, count, error, rows in ranked:
+                writer.writerow([column, value, count, error, ", ".join(str(r) for r in rows)])
+
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "total": self.total,
+                "tracked": len(self.entries),
+                "evicted": self.evicted,
+                "max_entries": self.max_entries,
+                "values": [
+                    {"column": column, "value": value, "count": count,
+                     "max_overcount": error, "rows": rows}
+                    for column, value, count, error, rows in ranked
+                ],
+            }, f, ensure_ascii=False, indent=1)
+
+        return text_path
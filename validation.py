@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+validation – optionale Prüfung der umgewandelten Werte
+
+Deklarative Spaltenregeln (COLUMN_RULES) werden einmal je Kopfzeile zu
+Prüffunktionen kompiliert und während der Umwandlung auf jede Ausgabezeile
+angewendet. So fallen negative Höhen, Kronendurchmesser in cm statt m oder
+fehlende WKT-Geometrien vor dem Einfügen in Treesta auf.
+
+Regeltypen:
+- required – Wert darf nicht leer sein
+- range    – (min, max), Zahl mit Punkt oder Dezimalkomma
+- regex    – Muster (ohne Beachtung der Groß-/Kleinschreibung)
+- enum     – Wert (bzw. jeder Teil eines {…}-Mehrfachwerts) muss ein Zielwert
+             des Wertmappings sein
+
+Bericht: validation_report.csv
+    column;rule;count;rows;example
+Zeilennummern beziehen sich auf die Eingabedatei (Kopfzeile = Zeile 1).
+"""
+
+import csv
+import math
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+
+VALIDATION_REPORT_FILENAME = "validation_report.csv"
+
+# Höchstens so viele Zeilennummern je Regel im Bericht auflisten
+MAX_REPORTED_ROWS = 50
+
+WKT_RE = r"^\s*(MULTI)?(POINT|LINESTRING|POLYGON)\s*(Z|M|ZM)?\s*\("
+
+# Kategoriale Treesta-Felder, deren Werte aus dem Wertmapping stammen
+ENUM_COLUMNS = (
+    "condition", "vitality", "development", "safety_expectation", "tree_safety",
+    "life_expectancy", "restriction", "features_crown", "features_trunk",
+    "features_trunkbase_root_collar", "features_root_surroundings",
+    "measures_1", "measures_2", "measures_3", "measures_4", "measures_5",
+    "habitat_structure_canopy", "habitat_species_canopy",
+    "habitat_structure_trunk", "habitat_species_trunk",
+)
+
+COLUMN_RULES: Dict[str, dict] = {
+    "treenumber": {"required": True},
+    "wkt": {"required": True, "regex": WKT_RE},
+    "height": {"range": (0, 60)},
+    "trunk_height": {"range": (0, 30)},
+    "trunk_number": {"range": (0, 30)},
+    **{f"crown_diameter_{i}": {"range": (0, 40)} for i in range(1, 5)},
+    **{f"trunk_diameter_{i}": {"range": (0, 500)} for i in range(1, 5)},
+    **{f"trunk_circumference_{i}": {"range": (0, 1600)} for i in range(1, 5)},
+    **{name: {"enum": True} for name in ENUM_COLUMNS},
+}
+
+# Werte, die in Enum-Spalten immer zulässig sind (convert_booleans)
+ALWAYS_ALLOWED = {"", "0", "1"}
+
+
+def parse_number(val: str) -> Optional[float]:
+    """
+    Zahl mit Punkt oder Dezimalkomma; None auch für "nan" und "inf", die
+    float() annimmt, die aber keine Messwerte sind (NaN bestünde jede
+    Bereichsprüfung).
+    """
+    try:
+        number = float(val.replace(",", "."))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def split_enum_parts(val: str) -> List[str]:
+    """
+    Zerlegt {"a","b"}, {a, b} und "a, b" in Einzelwerte.
+    """
+    inner = val[1:-1] if val.startswith("{") and val.endswith("}") else val
+    if '"' in inner:
+        parts = next(csv.reader([inner], delimiter=",", quotechar='"', skipinitialspace=True), [])
+    else:
+        parts = inner.split(", ")
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _required_check(val):
+    if not val:
+        return "required", "Pflichtwert fehlt"
+    return None
+
+
+def _make_range_check(lower, upper):
+    def check(val):
+        if not val:
+            return None
+        number = parse_number(val)
+        if number is None:
+            return "range", "keine Zahl"
+        if number < lower:
+            return "range", f"kleiner als {lower:g}"
+        if number > upper:
+            return "range", f"größer als {upper:g}"
+        return None
+    return check
+
+
+def _make_regex_check(pattern):
+    compiled = re.compile(pattern, re.IGNORECASE)
+
+    def check(val):
+        if val and not compiled.match(val):
+            return "regex", "Format ungültig"
+        return None
+    return check
+
+
+def _make_enum_check(allowed):
+    def check(val):
+        if not val or val in allowed:
+            return None
+        inner = val[1:-1] if val.startswith("{") and val.endswith("}") else val
+        if inner.strip('"') in allowed:
+            return None
+        for part in split_enum_parts(val):
+            if part not in allowed:
+                return "enum", "nicht im Wertmapping"
+        return None
+    return check
+
+
+class RowValidator:
+    """
+    Kompilierte Prüfregeln für eine Kopfzeile.
+
+    columns – Liste (index, column, [check, …]); index ist die Position im
+              Ausgabetupel, jede check-Funktion liefert None oder
+              (rule, message).
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.violations: Dict[tuple, dict] = {}
+        self.elapsed = 0.0
+
+    def check(self, row_no: int, row) -> None:
+        started = time.perf_counter()
+        for index, column, checks in self.columns:
+            raw = row[index]
+            val = raw.strip() if isinstance(raw, str) else ""
+            for check in checks:
+                result = check(val)
+                if result is None:
+                    continue
+                rule, message = result
+                entry = self.violations.get((column, rule, message))
+                if entry is None:
+                    entry = {"count": 0, "rows": [], "example": val}
+                    self.violations[(column, rule, message)] = entry
+                entry["count"] += 1
+                if len(entry["rows"]) < MAX_REPORTED_ROWS:
+                    entry["rows"].append(row_no)
+                break
+        self.elapsed += time.perf_counter() - started
+
+    def record(self, row_no: int, column: str, problem: tuple, example: str):
+        """
+        Einen Befund (rule, message) außerhalb der kompilierten Regeln
+        eintragen (Zahlen, Umprojektion).
+        """
+        rule, message = problem
+        entry = self.violations.get((column, rule, message))
+        if entry is None:
+            entry = self.violations[(column, rule, message)] = {"count": 0, "rows": [], "example": example}
+        entry["count"] += 1
+        if len(entry["rows"]) < MAX_REPORTED_ROWS:
+            entry["rows"].append(row_no)
+
+    def to_state(self) -> dict:
+        """
+        Zwischenstand als JSON-taugliches dict (Checkpoint).
+        """
+        return {
+            "elapsed": self.elapsed,
+            "violations": [[*key, entry] for key, entry in self.violations.items()],
+        }
+
+    def load_state(self, state: dict):
+        self.elapsed = state["elapsed"]
+        self.violations = {
+            (column, rule, message): entry
+            for column, rule, message, entry in state["violations"]
+        }
+
+    @property
+    def violation_count(self) -> int:
+        return sum(entry["count"] for entry in self.violations.values())
+
+    def write_report(self, output_path: str):
+        """
+        Schreibt validation_report.csv bzw. entfernt einen veralteten Bericht.
+        """
+        if not self.violations:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return None
+
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter=";", quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(["column", "rule", "count", "rows", "example"])
+            for (column, rule, message), entry in sorted(
+                self.violations.items(), key=lambda item: -item[1]["count"]
+            ):
+                rows = ", ".join(str(r) for r in entry["rows"])
+                if entry["count"] > len(entry["rows"]):
+                    rows += ", …"
+                writer.writerow([column, f"{rule}: {message}", entry["count"], rows, entry["example"]])
+        return output_path
+
+
+def compile_validator(columns: Iterable[str], enum_values: Iterable[str],
+                      rules: Dict[str, dict] = None) -> RowValidator:
+    """
+    Kompiliert die Regeln für die Ausgabespalten (Reihenfolge wie in den
+    Ausgabetupeln).
+    Spaltennamen werden ohne Beachtung der Groß-/Kleinschreibung zugeordnet
+    (QGIS exportiert die Geometrie z. B. als "WKT").
+    """
+    rules = COLUMN_RULES if rules is None else rules
+    allowed = set(enum_values) | ALWAYS_ALLOWED
+    compiled = []
+
+    for index, column in enumerate(columns):
+        rule = rules.get(column) or rules.get(str(column).lower())
+        if not rule:
+            continue
+        checks = []
+        if rule.get("required"):
+            checks.append(_required_check)
+        if "range" in rule:
+            checks.append(_make_range_check(*rule["range"]))
+        if "regex" in rule:
+            checks.append(_make_regex_check(rule["regex"]))
+        if rule.get("enum"):
+            checks.append(_make_enum_check(allowed))
+        if checks:
+            compiled.append((index, column, checks))
+
+    return RowValidator(compiled)
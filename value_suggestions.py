@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+value_suggestions – Vorschläge für nicht gemappte Werte
+
+Für jeden Wert aus unmapped_values.txt wird im vorhandenen Wertmapping nach
+ähnlichen Einträgen gesucht (Tippfehler, fehlende Umlaute, vertauschte
+Wörter). Dazu wird einmalig ein Trigramm-Index über die gefalteten
+Mapping-Schlüssel aufgebaut; eine Anfrage berührt nur Einträge mit
+gemeinsamen Trigrammen statt der gesamten Tabelle.
+
+Ausgabe: unmapped_suggestions.csv
+    old_value;new_value;matched_value;score;rank
+
+Die Spalten old_value/new_value entsprechen dem Aufbau der
+value_mapping*.csv. Geprüfte Zeilen können direkt übernommen werden.
+"""
+
+import csv
+import os
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+SUGGESTIONS_FILENAME = "unmapped_suggestions.csv"
+
+# Umlaute/ß auf ASCII falten, damit "Faellung" und "Fällung" gleich werden
+UMLAUT_FOLDING = str.maketrans({
+    "ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss",
+    "é": "e", "è": "e", "á": "a", "à": "a",
+})
+
+LEADING_CODE_RE = re.compile(r"^\d+\s*")
+NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+MIN_SCORE = 0.35
+MAX_SUGGESTIONS = 3
+
+
+def fold_value(val: str) -> str:
+    """
+    Vergleichsschlüssel bilden:
+    - Kleinschreibung, Umlaute falten
+    - führende Codes ("01 ...") und Satzzeichen entfernen
+    - Wörter sortieren (Reihenfolge spielt keine Rolle)
+    """
+    if not isinstance(val, str):
+        return ""
+    v = val.strip().strip('"').strip("'").lower().translate(UMLAUT_FOLDING)
+    v = LEADING_CODE_RE.sub("", v)
+    words = [w for w in NON_WORD_RE.split(v) if w]
+    return " ".join(sorted(words))
+
+
+def trigrams(folded: str) -> set:
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Invertierter Trigramm-Index über die Schlüssel eines Wertmappings.
+
+    score = Dice-Koeffizient der Trigramm-Mengen (1.0 = identisch nach dem
+    Falten, d. h. nur Umlaut-/Schreibweisen-/Reihenfolge-Unterschiede).
+    """
+
+    def __init__(self, value_dict: Dict[str, str]):
+        self.keys: List[str] = []
+        self.values: List[str] = []
+        self.sizes: List[int] = []
+        self.by_folded: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+        for key, new_value in value_dict.items():
+            folded = fold_value(key)
+            if not folded or folded in self.by_folded:
+                continue
+            entry_id = len(self.keys)
+            grams = trigrams(folded)
+            self.keys.append(key)
+            self.values.append(new_value)
+            self.sizes.append(len(grams))
+            self.by_folded[folded] = entry_id
+            for gram in grams:
+                self.postings[gram].append(entry_id)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, val: str, limit: int = MAX_SUGGESTIONS,
+               min_score: float = MIN_SCORE) -> List[Tuple[str, str, float]]:
+        """
+        Liefert bis zu `limit` Treffer als (matched_key, new_value, score),
+        absteigend nach score.
+        """
+        folded = fold_value(val)
+        if not folded:
+            return []
+
+        exact = self.by_folded.get(folded)
+        if exact is not None:
+            return [(self.keys[exact], self.values[exact], 1.0)]
+
+        grams = trigrams(folded)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for entry_id in self.postings.get(gram, ()):
+                shared[entry_id] += 1
+
+        size = len(grams)
+        scored = []
+        for entry_id, count in shared.items():
+            score = 2.0 * count / (size + self.sizes[entry_id])
+            if score >= min_score:
+                scored.append((score, entry_id))
+
+        scored.sort(key=lambda item: (-item[0], self.keys[item[1]]))
+        return [
+            (self.keys[entry_id], self.values[entry_id], round(score, 3))
+            for score, entry_id in scored[:limit]
+        ]
+
+
+def suggest_unmapped(unmapped_values: Iterable[str], value_dict: Dict[str, str],
+                     limit: int = MAX_SUGGESTIONS):
+    """
+    Rangliste je nicht gemapptem Wert:
+      {unmapped_value: [(matched_key, new_value, score), ...]}
+    Werte ohne brauchbaren Treffer fehlen im Ergebnis.
+    """
+    index = TrigramIndex(value_dict)
+    suggestions = {}
+    for val in sorted(unmapped_values):
+        hits = index.lookup(val, limit=limit)
+        if hits:
+            suggestions[val] = hits
+    return suggestions
+
+
+def write_value_suggestions(output_path: str, unmapped_values: Iterable[str],
+                            value_dict: Dict[str, str]):
+    """
+    Schreibt unmapped_suggestions.csv. Gibt es keine Vorschläge, wird eine
+    veraltete Datei aus einem früheren Lauf entfernt.
+    """
+    suggestions = suggest_unmapped(unmapped_values, value_dict)
+
+    if not suggestions:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        return None
+
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";", quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(["old_value", "new_value", "matched_value", "score", "rank"])
+        for val, hits in suggestions.items():
+            for rank, (matched_key, new_value, score) in enumerate(hits, start=1):
+                writer.writerow([val, new_value, matched_key, f"{score:.3f}", rank])
+
+    return output_path
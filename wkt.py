@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+wkt – WKT-Geometrien als Text zerlegen und wieder zusammensetzen
+
+Die Converter reichen die Geometriespalte (wkt, geom, …) unverändert durch.
+Für Umprojektion und andere Geometrie-Schritte werden nur die Zahlen
+gebraucht; die Geometrie wird dafür nicht in Objekte umgewandelt, sondern
+mit einem regulären Ausdruck in Text und Zahlen zerlegt:
+
+    "POINT (4468503.1 5333317.9)" → ["POINT (", "4468503.1", " ", "5333317.9", ")"]
+
+Zahlen stehen an den ungeraden Positionen, der Text dazwischen bleibt
+unverändert erhalten. Ein vorangestelltes SRID (EWKT, "SRID=31468;POINT …")
+wird abgetrennt, damit es nicht als Koordinate gelesen wird.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+WKT_COLUMNS = ("wkt", "geom", "geometry", "the_geom")
+
+_NUMBER = re.compile(r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)")
+_SRID = re.compile(r"\s*SRID=(\d+);", re.IGNORECASE)
+_POLYGON_TYPE = re.compile(r"\s*(?:SRID=\d+;\s*)?(?:MULTI)?POLYGON\b", re.IGNORECASE)
+_GEOMETRY_TYPE = re.compile(r"\s*(?:SRID=\d+;\s*)?([A-Za-z]+?)(?:ZM|Z|M)?\b")
+_RING = re.compile(r"\(([^()]*)\)")
+_FIRST_COORDINATE = re.compile(r"[^(]*\(+\s*" + _NUMBER.pattern + r"\s+" + _NUMBER.pattern)
+_POINT = re.compile(
+    r"\s*(?:SRID=\d+;\s*)?POINT\s*(?:ZM|Z|M)?\s*\(\s*" + _NUMBER.pattern + r"\s+" + _NUMBER.pattern,
+    re.IGNORECASE,
+)
+
+
+def is_wkt_column(name: str) -> bool:
+    name = name.strip().lower()
+    return name in WKT_COLUMNS or name.endswith("_wkt")
+
+
+def wkt_column_index(fieldnames: Sequence[str]) -> Optional[int]:
+    """
+    Index der ersten Geometriespalte bzw. None.
+    """
+    for i, name in enumerate(fieldnames):
+        if is_wkt_column(name):
+            return i
+    return None
+
+
+def split_srid(text: str) -> Tuple[str, str]:
+    """
+    (SRID-Präfix, WKT); das Präfix ist "" bei reinem WKT.
+    """
+    match = _SRID.match(text)
+    if match is None:
+        return "", text
+    return text[:match.end()], text[match.end():]
+
+
+def split_wkt(text: str) -> List[str]:
+    """
+    Text und Zahlen im Wechsel; Zahlen an den ungeraden Positionen.
+    """
+    return _NUMBER.split(text)
+
+
+def coordinate_dims(tokens: Sequence[str]) -> int:
+    """
+    Zahl der Werte je Koordinate (2 für XY, 3 für XYZ/XYM, 4 für XYZM):
+    aufeinanderfolgende Zahlen, die nur durch Leerraum getrennt sind.
+    """
+    dims = 1
+    for i in range(2, len(tokens) - 1, 2):
+        if tokens[i].strip():
+            break
+        dims += 1
+    return dims
+
+
+def geometry_type(text: str) -> Optional[str]:
+    """
+    Geometrietyp in Großbuchstaben ohne Z/M ("POINT", "MULTIPOLYGON", …)
+    bzw. None bei leeren Werten.
+    """
+    match = _GEOMETRY_TYPE.match(text) if text else None
+    if match is None:
+        return None
+    return match.group(1).upper()
+
+
+def point_xy(text: str) -> Optional[Tuple[float, float]]:
+    """
+    (x, y) einer Punktgeometrie bzw. None bei anderen Typen und leeren Werten.
+    """
+    match = _POINT.match(text) if text else None
+    if match is None:
+        return None
+    return float(match.group(1)), float(match.group(2))
+
+
+def first_xy(text: str) -> Optional[Tuple[float, float]]:
+    """
+    (x, y) der ersten Koordinate einer beliebigen Geometrie bzw. None.
+    """
+    match = _FIRST_COORDINATE.match(text) if text else None
+    if match is None:
+        return None
+    return float(match.group(1)), float(match.group(2))
+
+
+def polygon_rings(text: str) -> List[List[Tuple[float, float]]]:
+    """
+    Alle Ringe (Außen- und Innenringe, bei MULTIPOLYGON aller Teile) als
+    (x, y)-Listen; leer bei anderen Typen. Z/M-Werte entfallen.
+    """
+    if not text or not _POLYGON_TYPE.match(text):
+        return []
+    rings = []
+    for ring_text in _RING.findall(text):
+        ring = []
+        for point in ring_text.split(","):
+            values = point.split()
+            if len(values) >= 2:
+                ring.append((float(values[0]), float(values[1])))
+        if len(ring) >= 3:
+            rings.append(ring)
+    return rings